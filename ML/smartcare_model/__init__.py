@@ -1,45 +1,109 @@
 from .pipeline import (
     ARTIFACTS_DIR,
+    CompiledTreeEnsemble,
+    ConformalTable,
     DEFAULT_MODEL_NAME,
+    MetricsStore,
+    ModelCache,
+    OnlineMetrics,
+    PredictionCache,
+    PredictionLog,
+    PredictionService,
+    SimilarityIndex,
+    PROPHET_TARGETS,
+    ProphetFleet,
     apply_overrides,
+    bootstrap_metrics,
+    build_prophet_climatology,
     build_prophet_future_frame,
+    build_prophet_scenario_frame,
     build_prophet_train_frame,
     build_feature_dataframe,
+    build_scenario_features,
     calculate_historical_trend,
+    compile_tree_ensemble,
     compute_synthetic_lags,
+    current_version,
     find_similar_days,
     forecast_prophet,
+    get_model_cache,
+    get_prediction_cache,
+    list_versions,
     load_artifacts,
     evaluate_knn_quality,
     load_feature_columns,
+    load_conformal_table,
+    load_metrics,
+    load_quantile_models,
     load_prophet_artifacts,
+    load_prophet_payload,
+    prophet_from_payload,
     load_raw_dataframe,
+    normalize_scenarios,
+    predict_fast,
     predict_from_features,
+    predict_intervals,
+    predict_many,
     prepare_prediction_row,
     save_artifacts,
+    score_models,
+    set_current,
+    train_prophet_fleet,
     train_prophet_model,
     train_models,
 )
 
 __all__ = [
     "ARTIFACTS_DIR",
+    "CompiledTreeEnsemble",
+    "ConformalTable",
     "DEFAULT_MODEL_NAME",
+    "MetricsStore",
+    "ModelCache",
+    "OnlineMetrics",
+    "PredictionCache",
+    "PredictionLog",
+    "PredictionService",
+    "SimilarityIndex",
+    "PROPHET_TARGETS",
+    "ProphetFleet",
     "apply_overrides",
+    "bootstrap_metrics",
+    "build_prophet_climatology",
     "build_prophet_future_frame",
+    "build_prophet_scenario_frame",
     "build_prophet_train_frame",
     "build_feature_dataframe",
+    "build_scenario_features",
     "calculate_historical_trend",
+    "compile_tree_ensemble",
     "compute_synthetic_lags",
+    "current_version",
     "find_similar_days",
     "forecast_prophet",
+    "get_model_cache",
+    "get_prediction_cache",
+    "list_versions",
     "load_artifacts",
     "evaluate_knn_quality",
     "load_feature_columns",
+    "load_conformal_table",
+    "load_metrics",
+    "load_quantile_models",
     "load_prophet_artifacts",
+    "load_prophet_payload",
+    "prophet_from_payload",
     "load_raw_dataframe",
+    "normalize_scenarios",
+    "predict_fast",
     "predict_from_features",
+    "predict_intervals",
+    "predict_many",
     "prepare_prediction_row",
     "save_artifacts",
+    "score_models",
+    "set_current",
+    "train_prophet_fleet",
     "train_prophet_model",
     "train_models",
 ]
\ No newline at end of file
@@ -1,5 +1,34 @@
 """Utilitaires de persistance des artefacts."""
 
-from smartcare_model.artifacts.store import load_artifacts, load_feature_columns, save_artifacts
+from smartcare_model.artifacts.cache import ModelCache, get_model_cache
+from smartcare_model.artifacts.metrics_store import MetricsStore
+from smartcare_model.artifacts.prediction_log import PredictionLog
+from smartcare_model.artifacts.registry import (
+    current_version,
+    list_versions,
+    publish_version,
+    resolve_artifacts_dir,
+    set_current,
+)
+from smartcare_model.artifacts.store import (
+    load_artifacts,
+    load_feature_columns,
+    load_metrics,
+    save_artifacts,
+)
 
-__all__ = ["load_artifacts", "load_feature_columns", "save_artifacts"]
+__all__ = [
+    "MetricsStore",
+    "ModelCache",
+    "PredictionLog",
+    "current_version",
+    "get_model_cache",
+    "list_versions",
+    "load_artifacts",
+    "load_feature_columns",
+    "load_metrics",
+    "publish_version",
+    "resolve_artifacts_dir",
+    "save_artifacts",
+    "set_current",
+]
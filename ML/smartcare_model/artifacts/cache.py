@@ -0,0 +1,164 @@
+"""Cache memoire partage des modeles (chargement paresseux, LRU, budget).
+
+Un seul ``ModelCache`` par processus (``get_model_cache``) sert toutes les
+pages: chaque modele est charge au premier usage puis garde resident tant que
+le budget memoire le permet. Les entrees sont indexees par le snapshot du
+registre: un changement de version ``CURRENT`` provoque un rechargement.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+
+from smartcare_model.artifacts.registry import MODELS_KIND, resolve_artifacts_dir
+from smartcare_model.config.constants import DEFAULT_MODEL_NAME, MODEL_CACHE_MAX_MB
+from smartcare_model.config.paths import ARTIFACTS_DIR
+
+
+def _attach_compiled(model, snapshot_dir: Path, model_name: str) -> None:
+    # Import local: ``smartcare_model.inference`` importe ce module (cycle).
+    from smartcare_model.inference.compiled import COMPILED_SUFFIX, attach_compiled
+
+    attach_compiled(model, snapshot_dir / f"{model_name}{COMPILED_SUFFIX}")
+
+
+class ModelCache:
+    """Cache LRU thread-safe de ``(modele, feature_columns)`` par nom.
+
+    La taille d'une entree est estimee par celle de son fichier ``.joblib``
+    (ecrit sans compression); les tableaux d'arbres ``<nom>.trees/`` sont
+    projetes en memoire (pages partagees, hors budget). Quand le total depasse ``max_bytes``, les
+    modeles les moins recemment utilises sont evinces; le dernier charge
+    reste toujours resident, meme s'il depasse seul le budget.
+    """
+
+    def __init__(
+        self,
+        artifacts_dir: Path = ARTIFACTS_DIR,
+        max_bytes: int = MODEL_CACHE_MAX_MB * 1024 * 1024,
+    ):
+        self.artifacts_dir = Path(artifacts_dir)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[object, List[str], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _evict(self) -> None:
+        total = sum(entry[2] for entry in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            total -= size
+            self._stats["evictions"] += 1
+
+    def get(self, model_name: str = DEFAULT_MODEL_NAME) -> Tuple[object, List[str]]:
+        """Retourner ``(modele, feature_columns)``, charge au premier appel.
+
+        Voir ``get_snapshot``.
+        """
+        model, feature_cols, _ = self.get_snapshot(model_name)
+        return model, feature_cols
+
+    def get_snapshot(self, model_name: str = DEFAULT_MODEL_NAME) -> Tuple[object, List[str], Path]:
+        """Retourner ``(modele, feature_columns, snapshot)``, charge au premier appel.
+
+        La lecture du fichier se fait hors du verrou global, sous un verrou
+        propre a la cle: des modeles differents se chargent en parallele,
+        et des appels concurrents pour le meme modele attendent un seul
+        chargement.
+
+        Args:
+            model_name: Nom du modele (fichier ``<model_name>.joblib``).
+
+        Returns:
+            Tuple (modele, feature_columns, repertoire du snapshot dont ils
+            sont issus), pour lire d'autres fichiers de la meme version.
+
+        Raises:
+            FileNotFoundError: Si l'artefact est absent.
+        """
+        snapshot_dir = resolve_artifacts_dir(MODELS_KIND, self.artifacts_dir)
+        key = (str(snapshot_dir), model_name)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Un autre thread a pu charger le modele pendant l'attente.
+            cached = self._lookup(key)
+            if cached is not None:
+                return cached
+            try:
+                model_path = snapshot_dir / f"{model_name}.joblib"
+                if not model_path.exists():
+                    raise FileNotFoundError(f"{model_path} not found. Train the model first.")
+                feature_path = snapshot_dir / "feature_columns.json"
+                if not feature_path.exists():
+                    raise FileNotFoundError("feature_columns.json not found. Run train_models() first.")
+                model = joblib.load(model_path)
+                _attach_compiled(model, snapshot_dir, model_name)
+                with open(feature_path, "r") as f:
+                    feature_cols = json.load(f)
+                size = model_path.stat().st_size
+
+                with self._lock:
+                    self._stats["misses"] += 1
+                    # Nouvelle version CURRENT: les entrees d'anciens snapshots sont obsoletes.
+                    for stale in [k for k in self._entries if k[0] != key[0]]:
+                        del self._entries[stale]
+                    self._entries[key] = (model, feature_cols, size)
+                    self._evict()
+                return model, feature_cols, snapshot_dir
+            finally:
+                with self._lock:
+                    self._load_locks.pop(key, None)
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[Tuple[object, List[str], Path]]:
+        """Entree en cache (compte un hit et la marque recente), sinon None."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return cached[0], cached[1], Path(key[0])
+
+    def __contains__(self, model_name: str) -> bool:
+        snapshot_dir = resolve_artifacts_dir(MODELS_KIND, self.artifacts_dir)
+        with self._lock:
+            return (str(snapshot_dir), model_name) in self._entries
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs hits/misses/evictions, nombre d'entrees et octets residents."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "bytes": sum(entry[2] for entry in self._entries.values()),
+            }
+
+    def clear(self) -> None:
+        """Vider le cache memoire."""
+        with self._lock:
+            self._entries.clear()
+
+
+_SHARED_CACHES: Dict[str, ModelCache] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_model_cache(artifacts_dir: Path = ARTIFACTS_DIR) -> ModelCache:
+    """Retourner le ``ModelCache`` partage du processus pour ``artifacts_dir``."""
+    key = str(Path(artifacts_dir).resolve())
+    with _SHARED_LOCK:
+        cache = _SHARED_CACHES.get(key)
+        if cache is None:
+            cache = ModelCache(artifacts_dir)
+            _SHARED_CACHES[key] = cache
+        return cache
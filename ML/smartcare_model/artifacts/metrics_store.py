@@ -0,0 +1,104 @@
+"""Stockage concurrent des metriques d'entrainement (SQLite).
+
+Plusieurs entrainements (modeles classiques, Prophet, workers de la flotte)
+peuvent enregistrer leurs resultats en parallele: chaque ecriture est une
+transaction SQLite, serialisee par le verrou de la base, sans
+lecture-modification-ecriture d'un fichier JSON partage.
+"""
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from smartcare_model.config.paths import ARTIFACTS_DIR
+
+METRICS_DB_FILENAME = "metrics.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metrics (
+    kind TEXT NOT NULL,
+    version TEXT NOT NULL,
+    name TEXT NOT NULL,
+    metrics TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (kind, version, name)
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics (name, recorded_at);
+"""
+
+
+class MetricsStore:
+    """Table ``metrics(kind, version, name, metrics, recorded_at)``.
+
+    Une connexion est ouverte par operation: l'objet peut etre cree dans le
+    processus parent puis utilise dans des workers.
+    """
+
+    def __init__(self, path: Optional[Path] = None, timeout: float = 30.0):
+        self.path = Path(path) if path is not None else ARTIFACTS_DIR / METRICS_DB_FILENAME
+        self.timeout = timeout
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def record(self, kind: str, version: str, results: Dict[str, object]) -> None:
+        """Enregistrer les metriques d'une version (remplace les noms existants).
+
+        Args:
+            kind: Type d'artefact (``models``, ``prophet``, ``prophet_fleet``).
+            version: Version du registre.
+            results: Dictionnaire {nom: metriques serialisables}.
+        """
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        rows = [
+            (kind, version, name, json.dumps(metrics, default=str), recorded_at)
+            for name, metrics in results.items()
+        ]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO metrics (kind, version, name, metrics, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        finally:
+            conn.close()
+
+    def get(self, kind: str, version: str) -> Dict[str, object]:
+        """Metriques d'une version, par nom."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT name, metrics FROM metrics WHERE kind = ? AND version = ? ORDER BY name",
+                (kind, version),
+            ).fetchall()
+        finally:
+            conn.close()
+        return {name: json.loads(metrics) for name, metrics in rows}
+
+    def history(self, name: str, limit: int = -1) -> List[Dict[str, object]]:
+        """Historique des metriques d'un modele, du plus recent au plus ancien."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT kind, version, metrics, recorded_at FROM metrics "
+                "WHERE name = ? ORDER BY recorded_at DESC LIMIT ?",
+                (name, limit),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {"kind": kind, "version": version, "metrics": json.loads(metrics), "recorded_at": recorded_at}
+            for kind, version, metrics, recorded_at in rows
+        ]
+
+    def latest(self, name: str) -> Optional[Dict[str, object]]:
+        """Dernieres metriques enregistrees pour un modele (None si aucune)."""
+        history = self.history(name, limit=1)
+        return history[0] if history else None
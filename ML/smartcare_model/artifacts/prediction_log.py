@@ -0,0 +1,356 @@
+"""Journal des predictions et des valeurs reelles (SQLite).
+
+Chaque prediction servie (date cible, modele, version, cible, valeur et
+bornes eventuelles) est ajoutee a la table ``predictions`` avec un
+identifiant d'execution. Les valeurs observees arrivent ensuite dans la
+table ``actuals``; les requetes par plage de dates les joignent aux
+predictions via les index (date, modele, execution), sans relire le
+journal complet.
+"""
+
+import json
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from smartcare_model.config.constants import DEFAULT_HOSPITAL_ID
+from smartcare_model.config.paths import ARTIFACTS_DIR
+from smartcare_model.evaluation.online import OnlineMetrics
+
+PREDICTION_LOG_FILENAME = "prediction_log.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    target_date TEXT NOT NULL,
+    hospital_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    model_version TEXT,
+    target TEXT NOT NULL,
+    prediction REAL NOT NULL,
+    lower REAL,
+    upper REAL,
+    inputs TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_predictions_date ON predictions (target, target_date, hospital_id);
+CREATE INDEX IF NOT EXISTS idx_predictions_model ON predictions (model, target, target_date);
+CREATE INDEX IF NOT EXISTS idx_predictions_run ON predictions (run_id);
+CREATE TABLE IF NOT EXISTS actuals (
+    target_date TEXT NOT NULL,
+    hospital_id TEXT NOT NULL,
+    target TEXT NOT NULL,
+    value REAL NOT NULL,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (target, hospital_id, target_date)
+);
+"""
+
+_COLUMNS = [
+    "run_id",
+    "created_at",
+    "date",
+    "hospital_id",
+    "model",
+    "model_version",
+    "target",
+    "prediction",
+    "lower",
+    "upper",
+    "actual",
+]
+
+
+def _iso_day(value) -> str:
+    return pd.Timestamp(value).date().isoformat()
+
+
+def _iso_days(values) -> list:
+    return pd.to_datetime(pd.Series(values)).dt.strftime("%Y-%m-%d").tolist()
+
+
+def _optional_float(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+class PredictionLog:
+    """Tables ``predictions`` et ``actuals`` d'une base SQLite.
+
+    Comme ``MetricsStore``, une connexion est ouverte par operation.
+
+    Args:
+        path: Chemin de la base (``<ARTIFACTS_DIR>/prediction_log.sqlite``
+            par defaut).
+        timeout: Attente maximale du verrou SQLite (secondes).
+    """
+
+    def __init__(self, path: Optional[Path] = None, timeout: float = 30.0):
+        self.path = Path(path) if path is not None else ARTIFACTS_DIR / PREDICTION_LOG_FILENAME
+        self.timeout = timeout
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def record(
+        self,
+        predictions: pd.DataFrame,
+        model: str,
+        targets: Iterable[str] = ("admissions",),
+        run_id: Optional[str] = None,
+        model_version: Optional[str] = None,
+        hospital_id: Optional[str] = None,
+        inputs: Optional[Mapping[str, object]] = None,
+    ) -> str:
+        """Ajouter les predictions d'une execution au journal.
+
+        Args:
+            predictions: DataFrame avec une colonne ``date`` et une colonne
+                par cible; ``<cible>_lower`` / ``<cible>_upper`` optionnelles.
+            model: Nom du modele (ou de la methode de repli).
+            targets: Colonnes cibles a journaliser.
+            run_id: Identifiant d'execution (genere si None).
+            model_version: Version de l'artefact servi.
+            hospital_id: Hopital (``DEFAULT_HOSPITAL_ID`` par defaut).
+            inputs: Entrees de la prediction (stockees en JSON).
+
+        Returns:
+            Identifiant d'execution.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        created_at = datetime.now(timezone.utc).isoformat()
+        hospital_id = hospital_id or DEFAULT_HOSPITAL_ID
+        inputs_json = json.dumps(dict(inputs), default=str, sort_keys=True) if inputs else None
+        dates = _iso_days(predictions["date"])
+        rows = []
+        for target in targets:
+            if target not in predictions.columns:
+                continue
+            values = predictions[target].tolist()
+            lower = predictions.get(f"{target}_lower", pd.Series([None] * len(predictions))).tolist()
+            upper = predictions.get(f"{target}_upper", pd.Series([None] * len(predictions))).tolist()
+            rows.extend(
+                (
+                    run_id,
+                    created_at,
+                    day,
+                    hospital_id,
+                    model,
+                    model_version,
+                    target,
+                    float(value),
+                    _optional_float(low),
+                    _optional_float(high),
+                    inputs_json,
+                )
+                for day, value, low, high in zip(dates, values, lower, upper)
+                if not pd.isna(value)
+            )
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO predictions (run_id, created_at, target_date, hospital_id, model, "
+                    "model_version, target, prediction, lower, upper, inputs) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        finally:
+            conn.close()
+        return run_id
+
+    def record_actuals(
+        self,
+        frame: pd.DataFrame,
+        targets: Mapping[str, str],
+        hospital_id: Optional[str] = None,
+    ) -> int:
+        """Enregistrer (ou corriger) des valeurs reelles.
+
+        Args:
+            frame: DataFrame avec une colonne ``date``.
+            targets: {cible: colonne de ``frame``} (ex. ``{"admissions":
+                "nombre_admissions"}``).
+            hospital_id: Hopital (``DEFAULT_HOSPITAL_ID`` par defaut).
+
+        Returns:
+            Nombre de lignes inserees ou modifiees.
+        """
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        hospital_id = hospital_id or DEFAULT_HOSPITAL_ID
+        dates = _iso_days(frame["date"])
+        rows = []
+        for target, column in targets.items():
+            if column not in frame.columns:
+                continue
+            rows.extend(
+                (day, hospital_id, target, float(value), recorded_at)
+                for day, value in zip(dates, frame[column].tolist())
+                if not pd.isna(value)
+            )
+        conn = self._connect()
+        try:
+            with conn:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT INTO actuals (target_date, hospital_id, target, value, recorded_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (target, hospital_id, target_date) DO UPDATE SET "
+                    "value = excluded.value, recorded_at = excluded.recorded_at "
+                    "WHERE value != excluded.value",
+                    rows,
+                )
+                return conn.total_changes - before
+        finally:
+            conn.close()
+
+    def date_range(self, target: Optional[str] = None) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Premiere et derniere date cible journalisees (None si journal vide)."""
+        sql = "SELECT MIN(target_date), MAX(target_date) FROM predictions"
+        params: Tuple[object, ...] = ()
+        if target is not None:
+            sql += " WHERE target = ?"
+            params = (target,)
+        conn = self._connect()
+        try:
+            first, last = conn.execute(sql, params).fetchone()
+        finally:
+            conn.close()
+        if first is None:
+            return None
+        return pd.Timestamp(first), pd.Timestamp(last)
+
+    @staticmethod
+    def _filters(start, end, model, run_id, target, hospital_id) -> Tuple[str, list]:
+        clauses = ["p.target = ?"]
+        params: list = [target]
+        if start is not None:
+            clauses.append("p.target_date >= ?")
+            params.append(_iso_day(start))
+        if end is not None:
+            clauses.append("p.target_date <= ?")
+            params.append(_iso_day(end))
+        if model is not None:
+            clauses.append("p.model = ?")
+            params.append(model)
+        if run_id is not None:
+            clauses.append("p.run_id = ?")
+            params.append(run_id)
+        if hospital_id is not None:
+            clauses.append("p.hospital_id = ?")
+            params.append(hospital_id)
+        return " AND ".join(clauses), params
+
+    def _joined(self, start, end, model, run_id, target, hospital_id, latest) -> Tuple[str, list]:
+        """Sous-requete predictions (+ derniere par date et modele) jointes aux reels."""
+        where, params = self._filters(start, end, model, run_id, target, hospital_id)
+        rank = (
+            ", ROW_NUMBER() OVER (PARTITION BY p.target_date, p.hospital_id, p.model, p.target "
+            "ORDER BY p.id DESC) AS rk"
+            if latest
+            else ", 1 AS rk"
+        )
+        sql = (
+            "SELECT r.*, a.value AS actual FROM ("
+            f"SELECT p.*{rank} FROM predictions p WHERE {where}"
+            ") r LEFT JOIN actuals a ON a.target = r.target AND a.hospital_id = r.hospital_id "
+            "AND a.target_date = r.target_date WHERE r.rk = 1"
+        )
+        return sql, params
+
+    def query(
+        self,
+        start=None,
+        end=None,
+        model: Optional[str] = None,
+        run_id: Optional[str] = None,
+        target: str = "admissions",
+        hospital_id: Optional[str] = None,
+        latest: bool = True,
+    ) -> pd.DataFrame:
+        """Predictions d'une plage de dates, jointes aux valeurs reelles.
+
+        Args:
+            start: Premiere date cible incluse (None = pas de borne).
+            end: Derniere date cible incluse (None = pas de borne).
+            model: Filtre sur le modele.
+            run_id: Filtre sur une execution.
+            target: Cible (``admissions``, ``urgences``...).
+            hospital_id: Filtre sur l'hopital.
+            latest: Ne garder que la prediction la plus recente par date,
+                hopital et modele.
+
+        Returns:
+            DataFrame trie par date et modele (``actual`` NaN si la valeur
+            reelle n'est pas encore connue).
+        """
+        sql, params = self._joined(start, end, model, run_id, target, hospital_id, latest)
+        columns = ", ".join(
+            "target_date AS date" if column == "date" else column for column in _COLUMNS
+        )
+        conn = self._connect()
+        try:
+            df = pd.read_sql_query(
+                f"SELECT {columns} FROM ({sql}) ORDER BY target_date, model, created_at", conn, params=params
+            )
+        finally:
+            conn.close()
+        df["date"] = pd.to_datetime(df["date"])
+        df[["prediction", "lower", "upper", "actual"]] = df[["prediction", "lower", "upper", "actual"]].astype(float)
+        return df
+
+    def accuracy(
+        self,
+        start=None,
+        end=None,
+        model: Optional[str] = None,
+        target: str = "admissions",
+        hospital_id: Optional[str] = None,
+        latest: bool = True,
+    ) -> Dict[str, OnlineMetrics]:
+        """Metriques par modele sur les predictions dont le reel est connu.
+
+        Les sommes sont agregees par SQLite; chaque accumulateur peut etre
+        fusionne ou complete jour par jour (``OnlineMetrics``).
+
+        Returns:
+            {modele: ``OnlineMetrics``}; ``.result()`` donne MAE, RMSE,
+            MAPE, sMAPE et ``n``.
+        """
+        sql, params = self._joined(start, end, model, None, target, hospital_id, latest)
+        aggregate = (
+            "SELECT model, COUNT(*), SUM(ABS(actual - prediction)), "
+            "SUM((actual - prediction) * (actual - prediction)), "
+            "SUM(actual != 0), "
+            "TOTAL(CASE WHEN actual != 0 THEN ABS(actual - prediction) / ABS(actual) END), "
+            "SUM(ABS(actual) + ABS(prediction) != 0), "
+            "TOTAL(CASE WHEN ABS(actual) + ABS(prediction) != 0 THEN "
+            "ABS(actual - prediction) / ((ABS(actual) + ABS(prediction)) / 2.0) END) "
+            f"FROM ({sql}) WHERE actual IS NOT NULL GROUP BY model ORDER BY model"
+        )
+        conn = self._connect()
+        try:
+            rows = conn.execute(aggregate, params).fetchall()
+        finally:
+            conn.close()
+        return {
+            name: OnlineMetrics.from_dict(
+                {
+                    "n": n,
+                    "sum_abs": sum_abs,
+                    "sum_sq": sum_sq,
+                    "n_pct": n_pct,
+                    "sum_pct": sum_pct,
+                    "n_spct": n_spct,
+                    "sum_spct": sum_spct,
+                }
+            )
+            for name, n, sum_abs, sum_sq, n_pct, sum_pct, n_spct, sum_spct in rows
+        }
@@ -0,0 +1,249 @@
+"""Registre d'artefacts versionne et adresse par contenu.
+
+Layout::
+
+    artifacts/registry/<kind>/<version>/   # repertoire immuable (manifest.json + fichiers)
+    artifacts/registry/<kind>/CURRENT      # pointeur atomique vers la version active
+
+La version est un hash du fingerprint des donnees et des parametres
+d'entrainement: deux runs identiques produisent la meme version, ce qui
+permet de sauter un re-entrainement. Un re-entrainement force est publie
+sous un nouvel identifiant (``<version>-<nonce>``, voir ``run_version``):
+un repertoire de version n'est jamais reecrit. Chaque version est ecrite
+dans un repertoire temporaire puis renommee; ``CURRENT`` est remplace via
+``os.replace``. Un lecteur voit donc toujours un jeu complet et coherent.
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from smartcare_model.config.paths import ARTIFACTS_DIR
+
+REGISTRY_DIRNAME = "registry"
+MANIFEST_FILENAME = "manifest.json"
+CURRENT_FILENAME = "CURRENT"
+MODELS_KIND = "models"
+PROPHET_KIND = "prophet"
+TRAINING_LIBRARIES = ("numpy", "pandas", "scikit-learn", "joblib")
+
+
+def fingerprint_dataframe(df: pd.DataFrame) -> str:
+    """Empreinte SHA-256 du contenu d'un DataFrame (colonnes + valeurs).
+
+    Args:
+        df: DataFrame a empreinter (l'index est ignore).
+
+    Returns:
+        Hash hexadecimal.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in df.columns]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def library_versions(packages: Iterable[str] = TRAINING_LIBRARIES) -> Dict[str, Optional[str]]:
+    """Versions installees des librairies d'entrainement.
+
+    Un artefact produit avec une autre version de scikit-learn (ou numpy...)
+    n'est pas reutilise: ces versions entrent dans le hash de version.
+
+    Args:
+        packages: Noms de distributions a interroger.
+
+    Returns:
+        Dictionnaire {package: version} (None si non installe).
+    """
+    versions: Dict[str, Optional[str]] = {}
+    for name in packages:
+        try:
+            versions[name] = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def compute_version(data_fingerprint: str, params: Dict[str, object]) -> str:
+    """Calculer l'identifiant de version (hash de donnees + parametres).
+
+    Args:
+        data_fingerprint: Empreinte des donnees d'entrainement.
+        params: Parametres serialisables (``default=str`` pour le reste).
+
+    Returns:
+        16 premiers caracteres hexadecimaux du SHA-256.
+    """
+    payload = json.dumps(
+        {"data": data_fingerprint, "params": params},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def run_version(version: str) -> str:
+    """Identifiant unique d'un re-entrainement force de ``version``.
+
+    Args:
+        version: Version calculee par ``compute_version``.
+
+    Returns:
+        ``<version>-<nonce>`` (nonce aleatoire de 8 caracteres).
+    """
+    return f"{version}-{uuid.uuid4().hex[:8]}"
+
+
+def _kind_dir(kind: str, artifacts_dir: Path) -> Path:
+    return Path(artifacts_dir) / REGISTRY_DIRNAME / kind
+
+
+def version_dir(kind: str, version: str, artifacts_dir: Path = ARTIFACTS_DIR) -> Path:
+    """Chemin du repertoire d'une version."""
+    return _kind_dir(kind, artifacts_dir) / version
+
+
+def has_version(kind: str, version: str, artifacts_dir: Path = ARTIFACTS_DIR) -> bool:
+    """Indiquer si une version complete (avec manifest) existe."""
+    return (version_dir(kind, version, artifacts_dir) / MANIFEST_FILENAME).exists()
+
+
+def read_manifest(kind: str, version: str, artifacts_dir: Path = ARTIFACTS_DIR) -> Dict[str, object]:
+    """Lire le manifest d'une version.
+
+    Raises:
+        FileNotFoundError: Si la version n'existe pas.
+    """
+    path = version_dir(kind, version, artifacts_dir) / MANIFEST_FILENAME
+    if not path.exists():
+        raise FileNotFoundError(f"Version {kind}/{version} introuvable: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_versions(kind: str, artifacts_dir: Path = ARTIFACTS_DIR) -> List[str]:
+    """Lister les versions publiees d'un type d'artefact (ordre de creation)."""
+    root = _kind_dir(kind, artifacts_dir)
+    if not root.exists():
+        return []
+    manifests = [p / MANIFEST_FILENAME for p in root.iterdir() if p.is_dir() and not p.name.startswith(".")]
+    manifests = [m for m in manifests if m.exists()]
+    return [m.parent.name for m in sorted(manifests, key=lambda m: m.stat().st_mtime)]
+
+
+def current_version(kind: str, artifacts_dir: Path = ARTIFACTS_DIR) -> Optional[str]:
+    """Version pointee par ``CURRENT`` (None si absente ou invalide)."""
+    pointer = _kind_dir(kind, artifacts_dir) / CURRENT_FILENAME
+    if not pointer.exists():
+        return None
+    version = pointer.read_text(encoding="utf-8").strip()
+    return version if version and has_version(kind, version, artifacts_dir) else None
+
+
+def matching_version(kind: str, version: str, artifacts_dir: Path = ARTIFACTS_DIR) -> Optional[str]:
+    """Version publiee reutilisable pour le hash ``version``.
+
+    ``CURRENT`` est prefere s'il s'agit de ``version`` ou d'un de ses
+    re-entrainements forces (``run_version``); sinon ``version`` si elle
+    existe.
+
+    Returns:
+        Identifiant de la version, ou None si aucune n'existe.
+    """
+    current = current_version(kind, artifacts_dir)
+    if current is not None and (current == version or current.startswith(f"{version}-")):
+        return current
+    return version if has_version(kind, version, artifacts_dir) else None
+
+
+def set_current(kind: str, version: str, artifacts_dir: Path = ARTIFACTS_DIR) -> None:
+    """Pointer ``CURRENT`` vers une version existante (remplacement atomique).
+
+    Raises:
+        FileNotFoundError: Si la version n'existe pas.
+    """
+    if not has_version(kind, version, artifacts_dir):
+        raise FileNotFoundError(f"Version {kind}/{version} introuvable.")
+    root = _kind_dir(kind, artifacts_dir)
+    tmp_path = root / f".{CURRENT_FILENAME}.{uuid.uuid4().hex}"
+    tmp_path.write_text(version, encoding="utf-8")
+    os.replace(tmp_path, root / CURRENT_FILENAME)
+
+
+def resolve_artifacts_dir(kind: str = MODELS_KIND, artifacts_dir: Path = ARTIFACTS_DIR) -> Path:
+    """Repertoire a lire pour un type d'artefact.
+
+    Retourne la version ``CURRENT`` du registre si elle existe, sinon
+    ``artifacts_dir`` (layout plat historique).
+    """
+    version = current_version(kind, artifacts_dir)
+    if version is None:
+        return Path(artifacts_dir)
+    return version_dir(kind, version, artifacts_dir)
+
+
+def publish_version(
+    kind: str,
+    version: str,
+    write_files: Callable[[Path], None],
+    manifest: Optional[Dict[str, object]] = None,
+    artifacts_dir: Path = ARTIFACTS_DIR,
+    make_current: bool = True,
+) -> Path:
+    """Publier une version immuable puis (optionnellement) la rendre active.
+
+    Si la version existe deja, rien n'est reecrit: un re-entrainement force
+    doit utiliser un nouvel identifiant (``run_version``).
+
+    Args:
+        kind: Type d'artefact (``models``, ``prophet``...).
+        version: Identifiant (voir ``compute_version``).
+        write_files: Callback qui ecrit les fichiers dans le repertoire fourni.
+        manifest: Metadonnees supplementaires a stocker dans ``manifest.json``.
+        artifacts_dir: Racine des artefacts.
+        make_current: Met a jour ``CURRENT`` apres publication.
+
+    Returns:
+        Repertoire de la version publiee.
+
+    Side Effects:
+        Cree ``registry/<kind>/<version>/`` et remplace ``CURRENT``.
+    """
+    final_dir = version_dir(kind, version, artifacts_dir)
+    if not has_version(kind, version, artifacts_dir):
+        final_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = final_dir.parent / f".tmp-{version}-{uuid.uuid4().hex}"
+        tmp_dir.mkdir()
+        try:
+            write_files(tmp_dir)
+            files = sorted(p.name for p in tmp_dir.iterdir())
+            full_manifest = {
+                "kind": kind,
+                "version": version,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "files": files,
+            }
+            full_manifest.update(manifest or {})
+            with open(tmp_dir / MANIFEST_FILENAME, "w", encoding="utf-8") as f:
+                json.dump(full_manifest, f, indent=2, default=str)
+            try:
+                os.rename(tmp_dir, final_dir)
+            except OSError:
+                # Publication concurrente de la meme version: la premiere gagne.
+                if not has_version(kind, version, artifacts_dir):
+                    raise
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+    if make_current:
+        set_current(kind, version, artifacts_dir)
+    return final_dir
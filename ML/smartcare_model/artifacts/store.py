@@ -1,11 +1,24 @@
-"""Persistance des artefacts de modele."""
+"""Persistance des artefacts de modele.
+
+Les artefacts sont publies dans le registre versionne
+(``artifacts/registry/models/<version>/``, voir ``artifacts.registry``).
+Les lecteurs resolvent la version ``CURRENT`` et retombent sur le layout
+plat historique (``artifacts/*.joblib``) si aucun registre n'existe.
+"""
 
 import json
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import joblib
 
+from smartcare_model.artifacts.cache import _attach_compiled
+from smartcare_model.artifacts.registry import (
+    MODELS_KIND,
+    PROPHET_KIND,
+    publish_version,
+    resolve_artifacts_dir,
+)
 from smartcare_model.config.constants import DEFAULT_MODEL_NAME
 from smartcare_model.config.paths import ARTIFACTS_DIR
 
@@ -14,40 +27,66 @@ def save_artifacts(
     feature_cols: List[str],
     results: Dict[str, Dict[str, float]],
     trained_models: Dict[str, object],
+    version: str,
     artifacts_dir: Path = ARTIFACTS_DIR,
-) -> None:
-    """Sauvegarder features, metriques et modeles entraines.
+    manifest: Optional[Dict[str, object]] = None,
+    extra_files: Optional[Dict[str, Callable[[Path], None]]] = None,
+) -> Path:
+    """Publier features, metriques et modeles entraines dans le registre.
 
     Args:
         feature_cols: Liste ordonnee des features utilisees.
         results: Metriques par modele ou baseline.
         trained_models: Modeles entraines par nom.
-        artifacts_dir: Dossier de sortie des artefacts.
+        version: Identifiant de version (``compute_version`` sur l'empreinte
+            des donnees et les parametres d'entrainement, ``run_version``
+            pour un re-entrainement force). Une version existante n'est pas
+            reecrite.
+        artifacts_dir: Racine des artefacts.
+        manifest: Metadonnees supplementaires du manifest.
+        extra_files: Fichiers supplementaires {nom: fonction d'ecriture(chemin)},
+            ecrits dans la meme version (ex. ``conformal.npz``).
+
+    Returns:
+        Repertoire de la version publiee.
 
     Side Effects:
-        Ecrit des fichiers JSON et joblib dans ``artifacts_dir``.
+        Ecrit une version immuable sous ``artifacts_dir/registry/models`` et
+        met a jour ``CURRENT``. Les modeles sont ecrits sans compression;
+        les ensembles d'arbres supportes ont aussi leurs tableaux aplatis
+        (``<nom>.trees/``, voir ``inference.compiled``).
     """
-    artifacts_dir.mkdir(parents=True, exist_ok=True)
-    with open(artifacts_dir / "feature_columns.json", "w") as f:
-        json.dump(feature_cols, f, indent=2)
-    metrics_path = artifacts_dir / "metrics.json"
-    if metrics_path.exists():
-        with open(metrics_path, "r") as f:
-            existing = json.load(f)
-    else:
-        existing = {}
-    existing.update(results)
-    with open(metrics_path, "w") as f:
-        json.dump(existing, f, indent=2)
-    for name, model in trained_models.items():
-        joblib.dump(model, artifacts_dir / f"{name}.joblib")
+    artifacts_dir = Path(artifacts_dir)
+
+    # Import local: ``smartcare_model.inference`` importe ``artifacts`` (cycle).
+    from smartcare_model.inference.compiled import COMPILED_SUFFIX, save_compiled
+
+    def _write(target: Path) -> None:
+        with open(target / "feature_columns.json", "w") as f:
+            json.dump(feature_cols, f, indent=2)
+        with open(target / "metrics.json", "w") as f:
+            json.dump(results, f, indent=2)
+        for name, model in trained_models.items():
+            joblib.dump(model, target / f"{name}.joblib", compress=0)
+            save_compiled(model, target / f"{name}{COMPILED_SUFFIX}")
+        for filename, write_file in (extra_files or {}).items():
+            write_file(target / filename)
+
+    return publish_version(
+        MODELS_KIND,
+        version,
+        _write,
+        manifest={"models": sorted(trained_models), **(manifest or {})},
+        artifacts_dir=artifacts_dir,
+    )
 
 
 def load_feature_columns(artifacts_dir: Path = ARTIFACTS_DIR) -> List[str]:
     """Charger la liste de features persistees.
 
     Args:
-        artifacts_dir: Dossier contenant ``feature_columns.json``.
+        artifacts_dir: Racine des artefacts (version ``CURRENT`` du registre,
+            ou layout plat).
 
     Returns:
         Liste ordonnee des colonnes features.
@@ -55,7 +94,7 @@ def load_feature_columns(artifacts_dir: Path = ARTIFACTS_DIR) -> List[str]:
     Raises:
         FileNotFoundError: Si le fichier est absent.
     """
-    path = artifacts_dir / "feature_columns.json"
+    path = resolve_artifacts_dir(MODELS_KIND, artifacts_dir) / "feature_columns.json"
     if not path.exists():
         raise FileNotFoundError("feature_columns.json not found. Run train_models() first.")
     with open(path, "r") as f:
@@ -68,9 +107,15 @@ def load_artifacts(
 ) -> Tuple[object, List[str]]:
     """Charger un modele entraine et ses features.
 
+    Les tableaux aplatis publies avec le modele (``<nom>.trees/``) sont
+    projetes en memoire et attaches au modele: le chemin rapide
+    (``predict_fast``) lit des pages partagees entre processus au lieu d'une
+    copie compilee par processus. Modele et features sont lus dans la meme
+    version du registre.
+
     Args:
         model_name: Nom du modele a charger (par defaut: ``DEFAULT_MODEL_NAME``).
-        artifacts_dir: Dossier contenant les artefacts.
+        artifacts_dir: Racine des artefacts.
 
     Returns:
         Tuple (modele, feature_columns).
@@ -78,9 +123,43 @@ def load_artifacts(
     Raises:
         FileNotFoundError: Si l'artefact de modele est absent.
     """
-    model_path = artifacts_dir / f"{model_name}.joblib"
+    snapshot_dir = resolve_artifacts_dir(MODELS_KIND, artifacts_dir)
+    model_path = snapshot_dir / f"{model_name}.joblib"
     if not model_path.exists():
         raise FileNotFoundError(f"{model_path} not found. Train the model first.")
     model = joblib.load(model_path)
-    feature_cols = load_feature_columns(artifacts_dir)
+    _attach_compiled(model, snapshot_dir, model_name)
+    feature_path = snapshot_dir / "feature_columns.json"
+    if not feature_path.exists():
+        raise FileNotFoundError("feature_columns.json not found. Run train_models() first.")
+    with open(feature_path, "r") as f:
+        feature_cols = json.load(f)
     return model, feature_cols
+
+
+def load_metrics(artifacts_dir: Path = ARTIFACTS_DIR) -> Dict[str, object]:
+    """Charger les metriques des versions actives (modeles et Prophet).
+
+    Le ``metrics.json`` plat historique sert de base; les metriques des
+    versions ``CURRENT`` du registre le completent et l'emportent.
+
+    Args:
+        artifacts_dir: Racine des artefacts.
+
+    Returns:
+        Dictionnaire {nom: metriques} (vide si rien n'est disponible).
+    """
+    artifacts_dir = Path(artifacts_dir)
+    merged: Dict[str, object] = {}
+    candidates = [artifacts_dir] + [
+        resolve_artifacts_dir(kind, artifacts_dir) for kind in (MODELS_KIND, PROPHET_KIND)
+    ]
+    seen = set()
+    for directory in candidates:
+        path = directory / "metrics.json"
+        if path in seen or not path.exists():
+            continue
+        seen.add(path)
+        with open(path, "r", encoding="utf-8") as f:
+            merged.update(json.load(f))
+    return merged
@@ -1,20 +1,45 @@
 """Couche de configuration: chemins et constantes."""
 
 from smartcare_model.config.constants import (
+    BOOTSTRAP_CONFIDENCE,
+    BOOTSTRAP_SAMPLES,
+    CONFORMAL_DEFAULT_COVERAGE,
+    CONFORMAL_HORIZON_EDGES,
+    CONFORMAL_LEVELS,
+    CONFORMAL_MIN_CELL,
     DATA_FILENAME_HINT,
+    DEFAULT_HOSPITAL_ID,
     DEFAULT_MODEL_NAME,
+    HOSPITAL_ID_COL,
+    MODEL_CACHE_MAX_MB,
     NUMERIC_COLUMNS,
+    PREDICTION_CACHE_MAX_ENTRIES,
+    PREDICTION_CACHE_TTL_S,
+    QUANTILE_LEVELS,
     TARGET_COL,
 )
-from smartcare_model.config.paths import ARTIFACTS_DIR, DATA_DIR, ML_ROOT, RAW_DIR
+from smartcare_model.config.paths import ARTIFACTS_DIR, DATA_DIR, ML_ROOT, PARTITIONED_DIR, RAW_DIR
 
 __all__ = [
     "ARTIFACTS_DIR",
+    "BOOTSTRAP_CONFIDENCE",
+    "BOOTSTRAP_SAMPLES",
+    "CONFORMAL_DEFAULT_COVERAGE",
+    "CONFORMAL_HORIZON_EDGES",
+    "CONFORMAL_LEVELS",
+    "CONFORMAL_MIN_CELL",
     "DATA_DIR",
     "DATA_FILENAME_HINT",
+    "DEFAULT_HOSPITAL_ID",
     "DEFAULT_MODEL_NAME",
+    "HOSPITAL_ID_COL",
     "ML_ROOT",
+    "MODEL_CACHE_MAX_MB",
     "NUMERIC_COLUMNS",
+    "PARTITIONED_DIR",
+    "PREDICTION_CACHE_MAX_ENTRIES",
+    "PREDICTION_CACHE_TTL_S",
+    "QUANTILE_LEVELS",
     "RAW_DIR",
     "TARGET_COL",
 ]
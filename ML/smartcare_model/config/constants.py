@@ -3,6 +3,18 @@
 DATA_FILENAME_HINT = "daily_hospital_context_2022-2026_generated.csv"
 DEFAULT_MODEL_NAME = "gradient_boosting"
 TARGET_COL = "y"
+HOSPITAL_ID_COL = "hospital_id"
+DEFAULT_HOSPITAL_ID = "HOP_0001"
+MODEL_CACHE_MAX_MB = 512
+PREDICTION_CACHE_MAX_ENTRIES = 1024
+PREDICTION_CACHE_TTL_S = 6 * 3600
+QUANTILE_LEVELS = (0.1, 0.5, 0.9)
+CONFORMAL_LEVELS = (0.5, 0.8, 0.9, 0.95)
+CONFORMAL_DEFAULT_COVERAGE = 0.8
+CONFORMAL_HORIZON_EDGES = (7, 30, 90)
+CONFORMAL_MIN_CELL = 20
+BOOTSTRAP_SAMPLES = 1000
+BOOTSTRAP_CONFIDENCE = 0.95
 
 NUMERIC_COLUMNS = [
     "temperature_moyenne",
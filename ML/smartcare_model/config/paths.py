@@ -7,4 +7,6 @@ ML_ROOT = Path(__file__).resolve().parents[2]
 PROJECT_ROOT = ML_ROOT.parent
 DATA_DIR = PROJECT_ROOT / "data"
 RAW_DIR = DATA_DIR / "raw"
+# Layout multi-hopitaux: partitioned/hospital_id=<id>/<fichier>.csv|.parquet
+PARTITIONED_DIR = DATA_DIR / "partitioned"
 ARTIFACTS_DIR = ML_ROOT / "artifacts"
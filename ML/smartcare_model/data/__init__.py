@@ -1,5 +1,5 @@
 """Acces aux donnees et chargement."""
 
-from smartcare_model.data.loading import load_raw_dataframe
+from smartcare_model.data.loading import load_partitioned_dataframe, load_raw_dataframe
 
-__all__ = ["load_raw_dataframe"]
+__all__ = ["load_partitioned_dataframe", "load_raw_dataframe"]
@@ -2,12 +2,12 @@
 
 import os
 from pathlib import Path
-from typing import List
+from typing import Iterable, List, Optional
 
 import pandas as pd
 
-from smartcare_model.config.constants import DATA_FILENAME_HINT, NUMERIC_COLUMNS
-from smartcare_model.config.paths import RAW_DIR
+from smartcare_model.config.constants import DATA_FILENAME_HINT, HOSPITAL_ID_COL, NUMERIC_COLUMNS
+from smartcare_model.config.paths import PARTITIONED_DIR, RAW_DIR
 
 
 def _to_float(series: pd.Series) -> pd.Series:
@@ -19,6 +19,8 @@ def _to_float(series: pd.Series) -> pd.Series:
     Returns:
         Serie numerique avec valeurs invalides en NaN.
     """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
     return pd.to_numeric(series.astype(str).str.replace(",", ".", regex=False), errors="coerce")
 
 
@@ -43,23 +45,86 @@ def _get_data_path(raw_dir: Path = RAW_DIR, filename_hint: str = DATA_FILENAME_H
     return raw_dir / matches[0]
 
 
-def load_raw_dataframe() -> pd.DataFrame:
+def _clean_raw_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    """Parser les dates, trier et convertir les colonnes numeriques.
+
+    Le tri se fait par ``(hospital_id, date)`` si la colonne hopital existe,
+    sinon par ``date``.
+    """
+    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
+    sort_cols = [HOSPITAL_ID_COL, "date"] if HOSPITAL_ID_COL in df.columns else ["date"]
+    df = df.sort_values(sort_cols, kind="stable").reset_index(drop=True)
+
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = _to_float(df[col])
+    return df
+
+
+def _read_partition_file(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def load_partitioned_dataframe(
+    root: Path = PARTITIONED_DIR,
+    hospital_ids: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Charger un dataset multi-hopitaux partitionne par hopital.
+
+    Layout attendu: ``<root>/hospital_id=<id>/*.csv`` ou ``*.parquet``
+    (par exemple un fichier par annee). Seules les partitions demandees
+    sont lues.
+
+    Args:
+        root: Dossier racine des partitions.
+        hospital_ids: Sous-ensemble optionnel d'hopitaux a charger.
+
+    Returns:
+        DataFrame nettoye avec une colonne ``hospital_id``, trie par hopital puis date.
+
+    Raises:
+        FileNotFoundError: Si aucune partition ne correspond.
+    """
+    wanted = None if hospital_ids is None else {str(h) for h in hospital_ids}
+    frames: List[pd.DataFrame] = []
+    for part_dir in sorted(Path(root).glob(f"{HOSPITAL_ID_COL}=*")):
+        hospital_id = part_dir.name.split("=", 1)[1]
+        if wanted is not None and hospital_id not in wanted:
+            continue
+        files = sorted(p for p in part_dir.iterdir() if p.suffix in (".csv", ".parquet"))
+        for path in files:
+            part = _read_partition_file(path)
+            part[HOSPITAL_ID_COL] = hospital_id
+            frames.append(part)
+    if not frames:
+        raise FileNotFoundError(f"No '{HOSPITAL_ID_COL}=<id>' partition found in {root}")
+    return _clean_raw_dataframe(pd.concat(frames, ignore_index=True))
+
+
+def load_raw_dataframe(
+    partitioned_dir: Optional[Path] = None,
+    hospital_ids: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
     """Charger et nettoyer le dataset brut.
 
     Etapes:
-    - Lecture du CSV depuis ``RAW_DIR``.
+    - Lecture du CSV depuis ``RAW_DIR`` (ou des partitions ``hospital_id=<id>/``
+      si ``partitioned_dir`` est fourni).
     - Parsing de la colonne ``date`` en datetime.
-    - Tri des donnees par date.
+    - Tri des donnees par date (par hopital puis date en multi-hopitaux).
     - Conversion des colonnes numeriques avec virgule.
 
+    Args:
+        partitioned_dir: Racine optionnelle d'un dataset partitionne par hopital.
+        hospital_ids: Sous-ensemble d'hopitaux (mode partitionne uniquement).
+
     Returns:
         DataFrame nettoye, pret pour le feature engineering.
     """
+    if partitioned_dir is not None:
+        return load_partitioned_dataframe(partitioned_dir, hospital_ids=hospital_ids)
     df = pd.read_csv(_get_data_path())
-    df["date"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
-    df = df.sort_values("date").reset_index(drop=True)
-
-    for col in NUMERIC_COLUMNS:
-        if col in df.columns:
-            df[col] = _to_float(df[col])
-    return df
+    return _clean_raw_dataframe(df)
@@ -1,5 +1,17 @@
 """Metriques de performance des modeles."""
 
-from smartcare_model.evaluation.metrics import evaluate, mape, smape
+from smartcare_model.evaluation.metrics import evaluate, evaluate_interval, mape, pinball_loss, smape
+from smartcare_model.evaluation.online import OnlineMetrics
+from smartcare_model.evaluation.scoring import bootstrap_metrics, score_matrix, score_models
 
-__all__ = ["evaluate", "mape", "smape"]
+__all__ = [
+    "OnlineMetrics",
+    "bootstrap_metrics",
+    "evaluate",
+    "evaluate_interval",
+    "mape",
+    "pinball_loss",
+    "score_matrix",
+    "score_models",
+    "smape",
+]
@@ -43,6 +43,42 @@ def smape(y_true, y_pred) -> float:
     return float(np.mean(np.abs(y_true[mask] - y_pred[mask]) / denominator[mask]) * 100)
 
 
+def pinball_loss(y_true, y_pred, level: float) -> float:
+    """Calculer la perte pinball (quantile) moyenne.
+
+    Args:
+        y_true: Valeurs reelles.
+        y_pred: Predictions du quantile ``level``.
+        level: Niveau de quantile dans ]0, 1[.
+
+    Returns:
+        Perte moyenne (plus faible = quantile mieux estime).
+    """
+    diff = np.asarray(y_true, dtype=float) - np.asarray(y_pred, dtype=float)
+    return float(np.mean(np.maximum(level * diff, (level - 1) * diff)))
+
+
+def evaluate_interval(y_true, lower, upper) -> Dict[str, float]:
+    """Calculer la couverture et la largeur moyenne d'un intervalle.
+
+    Args:
+        y_true: Valeurs reelles.
+        lower: Bornes basses.
+        upper: Bornes hautes.
+
+    Returns:
+        Dictionnaire avec ``coverage`` (part des valeurs dans l'intervalle)
+        et ``mean_width``.
+    """
+    y_true = np.asarray(y_true, dtype=float)
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    return {
+        "coverage": float(np.mean((y_true >= lower) & (y_true <= upper))),
+        "mean_width": float(np.mean(upper - lower)),
+    }
+
+
 def evaluate(y_true, y_pred) -> Dict[str, float]:
     """Calculer les metriques d'evaluation pour un vecteur de prediction.
 
@@ -0,0 +1,112 @@
+"""Metriques d'evaluation incrementales (suivi en continu).
+
+``OnlineMetrics`` garde des sommes courantes (erreurs absolues, carres,
+pourcentages) au lieu des vecteurs complets: ajouter un jour observe,
+retirer un jour sorti d'une fenetre glissante ou fusionner les
+accumulateurs de plusieurs workers / folds coute O(1). ``result`` renvoie
+les memes metriques que ``evaluate`` sur les paires accumulees.
+"""
+
+import math
+from typing import Dict
+
+import numpy as np
+
+_FIELDS = ("n", "sum_abs", "sum_sq", "n_pct", "sum_pct", "n_spct", "sum_spct")
+
+
+class OnlineMetrics:
+    """Accumulateur MAE / RMSE / MAPE / sMAPE.
+
+    Les paires dont la valeur reelle ou predite est NaN (reel pas encore
+    connu) sont ignorees. Les masques sont ceux de ``evaluate``: MAPE sur
+    les reels non nuls, sMAPE sur les denominateurs non nuls.
+    """
+
+    __slots__ = _FIELDS
+
+    def __init__(self):
+        self.n = 0
+        self.sum_abs = 0.0
+        self.sum_sq = 0.0
+        self.n_pct = 0
+        self.sum_pct = 0.0
+        self.n_spct = 0
+        self.sum_spct = 0.0
+
+    def _add(self, y_true, y_pred, sign: int) -> "OnlineMetrics":
+        y_true = np.atleast_1d(np.asarray(y_true, dtype=float))
+        y_pred = np.atleast_1d(np.asarray(y_pred, dtype=float))
+        valid = ~(np.isnan(y_true) | np.isnan(y_pred))
+        y_true, y_pred = y_true[valid], y_pred[valid]
+        err = np.abs(y_true - y_pred)
+        pct = y_true != 0
+        denominator = (np.abs(y_true) + np.abs(y_pred)) / 2.0
+        spct = denominator != 0
+        self.n += sign * int(y_true.size)
+        self.sum_abs += sign * float(err.sum())
+        self.sum_sq += sign * float(np.square(err).sum())
+        self.n_pct += sign * int(pct.sum())
+        self.sum_pct += sign * float((err[pct] / np.abs(y_true[pct])).sum())
+        self.n_spct += sign * int(spct.sum())
+        self.sum_spct += sign * float((err[spct] / denominator[spct]).sum())
+        return self
+
+    def update(self, y_true, y_pred) -> "OnlineMetrics":
+        """Ajouter une ou plusieurs paires (reel, prediction).
+
+        Args:
+            y_true: Valeur(s) reelle(s).
+            y_pred: Prediction(s) correspondante(s).
+
+        Returns:
+            L'accumulateur (chainage).
+        """
+        return self._add(y_true, y_pred, 1)
+
+    def remove(self, y_true, y_pred) -> "OnlineMetrics":
+        """Retirer des paires deja ajoutees (fenetre glissante)."""
+        return self._add(y_true, y_pred, -1)
+
+    def merge(self, other: "OnlineMetrics") -> "OnlineMetrics":
+        """Ajouter les sommes d'un autre accumulateur (worker, fold, hopital)."""
+        for field in _FIELDS:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+        return self
+
+    def __iadd__(self, other: "OnlineMetrics") -> "OnlineMetrics":
+        return self.merge(other)
+
+    def __add__(self, other: "OnlineMetrics") -> "OnlineMetrics":
+        return OnlineMetrics.from_dict(self.to_dict()).merge(other)
+
+    def result(self) -> Dict[str, float]:
+        """Metriques courantes (NaN si aucune paire).
+
+        Returns:
+            Dictionnaire ``mae``, ``rmse``, ``mape``, ``smape`` (comme
+            ``evaluate``) et ``n``.
+        """
+        nan = float("nan")
+        return {
+            "mae": self.sum_abs / self.n if self.n else nan,
+            "rmse": math.sqrt(max(self.sum_sq, 0.0) / self.n) if self.n else nan,
+            "mape": self.sum_pct / self.n_pct * 100 if self.n_pct else nan,
+            "smape": self.sum_spct / self.n_spct * 100 if self.n_spct else nan,
+            "n": self.n,
+        }
+
+    def to_dict(self) -> Dict[str, float]:
+        """Etat serialisable (JSON) de l'accumulateur."""
+        return {field: getattr(self, field) for field in _FIELDS}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, float]) -> "OnlineMetrics":
+        """Recreer un accumulateur depuis ``to_dict``."""
+        metrics = cls()
+        for field in _FIELDS:
+            setattr(metrics, field, type(getattr(metrics, field))(state.get(field, 0)))
+        return metrics
+
+    def __repr__(self) -> str:
+        return f"OnlineMetrics({self.result()})"
@@ -0,0 +1,216 @@
+"""Scoring vectorise de plusieurs vecteurs de prediction.
+
+Les predictions de plusieurs modeles (ou horizons) sont empilees dans une
+matrice (lignes x echantillons): MAE, RMSE, MAPE et sMAPE de toutes les
+lignes sont calcules en une passe, avec les memes masques que ``evaluate``.
+Les intervalles bootstrap reutilisent les matrices d'erreurs: un
+reechantillonnage est un vecteur de poids (nombre de tirages par
+echantillon), et un lot de reechantillonnages un produit matriciel. La
+taille des lots depend du nombre d'echantillons (``_BOOTSTRAP_MAX_CELLS``
+poids par lot) et le nombre de lots simultanes est borne: la memoire reste
+de l'ordre de quelques dizaines de Mo par thread, meme sur un test poole de
+plusieurs centaines de milliers de lignes.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+
+from smartcare_model.config.constants import BOOTSTRAP_CONFIDENCE, BOOTSTRAP_SAMPLES
+
+METRIC_NAMES = ("mae", "rmse", "mape", "smape")
+_BOOTSTRAP_CHUNK = 256
+# Poids (reechantillonnages x echantillons) d'un lot: 4M float64 = 32 Mo.
+_BOOTSTRAP_MAX_CELLS = 4_000_000
+_BOOTSTRAP_MAX_JOBS = 4
+
+
+def _error_terms(y_true, y_pred):
+    """Erreurs par echantillon: absolue, carree, pourcentages et masques."""
+    y_pred = np.atleast_2d(np.asarray(y_pred, dtype=float))
+    y_true = np.asarray(y_true, dtype=float)
+    if y_true.shape[-1] != y_pred.shape[-1]:
+        raise ValueError(f"Tailles incompatibles: y_true {y_true.shape}, y_pred {y_pred.shape}")
+    abs_err = np.abs(y_true - y_pred)
+    abs_true = np.abs(y_true)
+    pct_mask = np.broadcast_to(y_true != 0, abs_err.shape)
+    pct = np.divide(abs_err, abs_true, out=np.zeros_like(abs_err), where=pct_mask)
+    denominator = (abs_true + np.abs(y_pred)) / 2.0
+    spct_mask = denominator != 0
+    spct = np.divide(abs_err, denominator, out=np.zeros_like(abs_err), where=spct_mask)
+    return abs_err, np.square(abs_err), pct, pct_mask, spct, spct_mask
+
+
+def _ratio(numerator: np.ndarray, count: np.ndarray) -> np.ndarray:
+    """``numerator / count`` avec NaN quand ``count`` est nul."""
+    count = np.broadcast_to(count, numerator.shape).astype(float)
+    return np.divide(numerator, count, out=np.full(numerator.shape, np.nan), where=count > 0)
+
+
+def score_matrix(y_true, y_pred) -> Dict[str, np.ndarray]:
+    """Calculer les metriques de chaque ligne d'une matrice de predictions.
+
+    Args:
+        y_true: Valeurs reelles (n_echantillons,) communes a toutes les
+            lignes, ou (n_lignes, n_echantillons) (un horizon par ligne).
+        y_pred: Predictions (n_lignes, n_echantillons); un vecteur est
+            traite comme une ligne.
+
+    Returns:
+        Dictionnaire ``mae``, ``rmse``, ``mape``, ``smape`` de tableaux
+        (n_lignes,). MAPE/sMAPE valent NaN si leur masque est vide.
+
+    Raises:
+        ValueError: Si le nombre d'echantillons differe.
+    """
+    abs_err, sq_err, pct, pct_mask, spct, spct_mask = _error_terms(y_true, y_pred)
+    n = abs_err.shape[-1]
+    mae = abs_err.sum(axis=-1) / n if n else np.full(abs_err.shape[0], np.nan)
+    rmse = np.sqrt(sq_err.sum(axis=-1) / n) if n else np.full(abs_err.shape[0], np.nan)
+    return {
+        "mae": mae,
+        "rmse": rmse,
+        "mape": _ratio(pct.sum(axis=-1), pct_mask.sum(axis=-1)) * 100,
+        "smape": _ratio(spct.sum(axis=-1), spct_mask.sum(axis=-1)) * 100,
+    }
+
+
+def _chunk_size(n: int) -> int:
+    """Reechantillonnages par lot pour ``n`` echantillons (borne memoire)."""
+    return max(1, min(_BOOTSTRAP_CHUNK, _BOOTSTRAP_MAX_CELLS // max(n, 1)))
+
+
+def _bootstrap_chunk(
+    terms, n_boot: int, seed_seq: np.random.SeedSequence, buffer: np.ndarray
+) -> Dict[str, np.ndarray]:
+    """Metriques (n_lignes, n_boot) pour un lot de reechantillonnages.
+
+    Les poids sont tires ligne a ligne dans ``buffer`` (reutilise d'un lot
+    a l'autre par le meme thread): seul un tirage de ``n`` entiers est
+    alloue a la fois.
+    """
+    abs_err, sq_err, pct, pct_mask, spct, spct_mask = terms
+    n = abs_err.shape[-1]
+    rng = np.random.default_rng(seed_seq)
+    weights = buffer[:n_boot]
+    for row in weights:
+        row[:] = np.bincount(rng.integers(0, n, size=n), minlength=n)
+    weights_t = weights.T
+    return {
+        "mae": abs_err @ weights_t / n,
+        "rmse": np.sqrt(sq_err @ weights_t / n),
+        "mape": _ratio(pct @ weights_t, pct_mask @ weights_t) * 100,
+        "smape": _ratio(spct @ weights_t, spct_mask @ weights_t) * 100,
+    }
+
+
+def bootstrap_metrics(
+    y_true,
+    y_pred,
+    n_boot: int = BOOTSTRAP_SAMPLES,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    seed: int = 0,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Intervalles de confiance bootstrap (percentiles) des metriques.
+
+    Les echantillons sont retires avec remise, identiquement pour toutes
+    les lignes (comparaison appariee des modeles). Les reechantillonnages
+    sont traites par lots dont la taille ne depend que du nombre
+    d'echantillons, repartis sur ``n_jobs`` threads (au plus
+    ``_BOOTSTRAP_MAX_JOBS``; les produits matriciels numpy liberent le GIL).
+    Chaque lot a sa propre graine: le resultat ne depend que de ``seed``,
+    pas de ``n_jobs``.
+
+    Args:
+        y_true: Valeurs reelles (voir ``score_matrix``).
+        y_pred: Predictions (n_lignes, n_echantillons).
+        n_boot: Nombre de reechantillonnages.
+        confidence: Niveau de confiance de l'intervalle.
+        seed: Graine du generateur.
+        n_jobs: Nombre de threads (``os.cpu_count()`` par defaut, borne a
+            ``_BOOTSTRAP_MAX_JOBS``).
+
+    Returns:
+        Dictionnaire {metrique: tableau (n_lignes, 2)} des bornes basse et
+        haute.
+    """
+    abs_err, sq_err, pct, pct_mask, spct, spct_mask = _error_terms(y_true, y_pred)
+    # Masques en float une seule fois (operandes des produits matriciels).
+    terms = (abs_err, sq_err, pct, pct_mask.astype(float), spct, spct_mask.astype(float))
+    n_rows, n = abs_err.shape
+    if n == 0 or n_boot <= 0:
+        return {name: np.full((n_rows, 2), np.nan) for name in METRIC_NAMES}
+    chunk = _chunk_size(n)
+    sizes = [min(chunk, n_boot - start) for start in range(0, n_boot, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    n_jobs = max(1, min(n_jobs or os.cpu_count() or 1, _BOOTSTRAP_MAX_JOBS, len(sizes)))
+    chunks: List[Optional[Dict[str, np.ndarray]]] = [None] * len(sizes)
+
+    def _run(worker: int) -> None:
+        # Un tampon de poids par thread; les lots sont repartis en tourniquet.
+        buffer = np.empty((sizes[0], n))
+        for i in range(worker, len(sizes), n_jobs):
+            chunks[i] = _bootstrap_chunk(terms, sizes[i], seeds[i], buffer)
+
+    if n_jobs == 1:
+        _run(0)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            list(executor.map(_run, range(n_jobs)))
+    alpha = (1.0 - confidence) / 2.0
+    out = {}
+    for name in METRIC_NAMES:
+        samples = np.concatenate([chunk[name] for chunk in chunks], axis=1)
+        bounds = np.full((n_rows, 2), np.nan)
+        has_value = ~np.isnan(samples).all(axis=1)
+        if has_value.any():
+            bounds[has_value] = np.nanquantile(samples[has_value], [alpha, 1.0 - alpha], axis=1).T
+        out[name] = bounds
+    return out
+
+
+def score_models(
+    y_true,
+    predictions: Mapping[str, object],
+    n_boot: int = 0,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    seed: int = 0,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Scorer plusieurs vecteurs de prediction nommes en une passe.
+
+    Args:
+        y_true: Valeurs reelles (n_echantillons,).
+        predictions: {nom: predictions (n_echantillons,)}.
+        n_boot: Nombre de reechantillonnages bootstrap (0 = sans intervalle).
+        confidence: Niveau de confiance des intervalles.
+        seed: Graine du bootstrap.
+        n_jobs: Threads du bootstrap.
+
+    Returns:
+        {nom: metriques} au format de ``evaluate``; avec ``n_boot > 0``,
+        chaque metrique a aussi ses bornes ``<metrique>_ci_low`` et
+        ``<metrique>_ci_high``.
+    """
+    names = list(predictions)
+    if not names:
+        return {}
+    y_pred = np.vstack([np.asarray(predictions[name], dtype=float) for name in names])
+    scores = score_matrix(y_true, y_pred)
+    intervals = (
+        bootstrap_metrics(y_true, y_pred, n_boot=n_boot, confidence=confidence, seed=seed, n_jobs=n_jobs)
+        if n_boot > 0
+        else None
+    )
+    results: Dict[str, Dict[str, float]] = {}
+    for row, name in enumerate(names):
+        metrics = {metric: float(scores[metric][row]) for metric in METRIC_NAMES}
+        if intervals is not None:
+            for metric in METRIC_NAMES:
+                metrics[f"{metric}_ci_low"] = float(intervals[metric][row, 0])
+                metrics[f"{metric}_ci_high"] = float(intervals[metric][row, 1])
+        results[name] = metrics
+    return results
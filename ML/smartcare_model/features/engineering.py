@@ -5,7 +5,25 @@ from typing import List
 import numpy as np
 import pandas as pd
 
-from smartcare_model.config.constants import TARGET_COL
+from smartcare_model.config.constants import HOSPITAL_ID_COL, TARGET_COL
+
+
+def _shift(df: pd.DataFrame, col: str, periods: int) -> pd.Series:
+    """Decaler une colonne, par hopital si ``hospital_id`` est present.
+
+    Le ``groupby().shift`` vectorise evite toute fuite d'une serie
+    hospitaliere vers la suivante.
+    """
+    if HOSPITAL_ID_COL in df.columns:
+        return df.groupby(HOSPITAL_ID_COL, sort=False)[col].shift(periods)
+    return df[col].shift(periods)
+
+
+def _diff(df: pd.DataFrame, col: str, periods: int) -> pd.Series:
+    """Difference d'ordre ``periods``, par hopital si necessaire."""
+    if HOSPITAL_ID_COL in df.columns:
+        return df.groupby(HOSPITAL_ID_COL, sort=False)[col].diff(periods)
+    return df[col].diff(periods)
 
 
 def _add_calendar_features(df: pd.DataFrame) -> pd.DataFrame:
@@ -19,8 +37,8 @@ def _add_calendar_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     df["is_weekend"] = (df["date"].dt.weekday >= 5).astype(int)
     df["is_holiday"] = df["vacances_scolaires"].astype(int)
-    df["veille_holiday"] = df["is_holiday"].shift(-1).fillna(0).astype(int)
-    df["lendemain_holiday"] = df["is_holiday"].shift(1).fillna(0).astype(int)
+    df["veille_holiday"] = _shift(df, "is_holiday", -1).fillna(0).astype(int)
+    df["lendemain_holiday"] = _shift(df, "is_holiday", 1).fillna(0).astype(int)
     return df
 
 
@@ -34,16 +52,18 @@ def _add_lag_features(df: pd.DataFrame) -> pd.DataFrame:
         DataFrame avec lags, moyennes glissantes, ecart-type, et differences.
     """
     for lag in [1, 4, 7, 14, 28]:
-        df[f"adm_lag_{lag}"] = df["nombre_admissions"].shift(lag)
+        df[f"adm_lag_{lag}"] = _shift(df, "nombre_admissions", lag)
 
+    # Le lag 1 vaut NaN en debut de chaque hopital (lignes triees par hopital):
+    # une fenetre qui deborderait sur l'hopital precedent contient ce NaN et
+    # reste NaN, donc un rolling global equivaut a un rolling par groupe.
+    shifted = df["adm_lag_1"]
     for window in [7, 14, 28]:
-        df[f"adm_roll_mean_{window}"] = (
-            df["nombre_admissions"].shift(1).rolling(window).mean()
-        )
+        df[f"adm_roll_mean_{window}"] = shifted.rolling(window).mean()
 
-    df["adm_roll_std_7"] = df["nombre_admissions"].shift(1).rolling(7).std()
-    df["adm_diff_1"] = df["nombre_admissions"].diff(1)
-    df["adm_diff_7"] = df["nombre_admissions"].diff(7)
+    df["adm_roll_std_7"] = shifted.rolling(7).std()
+    df["adm_diff_1"] = _diff(df, "nombre_admissions", 1)
+    df["adm_diff_7"] = _diff(df, "nombre_admissions", 7)
     return df
 
 
@@ -96,30 +116,40 @@ def _add_target(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame avec la colonne cible ``y``.
     """
-    df[TARGET_COL] = df["nombre_admissions"].shift(-4)
+    df[TARGET_COL] = _shift(df, "nombre_admissions", -4)
     return df
 
 
 def _one_hot_encode(df: pd.DataFrame) -> pd.DataFrame:
     """Encoder en one-hot les colonnes meteo et evenements.
 
+    En multi-hopitaux, ajoute aussi des colonnes ``hosp_<id>`` en conservant
+    ``hospital_id`` (utile au split et a l'inference par hopital).
+
     Args:
         df: DataFrame contenant les colonnes categorielles.
 
     Returns:
         DataFrame avec colonnes one-hot ajoutees.
     """
-    return pd.get_dummies(
+    df = pd.get_dummies(
         df,
         columns=["meteo_principale", "evenement_special"],
         prefix=["meteo", "event"],
         dummy_na=False,
     )
+    if HOSPITAL_ID_COL in df.columns:
+        hosp_dummies = pd.get_dummies(df[HOSPITAL_ID_COL].astype(str), prefix="hosp")
+        df = pd.concat([df, hosp_dummies], axis=1)
+    return df
 
 
 def build_feature_dataframe(raw_df: pd.DataFrame) -> pd.DataFrame:
     """Executer le pipeline complet de feature engineering.
 
+    Si ``hospital_id`` est present, les lignes sont triees par hopital puis
+    date et toutes les features temporelles sont calculees par hopital.
+
     Args:
         raw_df: DataFrame brut charge depuis le CSV.
 
@@ -127,6 +157,8 @@ def build_feature_dataframe(raw_df: pd.DataFrame) -> pd.DataFrame:
         DataFrame enrichi avec features et cible.
     """
     df = raw_df.copy()
+    if HOSPITAL_ID_COL in df.columns:
+        df = df.sort_values([HOSPITAL_ID_COL, "date"], kind="stable").reset_index(drop=True)
     df = _add_target(df)
     df = _add_calendar_features(df)
     df = _add_lag_features(df)
@@ -1,11 +1,26 @@
 """Points d'entree d'inference."""
 
+from smartcare_model.inference.compiled import (
+    CompiledTreeEnsemble,
+    CompiledTreeStack,
+    attach_compiled,
+    compile_tree_ensemble,
+    compile_tree_stack,
+    predict_fast,
+    predict_many,
+    save_compiled,
+)
+from smartcare_model.inference.conformal import ConformalTable, load_conformal_table
+from smartcare_model.inference.intervals import load_quantile_models, predict_intervals
 from smartcare_model.inference.predict import (
     apply_overrides,
     predict_from_features,
     prepare_prediction_row,
 )
+from smartcare_model.inference.result_cache import PredictionCache, get_prediction_cache
+from smartcare_model.inference.scenarios import build_scenario_features, normalize_scenarios
 from smartcare_model.inference.similarity import (
+    SimilarityIndex,
     calculate_historical_trend,
     compute_synthetic_lags,
     evaluate_knn_quality,
@@ -13,6 +28,23 @@ from smartcare_model.inference.similarity import (
 )
 
 __all__ = [
+    "CompiledTreeEnsemble",
+    "CompiledTreeStack",
+    "attach_compiled",
+    "compile_tree_ensemble",
+    "compile_tree_stack",
+    "predict_fast",
+    "predict_many",
+    "save_compiled",
+    "ConformalTable",
+    "load_conformal_table",
+    "load_quantile_models",
+    "predict_intervals",
+    "PredictionCache",
+    "get_prediction_cache",
+    "SimilarityIndex",
+    "build_scenario_features",
+    "normalize_scenarios",
     "apply_overrides",
     "predict_from_features",
     "prepare_prediction_row",
@@ -0,0 +1,374 @@
+"""Predicteur compile pour les ensembles d'arbres (RandomForest, GradientBoosting).
+
+Les arbres sklearn sont aplatis dans des tableaux NumPy contigus (feature,
+seuil, enfants, valeur) puis parcourus niveau par niveau pour toutes les
+lignes et tous les arbres a la fois. On evite ainsi la validation d'entree,
+la conversion DataFrame et le dispatch de threads de ``model.predict``, qui
+dominent le temps d'une prediction sur une seule ligne.
+
+Les sorties sont celles de sklearn: entrees converties en float32 comme dans
+``Tree.predict``, seuils float32 arrondis vers le bas (``x <= seuil`` donne le
+meme resultat qu'avec le seuil float64), et sommes cumulees dans l'ordre des
+arbres.
+
+Les tableaux aplatis sont aussi publies avec le modele (``<nom>.trees/``,
+fichiers ``.npy``) et relus en ``mmap_mode="r"``: tous les processus qui
+servent une meme version partagent ces pages via le cache du systeme, et le
+chemin rapide n'a plus a recompiler les arbres au chargement.
+"""
+
+import json
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+
+# Au-dela, le parcours Cython de sklearn redevient plus rapide (tools/bench_tree_predictor.py).
+COMPILED_MAX_ROWS = 64
+# Repertoire des tableaux aplatis publie a cote de ``<nom>.joblib``.
+COMPILED_SUFFIX = ".trees"
+_ARRAY_FIELDS = ("feature", "threshold", "left", "right", "value", "missing_left", "roots")
+_META_FILENAME = "meta.json"
+
+_COMPILED_CACHE: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_STACK_CACHE: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _float32_floor(threshold: np.ndarray) -> np.ndarray:
+    """Plus grand float32 inferieur ou egal a chaque seuil float64."""
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def _reduce(leaves: np.ndarray, mode: str, init: float, scale: float) -> np.ndarray:
+    """Agreger les valeurs de feuilles (n_lignes, n_arbres) comme sklearn."""
+    if mode == "mean":
+        # sklearn accumule arbre par arbre puis divise par le nombre d'arbres.
+        return np.cumsum(leaves, axis=1)[:, -1] / leaves.shape[1]
+    terms = np.empty((leaves.shape[0], leaves.shape[1] + 1))
+    terms[:, 0] = init
+    terms[:, 1:] = scale * leaves
+    return np.cumsum(terms, axis=1)[:, -1]
+
+
+class CompiledTreeEnsemble:
+    """Ensemble d'arbres aplati, predictible sans sklearn.
+
+    Attributes:
+        n_features: Nombre de features attendues.
+        n_trees: Nombre d'arbres.
+        max_depth: Profondeur maximale (nombre d'iterations du parcours).
+    """
+
+    def __init__(self, trees, n_features: int, mode: str, init: float = 0.0, scale: float = 1.0):
+        features, thresholds, lefts, rights, values, missing_left, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for tree in trees:
+            left = tree.children_left.astype(np.int32)
+            right = tree.children_right.astype(np.int32)
+            is_leaf = left == -1
+            node_ids = np.arange(tree.node_count, dtype=np.int32)
+            # Une feuille pointe sur elle-meme: le parcours peut iterer max_depth fois sans masque.
+            lefts.append(np.where(is_leaf, node_ids, left) + offset)
+            rights.append(np.where(is_leaf, node_ids, right) + offset)
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(_float32_floor(tree.threshold))
+            values.append(tree.value[:, 0, 0].astype(np.float64))
+            missing = getattr(tree, "missing_go_to_left", None)
+            missing_left.append(
+                np.zeros(tree.node_count, dtype=bool) if missing is None else missing.astype(bool)
+            )
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        self.feature = np.concatenate(features)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts)
+        self.right = np.concatenate(rights)
+        self.value = np.concatenate(values)
+        self.missing_left = np.concatenate(missing_left)
+        self.has_missing = bool(self.missing_left.any())
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.n_features = n_features
+        self.n_trees = len(roots)
+        self.max_depth = max_depth
+        self.mode = mode
+        self.init = float(init)
+        self.scale = float(scale)
+
+    def leaf_values(self, X: np.ndarray) -> np.ndarray:
+        """Valeur de la feuille atteinte par chaque ligne dans chaque arbre.
+
+        Args:
+            X: Matrice (n_lignes, n_features).
+
+        Returns:
+            Tableau (n_lignes, n_arbres) float64.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"X doit avoir {self.n_features} colonnes, recu {X.shape}.")
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = x <= self.threshold[node]
+            if self.has_missing:
+                go_left |= np.isnan(x) & self.missing_left[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.value[node]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predire comme ``model.predict`` pour une matrice de features.
+
+        Args:
+            X: Matrice (n_lignes, n_features) ou DataFrame dans l'ordre des features.
+
+        Returns:
+            Tableau (n_lignes,) float64.
+        """
+        return _reduce(self.leaf_values(np.asarray(X)), self.mode, self.init, self.scale)
+
+    def save(self, directory: Path) -> None:
+        """Ecrire les tableaux (``.npy`` non compresses) et ``meta.json``."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for field in _ARRAY_FIELDS:
+            np.save(directory / f"{field}.npy", getattr(self, field), allow_pickle=False)
+        meta = {
+            "n_features": self.n_features,
+            "max_depth": self.max_depth,
+            "mode": self.mode,
+            "init": self.init,
+            "scale": self.scale,
+        }
+        with open(directory / _META_FILENAME, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: Path, mmap_mode: Optional[str] = "r") -> "CompiledTreeEnsemble":
+        """Relire un ensemble ecrit par ``save``.
+
+        Args:
+            directory: Repertoire ``<nom>.trees``.
+            mmap_mode: Mode ``np.load``; ``"r"`` projette les tableaux en
+                lecture seule (pages partagees entre processus).
+
+        Returns:
+            ``CompiledTreeEnsemble`` pret a predire.
+        """
+        directory = Path(directory)
+        with open(directory / _META_FILENAME, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        compiled = cls.__new__(cls)
+        for field in _ARRAY_FIELDS:
+            array = np.load(directory / f"{field}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+            setattr(compiled, field, array)
+        compiled.has_missing = bool(compiled.missing_left.any())
+        compiled.n_features = int(meta["n_features"])
+        compiled.n_trees = len(compiled.roots)
+        compiled.max_depth = int(meta["max_depth"])
+        compiled.mode = meta["mode"]
+        compiled.init = float(meta["init"])
+        compiled.scale = float(meta["scale"])
+        return compiled
+
+
+class CompiledTreeStack:
+    """Plusieurs ensembles d'arbres parcourus en une seule passe.
+
+    Les arbres de tous les modeles (par exemple le modele ponctuel et ses
+    modeles quantiles) sont concatenes: un seul parcours donne les feuilles
+    de tous les arbres, puis chaque modele agrege son segment.
+    """
+
+    def __init__(self, specs: Dict[str, Tuple[list, str, float, float]], n_features: int):
+        trees: List[object] = []
+        self.segments: Dict[str, Tuple[int, int, str, float, float]] = {}
+        for name, (model_trees, mode, init, scale) in specs.items():
+            self.segments[name] = (len(trees), len(trees) + len(model_trees), mode, init, scale)
+            trees.extend(model_trees)
+        self.ensemble = CompiledTreeEnsemble(trees, n_features=n_features, mode="sum")
+        self.n_features = n_features
+
+    def predict(self, X: np.ndarray) -> Dict[str, np.ndarray]:
+        """Predictions de chaque modele, identiques a ``model.predict``.
+
+        Args:
+            X: Matrice (n_lignes, n_features).
+
+        Returns:
+            Dictionnaire {nom: tableau (n_lignes,)}.
+        """
+        leaves = self.ensemble.leaf_values(np.asarray(X))
+        return {
+            name: _reduce(leaves[:, start:end], mode, init, scale)
+            for name, (start, end, mode, init, scale) in self.segments.items()
+        }
+
+
+def _ensemble_spec(model) -> Optional[Tuple[list, str, float, float]]:
+    """Arbres, mode d'agregation, init et echelle d'un modele supporte."""
+    if isinstance(model, RandomForestRegressor) and getattr(model, "n_outputs_", 1) == 1:
+        return [est.tree_ for est in model.estimators_], "mean", 0.0, 1.0
+    if isinstance(model, GradientBoostingRegressor):
+        init = model.init_
+        if isinstance(init, str) and init == "zero":
+            init_value = 0.0
+        elif hasattr(init, "constant_"):
+            init_value = float(np.ravel(init.constant_)[0])
+        else:
+            return None
+        return [est.tree_ for est in model.estimators_[:, 0]], "sum", init_value, model.learning_rate
+    return None
+
+
+def compile_tree_ensemble(model) -> Optional[CompiledTreeEnsemble]:
+    """Compiler (et mettre en cache) un RandomForest / GradientBoosting regressor.
+
+    Le resultat est memorise par modele (``WeakKeyDictionary``): la
+    compilation n'a lieu qu'une fois par instance chargee.
+
+    Args:
+        model: Modele entraine.
+
+    Returns:
+        ``CompiledTreeEnsemble`` ou None si le modele n'est pas supporte
+        (autre type, multi-sortie, init non constant).
+    """
+    try:
+        cached = _COMPILED_CACHE.get(model)
+    except TypeError:
+        return None
+    if cached is not None:
+        return cached
+
+    spec = _ensemble_spec(model)
+    if spec is None:
+        return None
+    trees, mode, init, scale = spec
+    compiled = CompiledTreeEnsemble(trees, n_features=model.n_features_in_, mode=mode, init=init, scale=scale)
+    _COMPILED_CACHE[model] = compiled
+    return compiled
+
+
+def save_compiled(model, directory: Path) -> bool:
+    """Publier les tableaux aplatis d'un modele supporte.
+
+    Args:
+        model: Modele entraine.
+        directory: Repertoire cible (``<nom>.trees``).
+
+    Returns:
+        True si le modele est supporte et a ete ecrit.
+    """
+    compiled = compile_tree_ensemble(model)
+    if compiled is None:
+        return False
+    compiled.save(directory)
+    return True
+
+
+def attach_compiled(model, directory: Path) -> Optional[CompiledTreeEnsemble]:
+    """Associer a ``model`` ses tableaux publies, projetes en memoire.
+
+    ``predict_fast`` utilise ensuite ces tableaux au lieu de recompiler.
+    Sans repertoire (artefacts anterieurs), la compilation reste paresseuse.
+
+    Args:
+        model: Modele charge depuis ``<nom>.joblib``.
+        directory: Repertoire ``<nom>.trees`` de la meme version.
+
+    Returns:
+        L'ensemble attache, ou None si absent ou incompatible.
+    """
+    directory = Path(directory)
+    if not (directory / _META_FILENAME).exists() or _ensemble_spec(model) is None:
+        return None
+    compiled = CompiledTreeEnsemble.load(directory)
+    if compiled.n_features != getattr(model, "n_features_in_", None):
+        return None
+    _COMPILED_CACHE[model] = compiled
+    return compiled
+
+
+def compile_tree_stack(models: Dict[str, object]) -> Optional[CompiledTreeStack]:
+    """Compiler (et mettre en cache) plusieurs modeles en une pile.
+
+    Le cache est indexe par le premier modele et verifie l'identite des
+    autres: la pile est reconstruite si l'un d'eux change.
+
+    Args:
+        models: Modeles entraines par nom, sur les memes features.
+
+    Returns:
+        ``CompiledTreeStack`` ou None si un modele n'est pas supporte ou si
+        les nombres de features different.
+    """
+    if not models:
+        return None
+    first = next(iter(models.values()))
+    try:
+        cached = _STACK_CACHE.get(first)
+    except TypeError:
+        return None
+    if cached is not None and cached[0] == [(name, id(model)) for name, model in models.items()]:
+        return cached[1]
+
+    n_features = {getattr(model, "n_features_in_", None) for model in models.values()}
+    if len(n_features) != 1 or None in n_features:
+        return None
+    specs = {}
+    for name, model in models.items():
+        spec = _ensemble_spec(model)
+        if spec is None:
+            return None
+        specs[name] = spec
+    stack = CompiledTreeStack(specs, n_features=n_features.pop())
+    _STACK_CACHE[first] = ([(name, id(model)) for name, model in models.items()], stack)
+    return stack
+
+
+def predict_fast(model, X, max_rows: int = COMPILED_MAX_ROWS) -> np.ndarray:
+    """Predire avec le predicteur compile pour les petits lots, sinon ``model.predict``.
+
+    Args:
+        model: Modele entraine.
+        X: DataFrame ou matrice dans l'ordre des features du modele.
+        max_rows: Taille de lot maximale pour le chemin compile.
+
+    Returns:
+        Tableau (n_lignes,) des predictions.
+    """
+    if len(X) <= max_rows:
+        compiled = compile_tree_ensemble(model)
+        if compiled is not None and np.shape(X)[1] == compiled.n_features:
+            return compiled.predict(np.asarray(X, dtype=np.float64))
+    return np.asarray(model.predict(X))
+
+
+def predict_many(models: Dict[str, object], X, max_rows: int = COMPILED_MAX_ROWS) -> Dict[str, np.ndarray]:
+    """Predire avec plusieurs modeles sur la meme matrice de features.
+
+    Pour les petits lots, un seul parcours de la pile compilee; sinon
+    ``model.predict`` par modele.
+
+    Args:
+        models: Modeles entraines par nom.
+        X: DataFrame ou matrice dans l'ordre des features.
+        max_rows: Taille de lot maximale pour le chemin compile.
+
+    Returns:
+        Dictionnaire {nom: tableau (n_lignes,)}.
+    """
+    if len(X) <= max_rows:
+        stack = compile_tree_stack(models)
+        if stack is not None and np.shape(X)[1] == stack.n_features:
+            return stack.predict(np.asarray(X, dtype=np.float64))
+    return {name: np.asarray(model.predict(X)) for name, model in models.items()}
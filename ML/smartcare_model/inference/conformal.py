@@ -0,0 +1,249 @@
+"""Calibration split-conforme des intervalles de prediction.
+
+A l'entrainement, les residus hors echantillon du split chronologique test
+sont regroupes par modele, horizon (jours depuis la fin du train), jour de
+semaine et saison. Pour chaque cellule on precalcule les quantiles de
+``|residu|`` a quelques niveaux de couverture, avec la correction
+d'echantillon fini ``ceil((n + 1) * c) / n``. Les cellules trop peu
+remplies reprennent la valeur d'un regroupement plus large (horizon +
+jour, horizon, puis tous les residus du modele).
+
+Le tableau est stocke dans ``conformal.npz`` a cote des modeles; a
+l'inference, un intervalle se lit par indexation directe (O(1) par ligne).
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from smartcare_model.artifacts.registry import MODELS_KIND, resolve_artifacts_dir
+from smartcare_model.config.constants import (
+    CONFORMAL_DEFAULT_COVERAGE,
+    CONFORMAL_HORIZON_EDGES,
+    CONFORMAL_LEVELS,
+    CONFORMAL_MIN_CELL,
+    DEFAULT_MODEL_NAME,
+)
+from smartcare_model.config.paths import ARTIFACTS_DIR
+
+CONFORMAL_FILENAME = "conformal.npz"
+_N_WEEKDAYS = 7
+_N_SEASONS = 4
+
+
+def _to_days(dates) -> np.ndarray:
+    """Dates -> ``datetime64[D]`` (sans passer par pandas pour les petits lots)."""
+    if isinstance(dates, (pd.Series, pd.Index)):
+        values = dates.to_numpy()
+        if values.dtype.kind != "M":
+            values = pd.to_datetime(dates).to_numpy()
+        return values.astype("datetime64[D]")
+    values = np.atleast_1d(np.asarray(dates))
+    if values.dtype.kind != "M":
+        values = np.asarray(
+            [pd.Timestamp(v.item() if isinstance(v, np.generic) else v).to_datetime64() for v in values]
+        )
+    return values.astype("datetime64[D]")
+
+
+def _calendar(days: np.ndarray):
+    """Jour de semaine (lundi = 0) et saison (hiver dec-fev = 0 ... automne = 3)."""
+    epoch_days = days.astype(np.int64)
+    weekday = (epoch_days + 3) % 7  # 1970-01-01 est un jeudi
+    month = days.astype("datetime64[M]").astype(np.int64) % 12  # janvier = 0
+    season = (month + 1) % 12 // 3
+    return weekday.astype(np.intp), season.astype(np.intp)
+
+
+def _conformal_quantiles(abs_residuals: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """Quantiles split-conformes de ``|residu|`` pour chaque niveau."""
+    n = abs_residuals.size
+    ordered = np.sort(abs_residuals)
+    ranks = np.minimum(np.ceil((n + 1) * levels).astype(int), n) - 1
+    return ordered[ranks]
+
+
+class ConformalTable:
+    """Table (modele, horizon, jour, saison, niveau) -> demi-largeur d'intervalle.
+
+    Attributes:
+        models: Noms des modeles calibres.
+        levels: Niveaux de couverture disponibles.
+        horizon_edges: Bornes hautes (jours) des classes d'horizon.
+        train_end: Derniere date du train (origine des horizons).
+        quantiles: Tableau (modeles, horizons, 7, 4, niveaux) float32.
+        counts: Nombre de residus de la cellule utilisee (modeles, horizons, 7, 4).
+    """
+
+    def __init__(
+        self,
+        models: List[str],
+        levels: np.ndarray,
+        horizon_edges: np.ndarray,
+        train_end: pd.Timestamp,
+        quantiles: np.ndarray,
+        counts: np.ndarray,
+    ):
+        self.models = list(models)
+        self.levels = np.asarray(levels, dtype=float)
+        self.horizon_edges = np.asarray(horizon_edges, dtype=np.int64)
+        self.train_end = pd.Timestamp(train_end).normalize()
+        self.quantiles = quantiles
+        self.counts = counts
+        self._model_index = {name: i for i, name in enumerate(self.models)}
+        self._train_end_day = np.datetime64(self.train_end.date(), "D")
+
+    @classmethod
+    def from_residuals(
+        cls,
+        residuals: Dict[str, np.ndarray],
+        dates: Iterable[pd.Timestamp],
+        train_end: pd.Timestamp,
+        levels: Iterable[float] = CONFORMAL_LEVELS,
+        horizon_edges: Iterable[int] = CONFORMAL_HORIZON_EDGES,
+        min_cell: int = CONFORMAL_MIN_CELL,
+    ) -> "ConformalTable":
+        """Construire la table depuis les residus test (``y - prediction``).
+
+        Args:
+            residuals: Residus par modele, alignes sur ``dates``.
+            dates: Dates des lignes test.
+            train_end: Derniere date du train.
+            levels: Niveaux de couverture a precalculer.
+            horizon_edges: Bornes hautes des classes d'horizon (jours).
+            min_cell: Nombre minimal de residus pour utiliser une cellule.
+
+        Returns:
+            ``ConformalTable`` prete a etre sauvegardee.
+        """
+        days = _to_days(pd.Series(list(dates)))
+        levels = np.asarray(sorted(levels), dtype=float)
+        horizon_edges = np.asarray(sorted(horizon_edges), dtype=np.int64)
+        n_h = len(horizon_edges) + 1
+        train_end = pd.Timestamp(train_end).normalize()
+        offset = (days - np.datetime64(train_end.date(), "D")).astype(np.int64)
+        horizon = np.searchsorted(horizon_edges, offset, side="left")
+        weekday, season = _calendar(days)
+
+        models = sorted(residuals)
+        shape = (len(models), n_h, _N_WEEKDAYS, _N_SEASONS)
+        quantiles = np.zeros(shape + (len(levels),), dtype=np.float32)
+        counts = np.zeros(shape, dtype=np.int32)
+        for m, name in enumerate(models):
+            abs_res = np.abs(np.asarray(residuals[name], dtype=float))
+            valid = ~np.isnan(abs_res)
+            pooled = abs_res[valid]
+            if pooled.size == 0:
+                continue
+            fallback_all = (_conformal_quantiles(pooled, levels), pooled.size)
+            for h in range(n_h):
+                in_h = valid & (horizon == h)
+                fallback_h = (
+                    (_conformal_quantiles(abs_res[in_h], levels), int(in_h.sum()))
+                    if in_h.sum() >= min_cell
+                    else fallback_all
+                )
+                for d in range(_N_WEEKDAYS):
+                    in_hd = in_h & (weekday == d)
+                    fallback_hd = (
+                        (_conformal_quantiles(abs_res[in_hd], levels), int(in_hd.sum()))
+                        if in_hd.sum() >= min_cell
+                        else fallback_h
+                    )
+                    for s in range(_N_SEASONS):
+                        in_cell = in_hd & (season == s)
+                        q, n = (
+                            (_conformal_quantiles(abs_res[in_cell], levels), int(in_cell.sum()))
+                            if in_cell.sum() >= min_cell
+                            else fallback_hd
+                        )
+                        quantiles[m, h, d, s] = q
+                        counts[m, h, d, s] = n
+        return cls(models, levels, horizon_edges, train_end, quantiles, counts)
+
+    def save(self, path: Path) -> None:
+        """Ecrire la table dans un fichier ``.npz`` (non compresse)."""
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                models=np.asarray(self.models),
+                levels=self.levels,
+                horizon_edges=self.horizon_edges,
+                train_end=np.datetime64(self.train_end.date(), "D"),
+                quantiles=self.quantiles,
+                counts=self.counts,
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> "ConformalTable":
+        """Lire une table ecrite par ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                models=[str(name) for name in data["models"]],
+                levels=data["levels"],
+                horizon_edges=data["horizon_edges"],
+                train_end=pd.Timestamp(data["train_end"].item()),
+                quantiles=data["quantiles"],
+                counts=data["counts"],
+            )
+
+    def half_width(
+        self,
+        dates,
+        model_name: str = DEFAULT_MODEL_NAME,
+        coverage: float = CONFORMAL_DEFAULT_COVERAGE,
+    ) -> np.ndarray:
+        """Demi-largeur d'intervalle pour chaque date cible.
+
+        Args:
+            dates: Date(s) cible(s).
+            model_name: Modele calibre.
+            coverage: Niveau de couverture (parmi ``levels``).
+
+        Returns:
+            Tableau (n_dates,) float.
+
+        Raises:
+            KeyError: Si le modele n'est pas calibre.
+            ValueError: Si ``coverage`` n'est pas un niveau precalcule.
+        """
+        m = self._model_index[model_name]
+        matches = np.flatnonzero(np.isclose(self.levels, coverage))
+        if matches.size == 0:
+            raise ValueError(f"Couverture {coverage} non calibree. Niveaux: {self.levels.tolist()}")
+        days = _to_days(dates)
+        horizon = np.searchsorted(self.horizon_edges, (days - self._train_end_day).astype(np.int64), side="left")
+        weekday, season = _calendar(days)
+        return self.quantiles[m, horizon, weekday, season, matches[0]].astype(float)
+
+    def interval(
+        self,
+        dates,
+        predictions,
+        model_name: str = DEFAULT_MODEL_NAME,
+        coverage: float = CONFORMAL_DEFAULT_COVERAGE,
+    ) -> Dict[str, np.ndarray]:
+        """Intervalles symetriques ``prediction -/+ demi-largeur``.
+
+        Returns:
+            Dictionnaire de tableaux: ``prediction_lower`` (borne a 0),
+            ``prediction_upper`` et ``prediction_safe`` (= borne haute).
+        """
+        predictions = np.asarray(predictions, dtype=float)
+        width = self.half_width(dates, model_name=model_name, coverage=coverage)
+        upper = predictions + width
+        return {
+            "prediction_lower": np.maximum(predictions - width, 0.0),
+            "prediction_upper": upper,
+            "prediction_safe": upper,
+        }
+
+
+def load_conformal_table(artifacts_dir: Path = ARTIFACTS_DIR) -> Optional[ConformalTable]:
+    """Charger la table de la version courante (None si absente)."""
+    path = resolve_artifacts_dir(MODELS_KIND, artifacts_dir) / CONFORMAL_FILENAME
+    if not path.exists():
+        return None
+    return ConformalTable.load(path)
@@ -0,0 +1,91 @@
+"""Intervalles de prediction par modeles quantiles.
+
+Le modele ponctuel et les gradient boosting quantiles (``gradient_boosting_q10``,
+``_q50``, ``_q90``) sont evalues sur la meme matrice de features, en un seul
+parcours de la pile d'arbres compilee pour les petits lots.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from smartcare_model.artifacts.cache import ModelCache, get_model_cache
+from smartcare_model.config.constants import QUANTILE_LEVELS
+from smartcare_model.config.paths import ARTIFACTS_DIR
+from smartcare_model.inference.compiled import COMPILED_MAX_ROWS, predict_many
+from smartcare_model.models.registry import quantile_model_name
+
+
+def quantile_column(level: float) -> str:
+    """Nom de colonne d'un quantile (ex. 0.1 -> ``q10``)."""
+    return f"q{int(round(level * 100)):02d}"
+
+
+def load_quantile_models(
+    artifacts_dir: Path = ARTIFACTS_DIR,
+    levels: Iterable[float] = QUANTILE_LEVELS,
+    cache: Optional[ModelCache] = None,
+) -> Dict[float, object]:
+    """Charger les modeles quantiles disponibles de la version courante.
+
+    Args:
+        artifacts_dir: Racine des artefacts.
+        levels: Niveaux de quantile recherches.
+        cache: Cache de modeles (``get_model_cache(artifacts_dir)`` par defaut).
+
+    Returns:
+        Dictionnaire {niveau: modele}; vide si aucun n'a ete entraine
+        (artefacts anterieurs aux modeles quantiles).
+    """
+    cache = cache or get_model_cache(artifacts_dir)
+    models = {}
+    for level in levels:
+        try:
+            models[level], _ = cache.get(quantile_model_name(level))
+        except FileNotFoundError:
+            continue
+    return models
+
+
+def predict_intervals(
+    model,
+    X,
+    quantile_models: Dict[float, object],
+    max_rows: int = COMPILED_MAX_ROWS,
+) -> Dict[str, np.ndarray]:
+    """Predire le point et les quantiles d'une matrice de features.
+
+    Les quantiles sont reordonnes ligne par ligne (pas de croisement). Les
+    bornes sont le plus bas et le plus haut niveau; ``prediction_safe`` est
+    la borne haute, jamais inferieure a la prediction ponctuelle.
+
+    Args:
+        model: Modele ponctuel entraine.
+        X: DataFrame ou matrice dans l'ordre des features.
+        quantile_models: Modeles quantiles par niveau.
+        max_rows: Taille de lot maximale pour le chemin compile.
+
+    Returns:
+        Dictionnaire de tableaux (n_lignes,): ``prediction``,
+        ``q<niveau>``..., ``prediction_lower``, ``prediction_upper``,
+        ``prediction_safe`` (``pd.DataFrame(...)`` pour un tableau).
+
+    Raises:
+        ValueError: Si ``quantile_models`` est vide.
+    """
+    if not quantile_models:
+        raise ValueError("Aucun modele quantile: entrainer avec train_models().")
+    levels = sorted(quantile_models)
+    models = {"prediction": model}
+    models.update({quantile_column(level): quantile_models[level] for level in levels})
+    preds = predict_many(models, X, max_rows=max_rows)
+
+    quantiles = np.sort(np.column_stack([preds[quantile_column(level)] for level in levels]), axis=1)
+    out = {"prediction": preds["prediction"]}
+    for pos, level in enumerate(levels):
+        out[quantile_column(level)] = quantiles[:, pos]
+    out["prediction_lower"] = quantiles[:, 0]
+    out["prediction_upper"] = quantiles[:, -1]
+    out["prediction_safe"] = np.maximum(preds["prediction"], quantiles[:, -1])
+    return out
@@ -4,11 +4,17 @@ from typing import Dict, Optional, List
 
 import pandas as pd
 
+from smartcare_model.config.constants import CONFORMAL_DEFAULT_COVERAGE, DEFAULT_MODEL_NAME, HOSPITAL_ID_COL
+from smartcare_model.inference.compiled import predict_fast
+from smartcare_model.inference.conformal import ConformalTable
+from smartcare_model.inference.intervals import predict_intervals
+
 
 def prepare_prediction_row(
     feature_df: pd.DataFrame,
     feature_cols: List[str],
     target_date: Optional[str] = None,
+    hospital_id: Optional[str] = None,
 ) -> pd.DataFrame:
     """Selectionner la ligne de prediction depuis un DataFrame de features.
 
@@ -16,14 +22,27 @@ def prepare_prediction_row(
         feature_df: DataFrame de features contenant la colonne ``date``.
         feature_cols: Liste ordonnee des colonnes attendues par le modele.
         target_date: Date optionnelle (YYYY-MM-DD) pour selectionner une ligne.
+        hospital_id: Hopital optionnel (modele poole multi-hopitaux). Les
+            colonnes ``hosp_<id>`` absentes du DataFrame sont ajoutees a 0,
+            celle de ``hospital_id`` a 1.
 
     Returns:
         DataFrame a une ligne, pret pour la prediction.
 
     Raises:
-        ValueError: Si ``target_date`` est fourni mais absent des donnees.
+        ValueError: Si ``target_date`` ou ``hospital_id`` est absent des donnees.
     """
-    df = feature_df.dropna(subset=feature_cols).copy()
+    df = feature_df
+    if hospital_id is not None and HOSPITAL_ID_COL in df.columns:
+        df = df[df[HOSPITAL_ID_COL].astype(str) == str(hospital_id)]
+        if df.empty:
+            raise ValueError(f"No data found for hospital {hospital_id}.")
+    missing_hosp = [c for c in feature_cols if c.startswith("hosp_") and c not in df.columns]
+    if missing_hosp:
+        df = df.copy()
+        for col in missing_hosp:
+            df[col] = int(hospital_id is not None and col == f"hosp_{hospital_id}")
+    df = df.dropna(subset=feature_cols).copy()
     if target_date:
         date = pd.to_datetime(target_date)
         row = df[df["date"] == date]
@@ -73,20 +92,57 @@ def predict_from_features(
     model,
     feature_cols: List[str],
     safety_margin: float = 0.10,
+    quantile_models: Optional[Dict[float, object]] = None,
+    conformal: Optional[ConformalTable] = None,
+    model_name: str = DEFAULT_MODEL_NAME,
+    target_date: Optional[str] = None,
+    coverage: float = CONFORMAL_DEFAULT_COVERAGE,
 ) -> Dict[str, float]:
     """Generer la prediction et une estimation securisee.
 
+    Les RandomForest / GradientBoosting passent par le predicteur d'arbres
+    compile (memes sorties, sans le surcout par appel de sklearn).
+
     Args:
         row: DataFrame a une ligne pour la prediction.
         model: Modele entraine implementant ``predict``.
         feature_cols: Liste ordonnee des colonnes features.
         safety_margin: Marge en pourcentage pour ``prediction_safe``.
+        quantile_models: Modeles quantiles optionnels (``load_quantile_models``).
+            S'ils sont fournis, ``prediction_safe`` est la borne haute de
+            l'intervalle au lieu de la marge fixe.
+        conformal: Table split-conforme optionnelle (``load_conformal_table``),
+            utilisee si ``quantile_models`` est absent: ``prediction_safe``
+            devient la borne haute calibree.
+        model_name: Nom du modele dans la table conforme.
+        target_date: Date predite (horizon, jour, saison); date de ``row`` sinon.
+        coverage: Couverture de l'intervalle conforme.
 
     Returns:
-        Dictionnaire avec prediction brute, prediction securisee, et date.
+        Dictionnaire avec prediction brute, prediction securisee, et date
+        (plus ``prediction_lower`` / ``prediction_upper`` avec un intervalle).
     """
     X = row[feature_cols].astype(float)
-    pred = float(model.predict(X)[0])
+    if quantile_models:
+        intervals = predict_intervals(model, X, quantile_models)
+        return {
+            "prediction": float(intervals["prediction"][0]),
+            "prediction_safe": float(intervals["prediction_safe"][0]),
+            "prediction_lower": float(intervals["prediction_lower"][0]),
+            "prediction_upper": float(intervals["prediction_upper"][0]),
+            "date_J": row["date"].iloc[0].date(),
+        }
+    pred = float(predict_fast(model, X)[0])
+    if conformal is not None:
+        date = target_date if target_date is not None else row["date"].iloc[0]
+        bounds = conformal.interval(date, [pred], model_name=model_name, coverage=coverage)
+        return {
+            "prediction": pred,
+            "prediction_safe": float(bounds["prediction_safe"][0]),
+            "prediction_lower": float(bounds["prediction_lower"][0]),
+            "prediction_upper": float(bounds["prediction_upper"][0]),
+            "date_J": row["date"].iloc[0].date(),
+        }
     return {
         "prediction": pred,
         "prediction_safe": pred * (1 + safety_margin),
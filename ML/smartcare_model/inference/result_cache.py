@@ -0,0 +1,223 @@
+"""Cache des resultats de prediction (TTL, LRU, persistance SQLite optionnelle).
+
+Une entree est indexee par les entrees normalisees de la prediction (date,
+overrides, temperature, facteur de tendance...), le nom du modele et la
+version de son artefact. Apres un reentrainement la version change: les
+anciennes cles ne sont plus jamais demandees et les entrees du modele issues
+d'une autre version sont purgees a la premiere ecriture.
+"""
+
+import hashlib
+import json
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from smartcare_model.artifacts.registry import MODELS_KIND, PROPHET_KIND, current_version, resolve_artifacts_dir
+from smartcare_model.config.constants import PREDICTION_CACHE_MAX_ENTRIES, PREDICTION_CACHE_TTL_S
+from smartcare_model.config.paths import ARTIFACTS_DIR
+
+PREDICTION_CACHE_FILENAME = "prediction_cache.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prediction_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    version TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_prediction_cache_model ON prediction_cache (model, version);
+"""
+
+_NO_OVERRIDE = {"", "Aucun", "None", "nan"}
+
+
+def _normalize_value(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return "Aucun" if value in _NO_OVERRIDE else value
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return pd.Timestamp(value).date().isoformat()
+    if isinstance(value, (bool, int, float)) or hasattr(value, "item"):
+        number = float(value)
+        if math.isnan(number):
+            return None
+        return round(number, 6)
+    return _normalize_value(str(value))
+
+
+def normalize_inputs(inputs: Dict[str, object]) -> Dict[str, object]:
+    """Normaliser les entrees d'une prediction pour la cle de cache.
+
+    Les dates deviennent ``YYYY-MM-DD``, les nombres et booleens des flottants
+    arrondis (1e-6) et les overrides vides "Aucun".
+    """
+    return {name: _normalize_value(value) for name, value in sorted(inputs.items())}
+
+
+def artifact_version(model_name: str, artifacts_dir: Path = ARTIFACTS_DIR) -> str:
+    """Identifiant de l'artefact servi pour ``model_name``.
+
+    Version ``CURRENT`` du registre, sinon (disposition plate) date de
+    modification du fichier ``.joblib``.
+    """
+    kind = PROPHET_KIND if model_name == "prophet" else MODELS_KIND
+    version = current_version(kind, artifacts_dir)
+    if version is not None:
+        return version
+    model_path = resolve_artifacts_dir(kind, artifacts_dir) / f"{model_name}.joblib"
+    return f"flat-{model_path.stat().st_mtime_ns}" if model_path.exists() else "missing"
+
+
+class PredictionCache:
+    """Cache LRU thread-safe de resultats de prediction, avec expiration.
+
+    Args:
+        artifacts_dir: Racine des artefacts (version des modeles).
+        max_entries: Nombre maximal d'entrees en memoire.
+        ttl_seconds: Duree de vie d'une entree.
+        path: Base SQLite pour persister les entrees entre processus
+            (memoire seule si None).
+    """
+
+    def __init__(
+        self,
+        artifacts_dir: Path = ARTIFACTS_DIR,
+        max_entries: int = PREDICTION_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = PREDICTION_CACHE_TTL_S,
+        path: Optional[Path] = None,
+    ):
+        self.artifacts_dir = Path(artifacts_dir)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = Path(path) if path is not None else None
+        self._entries: "OrderedDict[str, Tuple[str, str, float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def make_key(self, model_name: str, inputs: Dict[str, object]) -> str:
+        """Cle de cache: modele, version de l'artefact et entrees normalisees."""
+        payload = {
+            "model": model_name,
+            "version": artifact_version(model_name, self.artifacts_dir),
+            "inputs": normalize_inputs(inputs),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """Resultat en cache pour ``key`` (None si absent ou expire)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is None and self.path is not None:
+                conn = self._connect()
+                try:
+                    row = conn.execute(
+                        "SELECT model, version, expires_at, value FROM prediction_cache "
+                        "WHERE key = ? AND expires_at > ?",
+                        (key, now),
+                    ).fetchone()
+                finally:
+                    conn.close()
+                if row is not None:
+                    entry = (row[0], row[1], row[2], json.loads(row[3]))
+                    self._entries[key] = entry
+                    self._evict()
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return dict(entry[3])
+
+    def put(self, key: str, model_name: str, value: dict) -> None:
+        """Enregistrer un resultat (valeurs serialisables en JSON).
+
+        Les entrees du meme modele issues d'une autre version d'artefact
+        sont supprimees.
+        """
+        version = artifact_version(model_name, self.artifacts_dir)
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            for stale in [k for k, e in self._entries.items() if e[0] == model_name and e[1] != version]:
+                del self._entries[stale]
+            self._entries[key] = (model_name, version, expires_at, dict(value))
+            self._entries.move_to_end(key)
+            self._evict()
+            if self.path is not None:
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.execute(
+                            "DELETE FROM prediction_cache WHERE expires_at <= ? OR (model = ? AND version != ?)",
+                            (time.time(), model_name, version),
+                        )
+                        conn.execute(
+                            "INSERT OR REPLACE INTO prediction_cache (key, model, version, expires_at, value) "
+                            "VALUES (?, ?, ?, ?, ?)",
+                            (key, model_name, version, expires_at, json.dumps(value, default=str)),
+                        )
+                finally:
+                    conn.close()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Compteurs hits/misses/evictions et nombre d'entrees en memoire."""
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        """Vider le cache (memoire et base SQLite)."""
+        with self._lock:
+            self._entries.clear()
+            if self.path is not None and self.path.exists():
+                conn = self._connect()
+                try:
+                    with conn:
+                        conn.execute("DELETE FROM prediction_cache")
+                finally:
+                    conn.close()
+
+
+_SHARED_CACHES: Dict[Tuple[str, bool], PredictionCache] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def get_prediction_cache(artifacts_dir: Path = ARTIFACTS_DIR, persist: bool = False) -> PredictionCache:
+    """Retourner le ``PredictionCache`` partage du processus.
+
+    Args:
+        artifacts_dir: Racine des artefacts.
+        persist: Si True, les entrees sont aussi stockees dans
+            ``<artifacts_dir>/prediction_cache.sqlite``.
+    """
+    key = (str(Path(artifacts_dir).resolve()), persist)
+    with _SHARED_LOCK:
+        cache = _SHARED_CACHES.get(key)
+        if cache is None:
+            path = Path(artifacts_dir) / PREDICTION_CACHE_FILENAME if persist else None
+            cache = PredictionCache(artifacts_dir, path=path)
+            _SHARED_CACHES[key] = cache
+        return cache
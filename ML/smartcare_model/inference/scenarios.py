@@ -0,0 +1,138 @@
+"""Construction vectorisee des lignes de features pour des scenarios.
+
+Un scenario est une ligne ``(date, meteo, event, temperature, vacances)``.
+La logique reproduit l'onglet "jour unique" de l'application, ligne par
+ligne: derniere ligne de features de l'historique, lags remplaces par les
+lags synthetiques des k jours similaires, puis overrides one-hot meteo et
+evenement.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from smartcare_model.inference.predict import prepare_prediction_row
+from smartcare_model.inference.similarity import SimilarityIndex
+
+SCENARIO_COLUMNS = ["date", "meteo", "event", "temperature", "vacances"]
+_NO_OVERRIDE = {"", "Aucun", "None", "nan"}
+
+
+def normalize_scenarios(scenarios: pd.DataFrame, base_row: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Normaliser un DataFrame de scenarios.
+
+    Accepte ``evenement`` comme alias de ``event``. Les colonnes absentes
+    prennent les valeurs de ``base_row`` (temperature, vacances) ou "Aucun".
+
+    Args:
+        scenarios: DataFrame avec au moins une colonne ``date``.
+        base_row: Ligne de features de reference (valeurs par defaut).
+
+    Returns:
+        DataFrame avec les colonnes ``SCENARIO_COLUMNS``.
+
+    Raises:
+        ValueError: Si la colonne ``date`` est absente ou invalide.
+    """
+    if "evenement" in scenarios.columns and "event" not in scenarios.columns:
+        scenarios = scenarios.rename(columns={"evenement": "event"})
+    if "date" not in scenarios.columns:
+        raise ValueError("La colonne 'date' est requise dans les scenarios.")
+    n = len(scenarios)
+    dates = pd.to_datetime(scenarios["date"].to_numpy(), errors="coerce")
+    if dates.isna().any():
+        raise ValueError("Dates de scenario invalides.")
+
+    columns = {"date": dates}
+    for col in ("meteo", "event"):
+        values = scenarios[col].to_numpy(dtype=object) if col in scenarios.columns else np.full(n, "Aucun", dtype=object)
+        columns[col] = np.array(["Aucun" if v is None or v != v else str(v) for v in values], dtype=object)
+
+    defaults = {
+        "temperature": float(base_row["temperature_moyenne"].iloc[0]) if base_row is not None else np.nan,
+        "vacances": float(base_row["vacances_scolaires"].iloc[0]) if base_row is not None else 0.0,
+    }
+    for col, default in defaults.items():
+        if col in scenarios.columns:
+            values = pd.to_numeric(scenarios[col].astype(object), errors="coerce").to_numpy(dtype=float)
+            columns[col] = np.where(np.isnan(values), default, values)
+        else:
+            columns[col] = np.full(n, default)
+    columns["vacances"] = columns["vacances"].astype(int)
+    return pd.DataFrame(columns, columns=SCENARIO_COLUMNS)
+
+
+def _set_one_hot(
+    X: np.ndarray,
+    positions: Dict[str, int],
+    feature_cols: List[str],
+    prefix: str,
+    values: pd.Series,
+) -> None:
+    cols = [positions[c] for c in feature_cols if c.startswith(prefix)]
+    if not cols:
+        return
+    override = ~values.isin(_NO_OVERRIDE).to_numpy()
+    if not override.any():
+        return
+    X[np.ix_(override, cols)] = 0
+    for value in values[override].unique():
+        col = positions.get(f"{prefix}{value}")
+        if col is not None:
+            X[override & (values == value).to_numpy(), col] = 1
+
+
+def build_scenario_features(
+    feature_df: pd.DataFrame,
+    feature_cols: List[str],
+    scenarios: pd.DataFrame,
+    index: Optional[SimilarityIndex] = None,
+    k: int = 10,
+    hospital_id: Optional[str] = None,
+    base_row: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """Construire la matrice de features de plusieurs scenarios.
+
+    Args:
+        feature_df: DataFrame de features historique.
+        feature_cols: Colonnes attendues par le modele.
+        scenarios: Scenarios (voir ``normalize_scenarios``).
+        index: Index k-NN pre-calcule (construit sur ``feature_df`` sinon).
+        k: Nombre de jours similaires (``0`` desactive les lags synthetiques).
+        hospital_id: Hopital optionnel (modele poole).
+        base_row: Ligne de reference pre-calculee
+            (``prepare_prediction_row(feature_df, feature_cols)`` sinon).
+
+    Returns:
+        DataFrame ``date`` + ``feature_cols`` (une ligne par scenario).
+    """
+    if base_row is None:
+        base_row = prepare_prediction_row(feature_df, feature_cols, hospital_id=hospital_id)
+    scen = normalize_scenarios(scenarios, base_row)
+    positions = {col: i for i, col in enumerate(feature_cols)}
+    X = np.repeat(base_row[feature_cols].to_numpy(dtype=float), len(scen), axis=0)
+
+    if k > 0:
+        if index is None:
+            index = SimilarityIndex(feature_df)
+        # Cible k-NN de l'application: "Soleil" / "Aucun" sans override.
+        meteos = scen["meteo"].where(~scen["meteo"].isin(_NO_OVERRIDE), "Soleil")
+        events = scen["event"].where(~scen["event"].isin(_NO_OVERRIDE), "Aucun")
+        lags = index.synthetic_lags(
+            scen["date"],
+            scen["temperature"].to_numpy(),
+            scen["vacances"].to_numpy(),
+            meteos.tolist(),
+            events.tolist(),
+            k=k,
+        )
+        for col, values in lags.items():
+            if col in positions:
+                X[:, positions[col]] = values
+
+    _set_one_hot(X, positions, feature_cols, "meteo_", scen["meteo"])
+    _set_one_hot(X, positions, feature_cols, "event_", scen["event"])
+    out = pd.DataFrame(X, columns=feature_cols)
+    out.insert(0, "date", scen["date"].to_numpy())
+    return out
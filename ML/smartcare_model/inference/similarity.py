@@ -113,6 +113,156 @@ def find_similar_days(
     return similar_days
 
 
+_JOUR_MAP = {
+    0: "Lundi", 1: "Mardi", 2: "Mercredi", 3: "Jeudi",
+    4: "Vendredi", 5: "Samedi", 6: "Dimanche"
+}
+_SAISON_BY_MONTH = {
+    12: "Hiver", 1: "Hiver", 2: "Hiver",
+    3: "Printemps", 4: "Printemps", 5: "Printemps",
+    6: "Été", 7: "Été", 8: "Été",
+    9: "Automne", 10: "Automne", 11: "Automne",
+}
+DEFAULT_KNN_WEIGHTS = {
+    "jour_semaine": 3.0,
+    "saison": 2.0,
+    "vacances_scolaires": 1.5,
+    "temperature": 0.3,
+    "meteo": 2.0,
+    "evenement": 2.5,
+}
+
+
+class SimilarityIndex:
+    """Index k-NN vectorisé sur l'historique (plusieurs cibles à la fois).
+
+    Équivalent de ``find_similar_days`` + ``compute_synthetic_lags`` appliqués
+    cible par cible, mais les colonnes de l'historique sont encodées une seule
+    fois et les distances sont calculées en une matrice (n_cibles, n_jours).
+    Les distances sont additionnées dans le même ordre et les égalités sont
+    départagées comme ``nsmallest`` (ordre de l'historique).
+    """
+
+    def __init__(self, feature_df: pd.DataFrame, weights: Optional[Dict[str, float]] = None):
+        self.weights = dict(DEFAULT_KNN_WEIGHTS if weights is None else weights)
+        self.n_days = len(feature_df)
+        self._jour = self._factorize(feature_df, "jour_semaine")
+        self._saison = self._factorize(feature_df, "saison")
+        self._vacances = (
+            feature_df["vacances_scolaires"].to_numpy(dtype=float)
+            if "vacances_scolaires" in feature_df.columns else None
+        )
+        self._temperature = (
+            feature_df["temperature_moyenne"].to_numpy(dtype=float)
+            if "temperature_moyenne" in feature_df.columns else None
+        )
+        self._meteo = self._one_hot(feature_df, "meteo_")
+        self._event = self._one_hot(feature_df, "event_")
+        self.admissions = feature_df["nombre_admissions"].to_numpy(dtype=float)
+
+    @staticmethod
+    def _factorize(df: pd.DataFrame, col: str):
+        if col not in df.columns:
+            return None
+        codes, uniques = pd.factorize(df[col])
+        return codes, pd.Index(uniques)
+
+    @staticmethod
+    def _one_hot(df: pd.DataFrame, prefix: str):
+        cols = [c for c in df.columns if c.startswith(prefix)]
+        if not cols:
+            return None
+        return {c[len(prefix):]: i for i, c in enumerate(cols)}, df[cols].fillna(0).to_numpy(dtype=float)
+
+    @staticmethod
+    def _mismatch(encoded, targets: List[str]) -> np.ndarray:
+        codes, uniques = encoded
+        target_codes = uniques.get_indexer(targets)
+        # Valeur cible inconnue: jamais égale (code -2, distinct du -1 des NaN).
+        target_codes = np.where(target_codes < 0, -2, target_codes)
+        return (codes[None, :] != target_codes[:, None]).astype(float)
+
+    @staticmethod
+    def _one_hot_distance(encoded, targets: List[str], n_days: int) -> np.ndarray:
+        positions, matrix = encoded
+        match = np.zeros((len(targets), n_days))
+        for i, target in enumerate(targets):
+            col = positions.get(target)
+            if col is not None:
+                match[i] = matrix[:, col]
+        return 1 - match
+
+    def distances(
+        self,
+        dates: pd.Series,
+        temperatures: np.ndarray,
+        vacances: np.ndarray,
+        meteos: List[str],
+        events: List[str],
+    ) -> np.ndarray:
+        """Matrice des distances (n_cibles, n_jours).
+
+        Args:
+            dates: Dates cibles (jour de semaine et saison en sont déduits).
+            temperatures: Températures cibles.
+            vacances: Indicateurs vacances (0/1) cibles.
+            meteos: Météos cibles (suffixe des colonnes ``meteo_``).
+            events: Événements cibles (suffixe des colonnes ``event_``).
+
+        Returns:
+            Distances float64, NaN si une feature de l'historique manque.
+        """
+        dates = pd.DatetimeIndex(dates)
+        w = self.weights
+        dist = np.zeros((len(dates), self.n_days))
+        if self._jour is not None:
+            jours = [_JOUR_MAP[d] for d in dates.weekday]
+            dist += self._mismatch(self._jour, jours) * w["jour_semaine"]
+        if self._saison is not None:
+            saisons = [_SAISON_BY_MONTH[m] for m in dates.month]
+            dist += self._mismatch(self._saison, saisons) * w["saison"]
+        if self._vacances is not None:
+            vac = np.asarray(vacances, dtype=float)
+            dist += (self._vacances[None, :] != vac[:, None]).astype(float) * w["vacances_scolaires"]
+        if self._temperature is not None:
+            temp = np.asarray(temperatures, dtype=float)
+            dist += (np.abs(self._temperature[None, :] - temp[:, None]) / 10.0) * w["temperature"]
+        if self._meteo is not None:
+            dist += self._one_hot_distance(self._meteo, list(meteos), self.n_days) * w["meteo"]
+        if self._event is not None:
+            dist += self._one_hot_distance(self._event, list(events), self.n_days) * w["evenement"]
+        return dist
+
+    def neighbors(self, distances: np.ndarray, k: int = 10) -> np.ndarray:
+        """Indices (n_cibles, k) des k jours les plus proches, ex aequo dans l'ordre de l'historique."""
+        return np.argsort(distances, axis=1, kind="stable")[:, :k]
+
+    def synthetic_lags(
+        self,
+        dates: pd.Series,
+        temperatures: np.ndarray,
+        vacances: np.ndarray,
+        meteos: List[str],
+        events: List[str],
+        k: int = 10,
+    ) -> Dict[str, np.ndarray]:
+        """Lags synthétiques (clés de ``compute_synthetic_lags``) par cible.
+
+        Returns:
+            Dict {colonne: tableau (n_cibles,)} des lags, moyennes et écart-type.
+        """
+        idx = self.neighbors(self.distances(dates, temperatures, vacances, meteos, events), k=k)
+        neighbours = self.admissions[idx]
+        base = neighbours.mean(axis=1)
+        std = neighbours.std(axis=1, ddof=1) if k > 1 else np.full(len(base), np.nan)
+        lags = {f"adm_lag_{lag}": base for lag in [1, 4, 7, 14, 28]}
+        lags.update({f"adm_roll_mean_{window}": base for window in [7, 14, 28]})
+        lags["adm_roll_std_7"] = std
+        lags["adm_diff_1"] = np.zeros(len(base))
+        lags["adm_diff_7"] = np.zeros(len(base))
+        return lags
+
+
 def compute_synthetic_lags(
     similar_days: pd.DataFrame,
     lag_periods: List[int] = [1, 4, 7, 14, 28],
@@ -1,6 +1,6 @@
 """Definitions et registry des modeles."""
 
 from smartcare_model.models.interfaces import ModelProtocol
-from smartcare_model.models.registry import build_models
+from smartcare_model.models.registry import build_models, build_quantile_models, quantile_model_name
 
-__all__ = ["ModelProtocol", "build_models"]
+__all__ = ["ModelProtocol", "build_models", "build_quantile_models", "quantile_model_name"]
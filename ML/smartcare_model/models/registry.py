@@ -3,10 +3,11 @@
 Ce module est la source unique des modeles utilises a l'entrainement.
 """
 
-from typing import Dict
+from typing import Dict, Iterable
 
 from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
 
+from smartcare_model.config.constants import QUANTILE_LEVELS
 from smartcare_model.models.interfaces import ModelProtocol
 
 
@@ -24,3 +25,26 @@ def build_models() -> Dict[str, ModelProtocol]:
         ),
         "gradient_boosting": GradientBoostingRegressor(random_state=42),
     }
+
+
+def quantile_model_name(level: float) -> str:
+    """Nom d'artefact du modele quantile ``level`` (ex. 0.1 -> ``gradient_boosting_q10``)."""
+    return f"gradient_boosting_q{int(round(level * 100)):02d}"
+
+
+def build_quantile_models(levels: Iterable[float] = QUANTILE_LEVELS) -> Dict[str, ModelProtocol]:
+    """Instancier les gradient boosting a perte quantile.
+
+    Entraines avec le modele ponctuel, ils fournissent les bornes
+    d'intervalle (``predict_intervals``).
+
+    Args:
+        levels: Niveaux de quantile dans ]0, 1[.
+
+    Returns:
+        Dictionnaire {nom_modele: instance_modele}.
+    """
+    return {
+        quantile_model_name(level): GradientBoostingRegressor(loss="quantile", alpha=level, random_state=42)
+        for level in levels
+    }
@@ -4,30 +4,53 @@ Ce module conserve l'API publique historique tout en deleguant
 aux sous-modules refactorises.
 """
 
-from smartcare_model.artifacts.store import load_artifacts, load_feature_columns, save_artifacts
+from smartcare_model.artifacts.cache import ModelCache, get_model_cache
+from smartcare_model.artifacts.metrics_store import MetricsStore
+from smartcare_model.artifacts.prediction_log import PredictionLog
+from smartcare_model.artifacts.registry import current_version, list_versions, set_current
+from smartcare_model.artifacts.store import (
+    load_artifacts,
+    load_feature_columns,
+    load_metrics,
+    save_artifacts,
+)
 from smartcare_model.config.constants import DATA_FILENAME_HINT, DEFAULT_MODEL_NAME, TARGET_COL
 from smartcare_model.config.paths import ARTIFACTS_DIR, ML_ROOT, RAW_DIR
-from smartcare_model.data.loading import load_raw_dataframe
+from smartcare_model.data.loading import load_partitioned_dataframe, load_raw_dataframe
+from smartcare_model.evaluation.online import OnlineMetrics
+from smartcare_model.evaluation.scoring import bootstrap_metrics, score_models
 from smartcare_model.features.engineering import build_feature_dataframe
 from smartcare_model.features.selection import _select_feature_columns
+from smartcare_model.inference.compiled import CompiledTreeEnsemble, compile_tree_ensemble, predict_fast, predict_many
+from smartcare_model.inference.conformal import ConformalTable, load_conformal_table
+from smartcare_model.inference.intervals import load_quantile_models, predict_intervals
 from smartcare_model.inference.predict import (
     apply_overrides,
     predict_from_features,
     prepare_prediction_row,
 )
+from smartcare_model.inference.result_cache import PredictionCache, get_prediction_cache
+from smartcare_model.inference.scenarios import build_scenario_features, normalize_scenarios
 from smartcare_model.inference.similarity import (
+    SimilarityIndex,
     calculate_historical_trend,
     compute_synthetic_lags,
     evaluate_knn_quality,
     find_similar_days,
 )
 from smartcare_model.prophet import (
+    build_prophet_climatology,
     build_prophet_future_frame,
+    build_prophet_scenario_frame,
     build_prophet_train_frame,
     forecast_prophet,
     load_prophet_artifacts,
+    load_prophet_payload,
+    prophet_from_payload,
     train_prophet_model,
 )
+from smartcare_model.prophet_fleet import PROPHET_TARGETS, ProphetFleet, train_prophet_fleet
+from smartcare_model.service import PredictionService
 from smartcare_model.training.trainer import train_models
 
 BASE_DIR = ML_ROOT
@@ -35,26 +58,59 @@ BASE_DIR = ML_ROOT
 __all__ = [
     "ARTIFACTS_DIR",
     "BASE_DIR",
+    "CompiledTreeEnsemble",
+    "ConformalTable",
     "DATA_FILENAME_HINT",
     "DEFAULT_MODEL_NAME",
+    "MetricsStore",
+    "ModelCache",
+    "OnlineMetrics",
+    "PredictionCache",
+    "PredictionLog",
+    "PredictionService",
+    "PROPHET_TARGETS",
+    "ProphetFleet",
     "RAW_DIR",
+    "SimilarityIndex",
     "TARGET_COL",
     "apply_overrides",
+    "bootstrap_metrics",
+    "build_prophet_climatology",
     "build_prophet_future_frame",
+    "build_prophet_scenario_frame",
     "build_prophet_train_frame",
     "build_feature_dataframe",
+    "build_scenario_features",
     "calculate_historical_trend",
+    "compile_tree_ensemble",
     "compute_synthetic_lags",
+    "current_version",
     "evaluate_knn_quality",
     "find_similar_days",
     "forecast_prophet",
+    "get_model_cache",
+    "get_prediction_cache",
+    "list_versions",
     "load_artifacts",
     "load_feature_columns",
+    "load_conformal_table",
+    "load_metrics",
+    "load_quantile_models",
+    "load_partitioned_dataframe",
     "load_prophet_artifacts",
+    "load_prophet_payload",
+    "prophet_from_payload",
     "load_raw_dataframe",
+    "normalize_scenarios",
+    "predict_fast",
     "predict_from_features",
+    "predict_intervals",
+    "predict_many",
     "prepare_prediction_row",
     "save_artifacts",
+    "score_models",
+    "set_current",
+    "train_prophet_fleet",
     "train_prophet_model",
     "train_models",
     "_select_feature_columns",
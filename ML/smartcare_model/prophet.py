@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import copy
 import json
 from pathlib import Path
+from statistics import NormalDist
 from typing import Dict, Iterable, List, Tuple, Optional
 
 import numpy as np
@@ -11,9 +13,24 @@ import pandas as pd
 import joblib
 import re
 
+from smartcare_model.artifacts.registry import (
+    PROPHET_KIND,
+    TRAINING_LIBRARIES,
+    compute_version,
+    fingerprint_dataframe,
+    library_versions,
+    matching_version,
+    publish_version,
+    resolve_artifacts_dir,
+    run_version,
+    set_current,
+    version_dir,
+)
+from smartcare_model.artifacts.metrics_store import METRICS_DB_FILENAME, MetricsStore
 from smartcare_model.config.paths import ARTIFACTS_DIR
 from smartcare_model.data.loading import load_raw_dataframe
 from smartcare_model.evaluation.metrics import evaluate
+from smartcare_model.inference.scenarios import normalize_scenarios
 
 try:
     from prophet import Prophet
@@ -64,6 +81,23 @@ def _ensure_cmdstan_installed() -> None:
         ) from exc
 
 
+_PROPHET_NUMERIC_COLS = [
+    "temperature_moyenne",
+    "temperature_min",
+    "temperature_max",
+    "indice_chaleur",
+    "indice_froid",
+    "lits_total",
+    "lits_occupes",
+    "taux_occupation_lits",
+    "nb_medecins_disponibles",
+    "nb_infirmiers_disponibles",
+    "nb_aides_soignants_disponibles",
+    "taux_couverture_personnel",
+    "vacances_scolaires",
+]
+
+
 def _monthly_mode(series: pd.Series) -> str:
     """Retourner le mode d'une serie, ou une chaine vide si absent."""
     modes = series.dropna().mode()
@@ -79,39 +113,80 @@ def _sanitize_holiday_name(value: str) -> str:
 
 
 def build_prophet_holidays(raw_df: pd.DataFrame) -> pd.DataFrame:
-    """Construire un DataFrame de jours speciaux pour Prophet."""
-    df = raw_df.copy()
-    df["date"] = pd.to_datetime(df["date"])
-
-    holiday_rows = []
-
-    if "vacances_scolaires" in df.columns:
-        vac_mask = pd.to_numeric(df["vacances_scolaires"], errors="coerce").fillna(0) == 1
-        for date in df.loc[vac_mask, "date"]:
-            holiday_rows.append({"ds": date, "holiday": "vacances_scolaires"})
-
-    if "evenement_special" in df.columns:
-        for date, evt in df[["date", "evenement_special"]].dropna().itertuples(index=False):
-            evt_str = str(evt)
-            if evt_str.lower() in ("aucun", "none", "nan"):
-                continue
-            holiday_rows.append(
-                {"ds": date, "holiday": f"event_{_sanitize_holiday_name(evt_str)}"}
-            )
+    """Construire un DataFrame de jours speciaux pour Prophet.
 
-    if not holiday_rows:
-        return pd.DataFrame(columns=["ds", "holiday"])
+    Les vacances scolaires puis les evenements speciaux (hors ``Aucun``) sont
+    extraits par masques booleens; les noms d'evenements sont normalises une
+    seule fois par valeur distincte.
+    """
+    dates = raw_df["date"]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates)
+    frames = []
+
+    if "vacances_scolaires" in raw_df.columns:
+        vac_mask = pd.to_numeric(raw_df["vacances_scolaires"], errors="coerce").fillna(0) == 1
+        frames.append(pd.DataFrame({"ds": dates[vac_mask].to_numpy(), "holiday": "vacances_scolaires"}))
+
+    if "evenement_special" in raw_df.columns:
+        valid = dates.notna() & raw_df["evenement_special"].notna()
+        events = raw_df.loc[valid, "evenement_special"].astype(str)
+        keep = ~events.str.lower().isin(["aucun", "none", "nan"])
+        events = events[keep]
+        names = {evt: f"event_{_sanitize_holiday_name(evt)}" for evt in events.unique()}
+        frames.append(
+            pd.DataFrame({"ds": dates[valid][keep].to_numpy(), "holiday": events.map(names).to_numpy()})
+        )
 
-    holidays = pd.DataFrame(holiday_rows)
-    holidays["ds"] = pd.to_datetime(holidays["ds"])
+    holidays = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if holidays.empty:
+        return pd.DataFrame(columns=["ds", "holiday"])
     return holidays
 
 
-def build_prophet_train_frame(raw_df: pd.DataFrame) -> pd.DataFrame:
+def build_prophet_climatology(raw_df: pd.DataFrame) -> pd.DataFrame:
+    """Construire la climatologie mensuelle utilisee pour les regressseurs futurs.
+
+    Args:
+        raw_df: DataFrame brut historique.
+
+    Returns:
+        DataFrame indexe par mois (1..12): moyennes des colonnes numeriques
+        (repli sur la moyenne globale), mode meteo (repli sur le mode global)
+        et evenement par defaut.
+    """
+    months = pd.to_datetime(raw_df["date"]).dt.month
+    numeric_cols = [c for c in _PROPHET_NUMERIC_COLS if c in raw_df.columns]
+    climatology = raw_df[numeric_cols].groupby(months).mean().reindex(range(1, 13))
+    climatology = climatology.fillna(raw_df[numeric_cols].mean())
+    climatology.index.name = "month"
+
+    if "meteo_principale" in raw_df.columns:
+        meteo_global = _monthly_mode(raw_df["meteo_principale"]) or "Aucun"
+        counts = pd.crosstab(months, raw_df["meteo_principale"])
+        climatology["meteo_principale"] = (
+            counts.idxmax(axis=1).astype(str).reindex(climatology.index).fillna(meteo_global)
+        )
+
+    if "evenement_special" in raw_df.columns:
+        event_default = "Aucun"
+        event_values = raw_df["evenement_special"].dropna().astype(str)
+        if "Aucun" not in event_values.unique():
+            event_default = _monthly_mode(event_values) or "Aucun"
+        climatology["evenement_special"] = event_default
+
+    return climatology
+
+
+def build_prophet_train_frame(
+    raw_df: pd.DataFrame,
+    target_col: str = "nombre_admissions",
+) -> pd.DataFrame:
     """Construire le DataFrame d'entrainement pour Prophet.
 
     Args:
         raw_df: DataFrame brut (charge depuis le CSV).
+        target_col: Colonne renommee en ``y`` (admissions par defaut).
 
     Returns:
         DataFrame avec colonnes `ds`, `y` et regressseurs numeriques/one-hot.
@@ -121,7 +196,7 @@ def build_prophet_train_frame(raw_df: pd.DataFrame) -> pd.DataFrame:
 
     base_cols = [
         "date",
-        "nombre_admissions",
+        target_col,
         "temperature_moyenne",
         "temperature_min",
         "temperature_max",
@@ -141,23 +216,9 @@ def build_prophet_train_frame(raw_df: pd.DataFrame) -> pd.DataFrame:
     existing_cols = [c for c in base_cols if c in df.columns]
     df = df[existing_cols].copy()
 
-    df = df.rename(columns={"date": "ds", "nombre_admissions": "y"})
+    df = df.rename(columns={"date": "ds", target_col: "y"})
 
-    for num_col in [
-        "temperature_moyenne",
-        "temperature_min",
-        "temperature_max",
-        "indice_chaleur",
-        "indice_froid",
-        "lits_total",
-        "lits_occupes",
-        "taux_occupation_lits",
-        "nb_medecins_disponibles",
-        "nb_infirmiers_disponibles",
-        "nb_aides_soignants_disponibles",
-        "taux_couverture_personnel",
-        "vacances_scolaires",
-    ]:
+    for num_col in _PROPHET_NUMERIC_COLS:
         if num_col in df.columns:
             df[num_col] = pd.to_numeric(df[num_col], errors="coerce").fillna(0)
 
@@ -177,6 +238,14 @@ def build_prophet_train_frame(raw_df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+_DEFAULT_PROPHET_PARAMS: Dict[str, float | str] = {
+    "seasonality_mode": "multiplicative",
+    "changepoint_prior_scale": 0.1,
+    "seasonality_prior_scale": 10.0,
+}
+_MONTHLY_SEASONALITY: Dict[str, object] = {"name": "monthly", "period": 30.5, "fourier_order": 5}
+
+
 def _build_prophet_model(
     holidays: Optional[pd.DataFrame],
     seasonality_mode: str,
@@ -189,7 +258,7 @@ def _build_prophet_model(
         seasonality_prior_scale=seasonality_prior_scale,
         holidays=holidays if holidays is not None and not holidays.empty else None,
     )
-    model.add_seasonality(name="monthly", period=30.5, fourier_order=5)
+    model.add_seasonality(**_MONTHLY_SEASONALITY)
     return model
 
 
@@ -206,17 +275,45 @@ def _default_tuning_grid() -> List[Dict[str, float | str]]:
     ]
 
 
-def train_prophet_model(
+def _prophet_config(tune: bool, param_grid: Optional[List[Dict[str, float | str]]]) -> Dict[str, object]:
+    """Configuration effective d'un ajustement, pour le hash de version.
+
+    Couvre les hyperparametres reellement utilises (grille effective si
+    ``tune``, sinon parametres par defaut) et la saisonnalite mensuelle
+    ajoutee a chaque modele.
+    """
+    return {
+        "tune": tune,
+        "param_grid": (param_grid or _default_tuning_grid()) if tune else None,
+        "default_params": None if tune else _DEFAULT_PROPHET_PARAMS,
+        "monthly_seasonality": _MONTHLY_SEASONALITY,
+    }
+
+
+def _fit_prophet_series(
+    raw_df: pd.DataFrame,
     train_ratio: float = 0.8,
-    artifacts_dir: Path = ARTIFACTS_DIR,
     tune: bool = False,
     param_grid: Optional[List[Dict[str, float | str]]] = None,
-) -> dict:
-    """Entrainer un modele Prophet et sauvegarder les artefacts."""
-    _require_prophet()
-    _ensure_cmdstan_installed()
-    raw_df = load_raw_dataframe()
-    train_df = build_prophet_train_frame(raw_df)
+    target_col: str = "nombre_admissions",
+) -> Dict[str, object]:
+    """Ajuster Prophet sur une serie brute (split chronologique, tuning optionnel).
+
+    Args:
+        raw_df: DataFrame brut d'une seule serie (un hopital).
+        train_ratio: Ratio du debut de serie utilise pour l'entrainement.
+        tune: Active la recherche sur grille.
+        param_grid: Grille optionnelle (sinon ``_default_tuning_grid``).
+        target_col: Colonne cible (admissions par defaut).
+
+    Returns:
+        Dictionnaire avec ``payload`` (contenu de ``prophet.joblib``),
+        ``metrics``, ``params`` et ``tuning``.
+
+    Raises:
+        RuntimeError: Si aucune configuration de la grille n'a pu etre entrainee.
+    """
+    train_df = build_prophet_train_frame(raw_df, target_col=target_col)
 
     train_df = train_df.dropna(subset=["y"]).reset_index(drop=True)
     regressor_cols = [c for c in train_df.columns if c not in ("ds", "y")]
@@ -277,11 +374,7 @@ def train_prophet_model(
         model = best_model
         metrics = best_metrics
     else:
-        default_params = {
-            "seasonality_mode": "multiplicative",
-            "changepoint_prior_scale": 0.1,
-            "seasonality_prior_scale": 10.0,
-        }
+        default_params = dict(_DEFAULT_PROPHET_PARAMS)
         model = _build_prophet_model(
             holidays,
             seasonality_mode=default_params["seasonality_mode"],
@@ -295,120 +388,273 @@ def train_prophet_model(
         metrics = evaluate(test_data["y"], forecast["yhat"])
         best_params = default_params
 
-    artifacts_dir.mkdir(parents=True, exist_ok=True)
-    joblib.dump(
-        {"model_json": model_to_json(model), "regressors": regressor_cols},
-        artifacts_dir / "prophet.joblib",
-    )
+    # Ecart-type des residus hors echantillon: sert aux intervalles du mode rapide.
+    test_forecast = forecast_prophet(model, test_data[["ds"] + regressor_cols], fast=True)
+    residual_std = float(np.std(test_data["y"].to_numpy() - test_forecast["yhat"].to_numpy()))
+
+    payload = {
+        "model_json": model_to_json(model),
+        "regressors": regressor_cols,
+        "residual_std": residual_std,
+        "climatology": build_prophet_climatology(raw_df),
+    }
+    return {"payload": payload, "metrics": metrics, "params": best_params, "tuning": tuning_results}
+
 
-    metrics_path = artifacts_dir / "metrics.json"
-    if metrics_path.exists():
+def train_prophet_model(
+    train_ratio: float = 0.8,
+    artifacts_dir: Path = ARTIFACTS_DIR,
+    tune: bool = False,
+    param_grid: Optional[List[Dict[str, float | str]]] = None,
+    force: bool = False,
+) -> dict:
+    """Entrainer un modele Prophet et publier ses artefacts dans le registre.
+
+    La version (``registry/prophet/<version>/``) est un hash des donnees, des
+    colonnes du jeu Prophet, des options d'entrainement et des versions de
+    librairies; une version deja presente est reactivee sans nouvel
+    ajustement, sauf si ``force`` est vrai (nouvelle version
+    ``run_version``, l'ancienne n'est pas reecrite).
+    """
+    _require_prophet()
+    artifacts_dir = Path(artifacts_dir)
+    raw_df = load_raw_dataframe()
+    data_fingerprint = fingerprint_dataframe(raw_df)
+    params = {
+        "train_ratio": train_ratio,
+        **_prophet_config(tune, param_grid),
+        "columns": list(build_prophet_train_frame(raw_df).columns),
+        "libraries": library_versions(TRAINING_LIBRARIES + ("prophet", "cmdstanpy")),
+    }
+    version = compute_version(data_fingerprint, params)
+    existing_version = None if force else matching_version(PROPHET_KIND, version, artifacts_dir)
+    if existing_version is not None:
+        set_current(PROPHET_KIND, existing_version, artifacts_dir)
+        metrics_path = version_dir(PROPHET_KIND, existing_version, artifacts_dir) / "metrics.json"
         with open(metrics_path, "r", encoding="utf-8") as f:
             existing = json.load(f)
-    else:
-        existing = {}
-    existing["prophet"] = metrics
+        return {"prophet": existing["prophet"]}
+    if force:
+        version = run_version(version)
+
+    _ensure_cmdstan_installed()
+    fit = _fit_prophet_series(raw_df, train_ratio=train_ratio, tune=tune, param_grid=param_grid)
+    metrics = fit["metrics"]
+    best_params = fit["params"]
+    tuning_results = fit["tuning"]
+
+    results: Dict[str, object] = {"prophet": metrics}
     if best_params is not None:
-        existing["prophet_params"] = best_params
+        results["prophet_params"] = best_params
     if tuning_results:
-        existing["prophet_tuning"] = tuning_results
-    with open(metrics_path, "w", encoding="utf-8") as f:
-        json.dump(existing, f, indent=2)
-
+        results["prophet_tuning"] = tuning_results
+
+    def _write(target: Path) -> None:
+        joblib.dump(fit["payload"], target / "prophet.joblib")
+        with open(target / "metrics.json", "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    publish_version(
+        PROPHET_KIND,
+        version,
+        _write,
+        manifest={"data_fingerprint": data_fingerprint, "params": params, "n_rows": len(raw_df)},
+        artifacts_dir=artifacts_dir,
+    )
+    MetricsStore(artifacts_dir / METRICS_DB_FILENAME).record(PROPHET_KIND, version, results)
     return {"prophet": metrics}
 
 
+def load_prophet_payload(artifacts_dir: Path = ARTIFACTS_DIR) -> dict:
+    """Charger le contenu brut de ``prophet.joblib``.
+
+    Le payload contient ``model_json``, ``regressors`` et, pour les artefacts
+    recents, ``residual_std`` (ecart-type des residus sur le split test) et
+    ``climatology`` (table mensuelle des regressseurs futurs). La version
+    ``CURRENT`` du registre est lue en priorite, sinon le layout plat.
+
+    Raises:
+        FileNotFoundError: Si l'artefact est absent.
+    """
+    joblib_path = resolve_artifacts_dir(PROPHET_KIND, artifacts_dir) / "prophet.joblib"
+    if not joblib_path.exists():
+        raise FileNotFoundError(f"{joblib_path} not found. Train Prophet first.")
+    return joblib.load(joblib_path)
+
+
+def prophet_from_payload(payload: dict) -> Tuple["Prophet", List[str]]:
+    """Reconstruire le modele Prophet et ses regressseurs depuis un payload."""
+    _require_prophet()
+    model_json = payload.get("model_json")
+    regressor_cols = payload.get("regressors", [])
+    if model_json is None:
+        raise ValueError("prophet.joblib is missing model_json.")
+    return model_from_json(model_json), regressor_cols
+
+
 def load_prophet_artifacts(
     artifacts_dir: Path = ARTIFACTS_DIR,
 ) -> Tuple["Prophet", List[str]]:
     """Charger le modele Prophet et la liste des regressseurs."""
     _require_prophet()
-    joblib_path = artifacts_dir / "prophet.joblib"
-    if joblib_path.exists():
-        payload = joblib.load(joblib_path)
-        model_json = payload.get("model_json")
-        regressor_cols = payload.get("regressors", [])
-        if model_json is None:
-            raise ValueError("prophet.joblib is missing model_json.")
-        return model_from_json(model_json), regressor_cols
-
-    raise FileNotFoundError(f"{joblib_path} not found. Train Prophet first.")
+    return prophet_from_payload(load_prophet_payload(artifacts_dir))
 
 
 def build_prophet_future_frame(
     dates: Iterable[pd.Timestamp],
-    raw_df: pd.DataFrame,
+    raw_df: Optional[pd.DataFrame],
     regressor_cols: List[str],
+    climatology: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
-    """Construire les regressseurs futurs pour Prophet."""
-    future = pd.DataFrame({"ds": pd.to_datetime(list(dates))})
-
-    hist = raw_df.copy()
-    hist["date"] = pd.to_datetime(hist["date"])
-    hist["month"] = hist["date"].dt.month
+    """Construire les regressseurs futurs pour Prophet.
 
-    numeric_cols = [
-        "temperature_moyenne",
-        "temperature_min",
-        "temperature_max",
-        "indice_chaleur",
-        "indice_froid",
-        "lits_total",
-        "lits_occupes",
-        "taux_occupation_lits",
-        "nb_medecins_disponibles",
-        "nb_infirmiers_disponibles",
-        "nb_aides_soignants_disponibles",
-        "taux_couverture_personnel",
-        "vacances_scolaires",
-    ]
-    numeric_cols = [c for c in numeric_cols if c in hist.columns]
-    monthly_means = hist.groupby("month")[numeric_cols].mean()
-    overall_means = hist[numeric_cols].mean()
+    Args:
+        dates: Dates a predire.
+        raw_df: Historique brut, utilise seulement si ``climatology`` est absent.
+        regressor_cols: Regressseurs attendus par le modele.
+        climatology: Table issue de ``build_prophet_climatology`` (par exemple
+            celle stockee dans ``prophet.joblib``).
 
-    for col in numeric_cols:
-        future[col] = (
-            future["ds"].dt.month.map(monthly_means[col]).fillna(overall_means[col])
-        )
+    Returns:
+        DataFrame ``ds`` + regressseurs (float), dans l'ordre de ``regressor_cols``.
+    """
+    if climatology is None:
+        climatology = build_prophet_climatology(raw_df)
+
+    ds = pd.to_datetime(list(dates))
+    month_idx = climatology.index.get_indexer(ds.month)
+    values = np.zeros((len(ds), len(regressor_cols)), dtype=float)
+
+    categorical = {"meteo_": "meteo_principale", "event_": "evenement_special"}
+    category_values = {
+        prefix: climatology[col].to_numpy()[month_idx]
+        for prefix, col in categorical.items()
+        if col in climatology.columns
+    }
+    for pos, col in enumerate(regressor_cols):
+        if col in _PROPHET_NUMERIC_COLS and col in climatology.columns:
+            values[:, pos] = climatology[col].to_numpy(dtype=float)[month_idx]
+            continue
+        for prefix, month_values in category_values.items():
+            if col.startswith(prefix):
+                values[:, pos] = month_values == col[len(prefix):]
+                break
+
+    future = pd.DataFrame(values, columns=regressor_cols)
+    future.insert(0, "ds", ds)
+    return future
 
-    if "meteo_principale" in hist.columns:
-        meteo_by_month = hist.groupby("month")["meteo_principale"].apply(_monthly_mode)
-        meteo_global = _monthly_mode(hist["meteo_principale"]) or "Aucun"
-        future["meteo_principale"] = (
-            future["ds"].dt.month.map(meteo_by_month).replace("", np.nan).fillna(meteo_global)
-        )
 
-    event_default = "Aucun"
-    if "evenement_special" in hist.columns:
-        event_values = hist["evenement_special"].dropna().astype(str)
-        if "Aucun" not in event_values.unique():
-            event_default = _monthly_mode(event_values) or "Aucun"
-        future["evenement_special"] = event_default
+def build_prophet_scenario_frame(
+    scenarios: pd.DataFrame,
+    regressor_cols: List[str],
+    climatology: Optional[pd.DataFrame] = None,
+    raw_df: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """Construire les regressseurs Prophet de plusieurs scenarios.
 
-    cat_cols = [
-        c
-        for c in ["meteo_principale", "evenement_special"]
-        if c in future.columns
-    ]
-    if cat_cols:
-        prefixes = ["meteo" if c == "meteo_principale" else "event" for c in cat_cols]
-        future = pd.get_dummies(
-            future,
-            columns=cat_cols,
-            prefix=prefixes,
-            dummy_na=False,
-        )
+    Reprend les overrides de l'onglet "jour unique" pour toutes les lignes:
+    temperatures moyenne/min/max = ``temperature``, ``vacances_scolaires``,
+    one-hot meteo (aucune si "Aucun") et evenement (``event_Aucun`` si
+    "Aucun"). Les regressseurs non fournis viennent de la climatologie.
 
-    for col in regressor_cols:
-        if col not in future.columns:
-            future[col] = 0.0
+    Args:
+        scenarios: DataFrame ``date``/``meteo``/``event``/``temperature``/
+            ``vacances`` (voir ``normalize_scenarios``).
+        regressor_cols: Regressseurs attendus par le modele.
+        climatology: Climatologie stockee avec le modele.
+        raw_df: Historique brut, utilise seulement si ``climatology`` est absent.
 
-    future = future[["ds"] + regressor_cols]
-    future[regressor_cols] = future[regressor_cols].astype(float)
+    Returns:
+        DataFrame ``ds`` + regressseurs, une ligne par scenario (meme ordre).
+    """
+    scen = normalize_scenarios(scenarios)
+    future = build_prophet_future_frame(scen["date"], raw_df, regressor_cols, climatology=climatology)
+    temperature = scen["temperature"].to_numpy(dtype=float)
+    has_temperature = ~np.isnan(temperature)
+    for col in ("temperature_moyenne", "temperature_min", "temperature_max"):
+        if col in regressor_cols:
+            future[col] = np.where(has_temperature, temperature, future[col].to_numpy())
+    if "vacances_scolaires" in regressor_cols:
+        future["vacances_scolaires"] = (scen["vacances"].to_numpy() > 0).astype(float)
+
+    for prefix, column, default in (("meteo_", "meteo", None), ("event_", "event", "Aucun")):
+        cols = [c for c in regressor_cols if c.startswith(prefix)]
+        if not cols:
+            continue
+        values = scen[column].to_numpy(dtype=object)
+        for col in cols:
+            future[col] = (values == col[len(prefix):]).astype(float)
+        if default is None and f"{prefix}Aucun" in cols:
+            future[f"{prefix}Aucun"] = 0.0
     return future
 
 
-def forecast_prophet(model: "Prophet", future_df: pd.DataFrame) -> pd.DataFrame:
-    """Generer les previsions Prophet pour un DataFrame futur."""
+def _forecast_point(
+    model: "Prophet",
+    future_df: pd.DataFrame,
+    residual_std: Optional[float] = None,
+) -> pd.DataFrame:
+    """Calculer uniquement ``yhat`` (tendance + termes saisonniers agreges).
+
+    Reprend le calcul de ``Prophet.predict`` sans tirage d'incertitude ni
+    construction des colonnes par composante: seuls les termes additifs et
+    multiplicatifs agreges sont evalues par un produit matriciel. Les jours
+    speciaux hors de la fenetre predite sont ignores (Prophet recree alors
+    des colonnes nulles pour les noms vus a l'entrainement). Les lignes
+    restent dans l'ordre de ``future_df`` (dates dupliquees autorisees).
+    """
+    future = future_df.copy()
+    # setup_dataframe trie par date: on garde la position d'origine des lignes.
+    future["_row"] = np.arange(len(future))
+    df = model.setup_dataframe(future)
+    if model.holidays is not None and not model.holidays.empty:
+        model = copy.copy(model)
+        holidays = model.holidays
+        lower = int(holidays["lower_window"].min()) if "lower_window" in holidays else 0
+        upper = int(holidays["upper_window"].max()) if "upper_window" in holidays else 0
+        window_start = df["ds"].min() - pd.Timedelta(days=max(upper, 0))
+        window_end = df["ds"].max() - pd.Timedelta(days=min(lower, 0))
+        in_window = (holidays["ds"] >= window_start) & (holidays["ds"] <= window_end)
+        model.holidays = holidays.loc[in_window]
+    trend = np.asarray(model.predict_trend(df), dtype=float)
+    seasonal_features, _, component_cols, _ = model.make_all_seasonality_features(df)
+    X = seasonal_features.to_numpy()
+    beta = np.nanmean(model.params["beta"], axis=0)
+    additive = X @ (beta * component_cols["additive_terms"].to_numpy()) * model.y_scale
+    multiplicative = X @ (beta * component_cols["multiplicative_terms"].to_numpy())
+
+    yhat = np.empty(len(df))
+    yhat[df["_row"].to_numpy()] = trend * (1 + multiplicative) + additive
+    forecast = pd.DataFrame({"ds": pd.to_datetime(future_df["ds"]).to_numpy(), "yhat": yhat})
+    if residual_std is not None and residual_std > 0:
+        z = NormalDist().inv_cdf(0.5 + model.interval_width / 2)
+        forecast["yhat_lower"] = forecast["yhat"] - z * residual_std
+        forecast["yhat_upper"] = forecast["yhat"] + z * residual_std
+    return forecast
+
+
+def forecast_prophet(
+    model: "Prophet",
+    future_df: pd.DataFrame,
+    fast: bool = False,
+    residual_std: Optional[float] = None,
+) -> pd.DataFrame:
+    """Generer les previsions Prophet pour un DataFrame futur.
+
+    Args:
+        model: Modele Prophet entraine.
+        future_df: DataFrame futur (``ds`` + regressseurs).
+        fast: Si True, ne calcule que ``ds``/``yhat`` sans echantillonnage
+            d'incertitude ni colonnes de composantes (usage dashboard).
+        residual_std: En mode rapide, ecart-type des residus utilise pour des
+            intervalles gaussiens ``yhat_lower``/``yhat_upper`` (largeur
+            ``model.interval_width``). Ignore si None.
+
+    Returns:
+        DataFrame de previsions (complet, ou reduit en mode rapide).
+    """
     _require_prophet()
+    if fast:
+        return _forecast_point(model, future_df, residual_std=residual_std)
     return model.predict(future_df)
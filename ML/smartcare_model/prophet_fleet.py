@@ -0,0 +1,395 @@
+"""Flotte Prophet: un modele par hopital (et par cible), entraine en parallele."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import joblib
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from smartcare_model.artifacts.metrics_store import METRICS_DB_FILENAME, MetricsStore
+from smartcare_model.artifacts.registry import (
+    TRAINING_LIBRARIES,
+    compute_version,
+    fingerprint_dataframe,
+    library_versions,
+)
+from smartcare_model.config.constants import DEFAULT_HOSPITAL_ID, HOSPITAL_ID_COL
+from smartcare_model.config.paths import ARTIFACTS_DIR
+from smartcare_model.data.loading import load_raw_dataframe
+from smartcare_model.prophet import (
+    _ensure_cmdstan_installed,
+    _fit_prophet_series,
+    _prophet_config,
+    _require_prophet,
+    forecast_prophet,
+    prophet_from_payload,
+)
+
+PROPHET_TARGETS = {
+    "admissions": "nombre_admissions",
+    "urgences": "nombre_passages_urgences",
+}
+FLEET_DIRNAME = "prophet_fleet"
+FLEET_MANIFEST = "manifest.json"
+FLEET_KIND = "prophet_fleet"
+
+
+def fleet_model_path(
+    hospital_id: str,
+    target: str = "admissions",
+    artifacts_dir: Path = ARTIFACTS_DIR,
+) -> Path:
+    """Chemin de l'artefact Prophet d'un couple (hopital, cible).
+
+    Layout partitionne: ``prophet_fleet/hospital_id=<id>/target=<cible>/prophet.joblib``.
+    """
+    return (
+        artifacts_dir
+        / FLEET_DIRNAME
+        / f"{HOSPITAL_ID_COL}={hospital_id}"
+        / f"target={target}"
+        / "prophet.joblib"
+    )
+
+
+def split_by_hospital(raw_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Decouper un DataFrame brut en series par hopital.
+
+    Un DataFrame sans colonne ``hospital_id`` est traite comme la serie
+    unique de ``DEFAULT_HOSPITAL_ID``.
+    """
+    if HOSPITAL_ID_COL not in raw_df.columns:
+        return {DEFAULT_HOSPITAL_ID: raw_df}
+    return {
+        str(hospital_id): group.drop(columns=[HOSPITAL_ID_COL]).reset_index(drop=True)
+        for hospital_id, group in raw_df.groupby(HOSPITAL_ID_COL, sort=True)
+    }
+
+
+def _dump_atomic(payload: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        joblib.dump(payload, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+@contextmanager
+def _manifest_lock(manifest_path: Path) -> Iterator[None]:
+    """Verrou exclusif inter-processus (``manifest.json.lock``) du manifeste.
+
+    Deux executions concurrentes sur des sous-ensembles differents
+    serialisent ainsi leur lecture-fusion-ecriture au lieu de s'ecraser.
+    """
+    lock_path = manifest_path.with_name(f"{manifest_path.name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_manifest(manifest_path: Path, manifest: Dict[str, object]) -> None:
+    tmp_path = manifest_path.with_name(f".{manifest_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _member_version(
+    series_df: pd.DataFrame,
+    target: str,
+    train_ratio: float,
+    tune: bool,
+    param_grid: Optional[List[Dict[str, float | str]]],
+    libraries: Dict[str, Optional[str]],
+) -> str:
+    """Version d'un membre: hash de la serie, des options et des librairies."""
+    return compute_version(
+        fingerprint_dataframe(series_df),
+        {
+            "target": target,
+            "train_ratio": train_ratio,
+            **_prophet_config(tune, param_grid),
+            "libraries": libraries,
+        },
+    )
+
+
+def _train_fleet_member(
+    hospital_id: str,
+    target: str,
+    series_df: pd.DataFrame,
+    train_ratio: float,
+    tune: bool,
+    param_grid: Optional[List[Dict[str, float | str]]],
+    artifacts_dir: Path,
+    version: str,
+) -> Dict[str, object]:
+    """Entrainer un membre de la flotte (execute dans un processus worker).
+
+    Les metriques sont enregistrees depuis le worker dans ``metrics.sqlite``
+    (nom ``<hopital>/<cible>``, ``version`` calculee par ``_member_version``).
+    """
+    fit = _fit_prophet_series(
+        series_df,
+        train_ratio=train_ratio,
+        tune=tune,
+        param_grid=param_grid,
+        target_col=PROPHET_TARGETS[target],
+    )
+    path = fleet_model_path(hospital_id, target, artifacts_dir)
+    _dump_atomic(fit["payload"], path)
+    MetricsStore(artifacts_dir / METRICS_DB_FILENAME).record(
+        FLEET_KIND, version, {f"{hospital_id}/{target}": fit["metrics"]}
+    )
+    return {
+        "hospital_id": hospital_id,
+        "target": target,
+        "version": version,
+        "path": str(path.relative_to(artifacts_dir)),
+        "metrics": fit["metrics"],
+        "params": fit["params"],
+    }
+
+
+def _read_manifest(manifest_path: Path) -> Dict[str, object]:
+    """Manifeste existant (vide si absent ou illisible)."""
+    if not manifest_path.exists():
+        return {}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _merge_manifest(
+    previous: Dict[str, object],
+    targets: List[str],
+    members: List[Dict[str, object]],
+    errors: List[Dict[str, str]],
+    artifacts_dir: Path,
+) -> Dict[str, object]:
+    """Fusionner les membres d'une execution dans le manifeste existant.
+
+    Un membre (hopital, cible) entraine ou en erreur dans cette execution
+    remplace son ancienne entree; les autres membres sont conserves tant que
+    leur modele est present sur disque (execution sur un sous-ensemble).
+    """
+    run_pairs = {(m["hospital_id"], m["target"]) for m in members}
+    run_pairs.update((e["hospital_id"], e["target"]) for e in errors)
+    kept_members = [
+        m
+        for m in previous.get("members", [])
+        if (m["hospital_id"], m["target"]) not in run_pairs and (artifacts_dir / m["path"]).exists()
+    ]
+    kept_errors = [
+        e for e in previous.get("errors", []) if (e["hospital_id"], e["target"]) not in run_pairs
+    ]
+    merged_members = sorted(kept_members + members, key=lambda m: (m["hospital_id"], m["target"]))
+    merged_errors = sorted(kept_errors + errors, key=lambda e: (e["hospital_id"], e["target"]))
+    merged_targets = [t for t in PROPHET_TARGETS if t in set(previous.get("targets", [])) | set(targets)]
+    return {"targets": merged_targets, "members": merged_members, "errors": merged_errors}
+
+
+def train_prophet_fleet(
+    raw_df: Optional[pd.DataFrame] = None,
+    targets: Iterable[str] = ("admissions",),
+    hospital_ids: Optional[Iterable[str]] = None,
+    max_workers: Optional[int] = None,
+    train_ratio: float = 0.8,
+    tune: bool = False,
+    param_grid: Optional[List[Dict[str, float | str]]] = None,
+    artifacts_dir: Path = ARTIFACTS_DIR,
+    force: bool = False,
+) -> Dict[str, object]:
+    """Entrainer un modele Prophet par hopital et par cible dans un pool de processus.
+
+    La version de chaque membre (hash de sa serie, des options Prophet
+    effectives et des versions de librairies) est calculee avant soumission:
+    un membre dont l'entree du manifeste a la meme version et dont le modele
+    est present sur disque n'est pas re-entraine, sauf si ``force`` est vrai.
+
+    Args:
+        raw_df: DataFrame brut multi-hopitaux (charge via ``load_raw_dataframe`` si None).
+        targets: Cibles a entrainer parmi ``PROPHET_TARGETS``.
+        hospital_ids: Sous-ensemble d'hopitaux (tous par defaut).
+        max_workers: Taille du pool (``os.cpu_count()`` par defaut).
+        train_ratio: Ratio du split chronologique par serie.
+        tune: Active la recherche sur grille pour chaque membre.
+        param_grid: Grille optionnelle.
+        artifacts_dir: Dossier racine des artefacts.
+        force: Re-entraine tous les membres demandes, meme inchanges.
+
+    Returns:
+        Manifeste de la flotte: membres et erreurs, cette execution fusionnee
+        avec les membres deja presents (un sous-ensemble d'hopitaux ou de
+        cibles ne retire pas les autres entrees).
+
+    Raises:
+        ValueError: Si une cible ou un hopital demande est inconnu.
+
+    Side Effects:
+        Ecrit chaque modele de maniere atomique et ``prophet_fleet/manifest.json``
+        (fusion sous verrou ``manifest.json.lock``).
+    """
+    _require_prophet()
+    targets = list(targets)
+    unknown = [t for t in targets if t not in PROPHET_TARGETS]
+    if unknown:
+        raise ValueError(f"Cibles Prophet inconnues: {unknown}. Attendu: {list(PROPHET_TARGETS)}")
+
+    if raw_df is None:
+        raw_df = load_raw_dataframe()
+    series = split_by_hospital(raw_df)
+    if hospital_ids is not None:
+        hospital_ids = [str(h) for h in hospital_ids]
+        missing = [h for h in hospital_ids if h not in series]
+        if missing:
+            raise ValueError(f"Hopitaux absents des donnees: {missing}")
+        series = {h: series[h] for h in hospital_ids}
+
+    manifest_path = artifacts_dir / FLEET_DIRNAME / FLEET_MANIFEST
+    existing = {
+        (m["hospital_id"], m["target"]): m for m in _read_manifest(manifest_path).get("members", [])
+    }
+    libraries = library_versions(TRAINING_LIBRARIES + ("prophet", "cmdstanpy"))
+    jobs: List[Tuple[str, str, str]] = []
+    for hospital_id in series:
+        for target in targets:
+            version = _member_version(series[hospital_id], target, train_ratio, tune, param_grid, libraries)
+            previous = existing.get((hospital_id, target))
+            if (
+                not force
+                and previous is not None
+                and previous.get("version") == version
+                and (artifacts_dir / previous["path"]).exists()
+            ):
+                continue
+            jobs.append((hospital_id, target, version))
+    if jobs:
+        _ensure_cmdstan_installed()
+
+    members: List[Dict[str, object]] = []
+    errors: List[Dict[str, str]] = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _train_fleet_member,
+                hospital_id,
+                target,
+                series[hospital_id],
+                train_ratio,
+                tune,
+                param_grid,
+                artifacts_dir,
+                version,
+            ): (hospital_id, target)
+            for hospital_id, target, version in jobs
+        }
+        for future in as_completed(futures):
+            hospital_id, target = futures[future]
+            try:
+                members.append(future.result())
+            except Exception as exc:
+                errors.append({"hospital_id": hospital_id, "target": target, "error": str(exc)})
+
+    with _manifest_lock(manifest_path):
+        manifest = _merge_manifest(_read_manifest(manifest_path), targets, members, errors, artifacts_dir)
+        _write_manifest(manifest_path, manifest)
+    return manifest
+
+
+class ProphetFleet:
+    """Acces paresseux aux modeles de la flotte.
+
+    Les modeles sont deserialises au premier appel de ``get`` puis gardes en
+    memoire; l'acces est protege par un verrou (pages Streamlit multi-threads).
+    """
+
+    def __init__(self, artifacts_dir: Path = ARTIFACTS_DIR):
+        self.artifacts_dir = Path(artifacts_dir)
+        self._models: Dict[Tuple[str, str], Tuple[object, dict]] = {}
+        self._lock = threading.Lock()
+
+    def available(self) -> List[Tuple[str, str]]:
+        """Lister les couples (hopital, cible) presents sur disque."""
+        root = self.artifacts_dir / FLEET_DIRNAME
+        pairs = []
+        for path in sorted(root.glob(f"{HOSPITAL_ID_COL}=*/target=*/prophet.joblib")):
+            hospital_id = path.parent.parent.name.split("=", 1)[1]
+            target = path.parent.name.split("=", 1)[1]
+            pairs.append((hospital_id, target))
+        return pairs
+
+    def get(self, hospital_id: str, target: str = "admissions") -> Tuple[object, dict]:
+        """Retourner ``(modele, payload)`` pour un hopital et une cible.
+
+        Raises:
+            FileNotFoundError: Si le membre n'a pas ete entraine.
+        """
+        key = (str(hospital_id), target)
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None:
+                return cached
+            path = fleet_model_path(key[0], target, self.artifacts_dir)
+            if not path.exists():
+                raise FileNotFoundError(
+                    f"Modele Prophet introuvable pour {key[0]} / {target}: {path}"
+                )
+            payload = joblib.load(path)
+            model, _ = prophet_from_payload(payload)
+            self._models[key] = (model, payload)
+            return model, payload
+
+    def forecast(
+        self,
+        hospital_id: str,
+        future_df: pd.DataFrame,
+        target: str = "admissions",
+        fast: bool = True,
+    ) -> pd.DataFrame:
+        """Prevoir avec le modele d'un hopital (mode point rapide par defaut)."""
+        model, payload = self.get(hospital_id, target)
+        return forecast_prophet(
+            model,
+            future_df,
+            fast=fast,
+            residual_std=payload.get("residual_std"),
+        )
+
+    def clear(self) -> None:
+        """Vider le cache memoire."""
+        with self._lock:
+            self._models.clear()
@@ -0,0 +1,338 @@
+"""Service local de prediction (HTTP asyncio) avec micro-batching.
+
+Le service garde en memoire les donnees, les features, l'index k-NN et les
+modeles. Les requetes concurrentes sont regroupees en micro-lots: une seule
+construction de features et un seul ``predict`` par lot et par modele.
+
+Endpoints::
+
+    POST /predict   {"date": "2026-02-10", "meteo": "Pluie", "event": "Aucun",
+                     "temperature": 4.5, "vacances": 0, "model": "gradient_boosting"}
+    GET  /stats     latences p50/p95/p99 (ms) et tailles de lot
+    GET  /health
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from smartcare_model.artifacts.cache import ModelCache
+from smartcare_model.config.constants import CONFORMAL_DEFAULT_COVERAGE, DEFAULT_MODEL_NAME
+from smartcare_model.config.paths import ARTIFACTS_DIR
+from smartcare_model.data.loading import load_raw_dataframe
+from smartcare_model.features.engineering import build_feature_dataframe
+from smartcare_model.inference.compiled import predict_fast
+from smartcare_model.inference.conformal import ConformalTable, load_conformal_table
+from smartcare_model.inference.predict import prepare_prediction_row
+from smartcare_model.inference.scenarios import build_scenario_features
+from smartcare_model.inference.similarity import SimilarityIndex
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+
+class PredictionService:
+    """Etat resident et micro-batcher des predictions.
+
+    La ligne de base des features et la table conforme sont indexees par
+    snapshot du registre, comme les modeles de ``ModelCache``: apres un
+    re-entrainement, un lot utilise les features, le modele et la table
+    d'une meme version.
+
+    Args:
+        raw_df: Historique brut (``load_raw_dataframe`` par defaut).
+        artifacts_dir: Racine des artefacts.
+        models: Modeles charges au demarrage (les autres sont refuses).
+        k: Nombre de jours similaires pour les lags synthetiques.
+        max_batch: Taille maximale d'un micro-lot.
+        max_wait_ms: Attente maximale pour completer un lot apres la premiere requete.
+        safety_margin: Marge de ``prediction_safe`` sans table conforme.
+        coverage: Couverture des intervalles conformes (``conformal.npz`` de la
+            version courante); ``prediction_safe`` est alors la borne haute.
+            None desactive les intervalles.
+        latency_window: Nombre de latences conservees pour les percentiles.
+    """
+
+    def __init__(
+        self,
+        raw_df: Optional[pd.DataFrame] = None,
+        artifacts_dir: Path = ARTIFACTS_DIR,
+        models: Iterable[str] = (DEFAULT_MODEL_NAME,),
+        k: int = 10,
+        max_batch: int = 64,
+        max_wait_ms: float = 2.0,
+        safety_margin: float = 0.10,
+        coverage: Optional[float] = CONFORMAL_DEFAULT_COVERAGE,
+        latency_window: int = 10000,
+    ):
+        if raw_df is None:
+            raw_df = load_raw_dataframe()
+        self.feature_df = build_feature_dataframe(raw_df)
+        self.index = SimilarityIndex(self.feature_df)
+        self.cache = ModelCache(artifacts_dir)
+        self.models = list(models)
+        self._base_rows: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._conformal: Dict[str, Optional[ConformalTable]] = {}
+        self.k = k
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.safety_margin = safety_margin
+        self.coverage = coverage
+        for name in self.models:
+            self._snapshot_state(name)
+        self._latencies: deque = deque(maxlen=latency_window)
+        self._batch_sizes: deque = deque(maxlen=latency_window)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _snapshot_state(self, name: str):
+        """Modele, features, ligne de base et table conforme d'un meme snapshot.
+
+        Les entrees d'anciens snapshots sont oubliees au changement de version.
+        """
+        model, feature_cols, snapshot_dir = self.cache.get_snapshot(name)
+        snapshot = str(snapshot_dir)
+        base_row = self._base_rows.get((snapshot, name))
+        if base_row is None:
+            base_row = prepare_prediction_row(self.feature_df, feature_cols)
+            self._base_rows = {key: row for key, row in self._base_rows.items() if key[0] == snapshot}
+            self._base_rows[(snapshot, name)] = base_row
+        if snapshot not in self._conformal:
+            conformal = load_conformal_table(snapshot_dir) if self.coverage is not None else None
+            self._conformal = {snapshot: conformal}
+        return model, feature_cols, base_row, self._conformal[snapshot]
+
+    @property
+    def conformal(self) -> Optional[ConformalTable]:
+        """Table conforme de la version courante (None si desactivee ou absente)."""
+        return self._snapshot_state(self.models[0])[3]
+
+    def score(self, payloads: List[dict]) -> List[dict]:
+        """Predire un lot de requetes (synchrone).
+
+        Les requetes sont groupees par modele: une matrice de features et un
+        appel ``predict`` par modele.
+
+        Raises:
+            ValueError: Si un modele demande n'est pas charge ou si un
+                scenario est invalide.
+        """
+        by_model: Dict[str, List[int]] = {}
+        for i, payload in enumerate(payloads):
+            name = payload.get("model", self.models[0])
+            if name not in self.models:
+                raise ValueError(f"Modele non charge: {name}. Disponibles: {self.models}")
+            by_model.setdefault(name, []).append(i)
+
+        results: List[Optional[dict]] = [None] * len(payloads)
+        for name, positions in by_model.items():
+            model, feature_cols, base_row, conformal = self._snapshot_state(name)
+            scenarios = pd.DataFrame([payloads[i] for i in positions])
+            X = build_scenario_features(
+                self.feature_df,
+                feature_cols,
+                scenarios,
+                index=self.index,
+                k=self.k,
+                base_row=base_row,
+            )
+            preds = predict_fast(model, X[feature_cols])
+            bounds = {"prediction_safe": preds * (1 + self.safety_margin)}
+            if conformal is not None and name in conformal.models:
+                bounds = conformal.interval(X["date"], preds, model_name=name, coverage=self.coverage)
+            for i, (pos, date, pred) in enumerate(zip(positions, X["date"], preds)):
+                results[pos] = {
+                    "date": pd.Timestamp(date).date().isoformat(),
+                    "model": name,
+                    "prediction": float(pred),
+                    **{key: float(values[i]) for key, values in bounds.items()},
+                }
+        return results
+
+    async def predict(self, payload: dict) -> dict:
+        """Soumettre une requete au micro-batcher et attendre son resultat."""
+        if self._queue is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((payload, future, time.perf_counter()))
+        return await future
+
+    def start(self) -> None:
+        """Demarrer la tache de micro-batching sur la boucle courante."""
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.get_running_loop().create_task(self._batch_loop())
+
+    async def stop(self) -> None:
+        """Arreter la tache de micro-batching."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _collect(self) -> List[Tuple[dict, asyncio.Future, float]]:
+        batch = [await self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            payloads = [item[0] for item in batch]
+            try:
+                # Hors de la boucle: les requetes suivantes s'accumulent pendant le calcul.
+                results = await loop.run_in_executor(None, self.score, payloads)
+            except Exception:
+                # Un scenario invalide ne doit pas faire echouer tout le lot.
+                results = []
+                for payload in payloads:
+                    try:
+                        results.append(self.score([payload])[0])
+                    except Exception as exc:
+                        results.append(exc)
+            done = time.perf_counter()
+            self._batch_sizes.append(len(batch))
+            for (_, future, submitted), result in zip(batch, results):
+                self._latencies.append(done - submitted)
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result({**result, "batch_size": len(batch)})
+
+    def stats(self) -> Dict[str, float]:
+        """Percentiles de latence (ms, file d'attente incluse) et tailles de lot."""
+        if not self._latencies:
+            return {"requests": 0, "batches": 0}
+        latencies = np.asarray(self._latencies) * 1000
+        sizes = np.asarray(self._batch_sizes)
+        return {
+            "requests": int(latencies.size),
+            "batches": int(sizes.size),
+            "mean_batch_size": float(sizes.mean()),
+            "max_batch_size": int(sizes.max()),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+        }
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def _response(status: int, payload: dict, keep_alive: bool) -> bytes:
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def make_handler(service: PredictionService):
+    """Construire le handler de connexion ``asyncio`` (HTTP/1.1, keep-alive)."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError):
+                    writer.write(_response(400, {"error": "Requete HTTP invalide."}, False))
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if method == "POST" and path == "/predict":
+                    try:
+                        status, payload = 200, await service.predict(json.loads(body or b"{}"))
+                    except (ValueError, KeyError, TypeError) as exc:
+                        status, payload = 400, {"error": str(exc)}
+                    except Exception as exc:
+                        status, payload = 500, {"error": str(exc)}
+                elif method == "GET" and path == "/stats":
+                    status, payload = 200, service.stats()
+                elif method == "GET" and path == "/health":
+                    status, payload = 200, {"status": "ok", "models": service.models}
+                else:
+                    status, payload = 404, {"error": f"{method} {path} inconnu."}
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def start_server(
+    service: PredictionService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: Optional[str] = None,
+) -> asyncio.AbstractServer:
+    """Demarrer le serveur HTTP (TCP ou socket Unix) et le micro-batcher."""
+    service.start()
+    handler = make_handler(service)
+    if unix_path is not None:
+        return await asyncio.start_unix_server(handler, path=unix_path)
+    return await asyncio.start_server(handler, host=host, port=port)
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    unix_path: Optional[str] = None,
+    **service_kwargs,
+) -> None:
+    """Charger l'etat et servir jusqu'a interruption (bloquant)."""
+    service = PredictionService(**service_kwargs)
+
+    async def _main() -> None:
+        server = await start_server(service, host=host, port=port, unix_path=unix_path)
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(_main())
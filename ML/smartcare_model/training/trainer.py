@@ -1,17 +1,41 @@
 """Pipeline d'entrainement des modeles de prediction."""
 
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
+import json
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+from smartcare_model.artifacts.registry import (
+    MODELS_KIND,
+    compute_version,
+    fingerprint_dataframe,
+    library_versions,
+    matching_version,
+    run_version,
+    set_current,
+    version_dir,
+)
+from smartcare_model.artifacts.metrics_store import METRICS_DB_FILENAME, MetricsStore
 from smartcare_model.artifacts.store import save_artifacts
-from smartcare_model.config.constants import TARGET_COL
+from smartcare_model.config.constants import (
+    BOOTSTRAP_CONFIDENCE,
+    BOOTSTRAP_SAMPLES,
+    CONFORMAL_HORIZON_EDGES,
+    CONFORMAL_LEVELS,
+    CONFORMAL_MIN_CELL,
+    TARGET_COL,
+)
 from smartcare_model.config.paths import ARTIFACTS_DIR
 from smartcare_model.data.loading import load_raw_dataframe
-from smartcare_model.evaluation.metrics import evaluate
+from smartcare_model.evaluation.metrics import evaluate_interval, pinball_loss
+from smartcare_model.evaluation.scoring import score_models
 from smartcare_model.features.engineering import build_feature_dataframe
 from smartcare_model.features.selection import select_feature_columns
-from smartcare_model.models.registry import build_models
+from smartcare_model.inference.conformal import CONFORMAL_FILENAME, ConformalTable
+from smartcare_model.models.registry import build_models, build_quantile_models
 
 
 def _train_test_split(
@@ -19,15 +43,24 @@ def _train_test_split(
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Effectuer un split chronologique train/test.
 
+    La coupure se fait sur une date commune: en multi-hopitaux, tous les
+    hopitaux partagent la meme frontiere temporelle (pas de fuite du futur
+    d'un site vers le passe d'un autre). Sur une serie unique a dates
+    uniques, le resultat est identique a un split positionnel.
+
     Args:
-        df: DataFrame de features trie par date.
+        df: DataFrame de features trie par date (par hopital puis date).
         train_ratio: Ratio utilise pour l'entrainement (debut de serie).
 
     Returns:
         Tuple (train_df, test_df).
     """
-    split_idx = int(len(df) * train_ratio)
-    return df.iloc[:split_idx], df.iloc[split_idx:]
+    dates = np.sort(df["date"].unique())
+    if len(dates) == 0:
+        return df.iloc[:0], df.iloc[:0]
+    cutoff = dates[min(int(len(dates) * train_ratio), len(dates) - 1)]
+    is_train = (df["date"] < cutoff).to_numpy()
+    return df[is_train], df[~is_train]
 
 
 def _build_baselines(test_df: pd.DataFrame) -> Dict[str, pd.Series]:
@@ -56,22 +89,68 @@ def _build_baselines(test_df: pd.DataFrame) -> Dict[str, pd.Series]:
 def train_models(
     train_ratio: float = 0.8,
     artifacts_dir=ARTIFACTS_DIR,
+    raw_df: Optional[pd.DataFrame] = None,
+    force: bool = False,
 ) -> Dict[str, Dict[str, float]]:
     """Entrainer les modeles, evaluer, et persister les artefacts.
 
+    Avec une colonne ``hospital_id``, l'entrainement est poole sur tous les
+    hopitaux (features ``hosp_<id>`` incluses). La version du registre est
+    un hash des donnees brutes, de la liste de features, des hyperparametres
+    et des versions de librairies: si elle existe deja, elle redevient
+    ``CURRENT`` et ses metriques sont renvoyees sans re-entrainement.
+    Les gradient boosting quantiles (``QUANTILE_LEVELS``) sont entraines
+    sur le meme split; leur couverture test est dans ``gradient_boosting_interval``.
+    Les residus test des modeles ponctuels alimentent la table split-conforme
+    ``conformal.npz`` (``ConformalTable``). Baselines et modeles sont scores
+    ensemble par ``score_models``, avec intervalles bootstrap
+    (``<metrique>_ci_low`` / ``_ci_high``).
+
     Args:
         train_ratio: Ratio du dataset utilise pour l'entrainement.
         artifacts_dir: Dossier de sortie des artefacts.
+        raw_df: DataFrame brut optionnel (sinon ``load_raw_dataframe``).
+        force: Re-entraine meme si la version existe; le resultat est publie
+            sous un nouvel identifiant (``run_version``) puis active.
 
     Returns:
         Dictionnaire des metriques par modele ou baseline.
 
     Side Effects:
-        Ecrit metrics, feature_columns et modeles sur disque.
+        Publie metrics, feature_columns, modeles et ``conformal.npz`` dans le
+        registre et enregistre les metriques dans ``metrics.sqlite``.
     """
-    raw_df = load_raw_dataframe()
+    if raw_df is None:
+        raw_df = load_raw_dataframe()
+    artifacts_dir = Path(artifacts_dir)
+    models = build_models()
+    quantile_models = build_quantile_models()
     feature_df = build_feature_dataframe(raw_df)
     feature_cols = select_feature_columns(feature_df)
+
+    data_fingerprint = fingerprint_dataframe(raw_df)
+    params = {
+        "train_ratio": train_ratio,
+        "feature_cols": feature_cols,
+        "models": {name: model.get_params() for name, model in models.items()},
+        "quantile_models": {name: model.get_params() for name, model in quantile_models.items()},
+        "conformal": {
+            "levels": list(CONFORMAL_LEVELS),
+            "horizon_edges": list(CONFORMAL_HORIZON_EDGES),
+            "min_cell": CONFORMAL_MIN_CELL,
+        },
+        "bootstrap": {"n_boot": BOOTSTRAP_SAMPLES, "confidence": BOOTSTRAP_CONFIDENCE, "seed": 0},
+        "libraries": library_versions(),
+    }
+    version = compute_version(data_fingerprint, params)
+    existing = None if force else matching_version(MODELS_KIND, version, artifacts_dir)
+    if existing is not None:
+        set_current(MODELS_KIND, existing, artifacts_dir)
+        with open(version_dir(MODELS_KIND, existing, artifacts_dir) / "metrics.json", "r") as f:
+            return json.load(f)
+    if force:
+        version = run_version(version)
+
     feature_df = feature_df.dropna(subset=[TARGET_COL] + feature_cols).reset_index(drop=True)
 
     train_df, test_df = _train_test_split(feature_df, train_ratio=train_ratio)
@@ -79,19 +158,52 @@ def train_models(
     X_train, y_train = train_df[feature_cols], train_df[TARGET_COL]
     X_test, y_test = test_df[feature_cols], test_df[TARGET_COL]
 
-    results: Dict[str, Dict[str, float]] = {}
-    baselines = _build_baselines(test_df)
-    for name, preds in baselines.items():
-        results[name] = evaluate(y_test, preds)
-
-    models = build_models()
+    predictions: Dict[str, np.ndarray] = {
+        name: preds.to_numpy(dtype=float) for name, preds in _build_baselines(test_df).items()
+    }
 
     trained_models: Dict[str, object] = {}
+    residuals: Dict[str, np.ndarray] = {}
     for name, model in models.items():
         model.fit(X_train, y_train)
         preds = model.predict(X_test)
-        results[name] = evaluate(y_test, preds)
+        predictions[name] = preds
         trained_models[name] = model
+        residuals[name] = y_test.to_numpy(dtype=float) - preds
 
-    save_artifacts(feature_cols, results, trained_models, artifacts_dir=artifacts_dir)
+    quantile_preds: Dict[float, np.ndarray] = {}
+    for name, model in quantile_models.items():
+        model.fit(X_train, y_train)
+        preds = model.predict(X_test)
+        predictions[name] = preds
+        trained_models[name] = model
+        quantile_preds[model.alpha] = preds
+
+    results = score_models(
+        y_test.to_numpy(dtype=float),
+        predictions,
+        n_boot=BOOTSTRAP_SAMPLES,
+        confidence=BOOTSTRAP_CONFIDENCE,
+    )
+    for name, model in quantile_models.items():
+        results[name]["pinball"] = pinball_loss(y_test, predictions[name], model.alpha)
+    if len(quantile_preds) >= 2:
+        lower, upper = min(quantile_preds), max(quantile_preds)
+        results["gradient_boosting_interval"] = {
+            **evaluate_interval(y_test, quantile_preds[lower], quantile_preds[upper]),
+            "nominal": upper - lower,
+        }
+
+    conformal = ConformalTable.from_residuals(residuals, test_df["date"], train_end=train_df["date"].max())
+
+    save_artifacts(
+        feature_cols,
+        results,
+        trained_models,
+        version,
+        artifacts_dir=artifacts_dir,
+        manifest={"data_fingerprint": data_fingerprint, "params": params, "n_rows": len(raw_df)},
+        extra_files={CONFORMAL_FILENAME: conformal.save},
+    )
+    MetricsStore(artifacts_dir / METRICS_DB_FILENAME).record(MODELS_KIND, version, results)
     return results
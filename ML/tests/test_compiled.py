@@ -0,0 +1,106 @@
+"""Equivalence du predicteur compile avec ``model.predict`` de sklearn."""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+
+from smartcare_model.inference.compiled import (
+    COMPILED_MAX_ROWS,
+    CompiledTreeEnsemble,
+    attach_compiled,
+    compile_tree_ensemble,
+    predict_fast,
+    predict_many,
+    save_compiled,
+)
+
+N_FEATURES = 6
+ROW_COUNTS = (1, COMPILED_MAX_ROWS, COMPILED_MAX_ROWS + 1)
+
+
+def _training_data(with_nan: bool):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, N_FEATURES))
+    y = 3 * X[:, 0] - 2 * X[:, 1] ** 2 + np.sin(X[:, 2]) + rng.normal(scale=0.1, size=400)
+    if with_nan:
+        X[rng.random(400) < 0.2, 1] = np.nan
+        y = np.where(np.isnan(X[:, 1]), y + 5.0, y)
+    return X, y
+
+
+def _rows(n_rows: int, with_nan: bool):
+    rng = np.random.default_rng(n_rows)
+    X = rng.normal(size=(n_rows, N_FEATURES))
+    if with_nan:
+        X[::2, 1] = np.nan
+    return X
+
+
+@pytest.fixture(scope="module")
+def models():
+    X, y = _training_data(with_nan=False)
+    X_nan, y_nan = _training_data(with_nan=True)
+    return {
+        "random_forest": RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0).fit(X, y),
+        "random_forest_nan": RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0).fit(
+            X_nan, y_nan
+        ),
+        "gradient_boosting": GradientBoostingRegressor(n_estimators=30, max_depth=3, random_state=0).fit(X, y),
+        "gradient_boosting_q90": GradientBoostingRegressor(
+            loss="quantile", alpha=0.9, n_estimators=30, max_depth=3, random_state=0
+        ).fit(X, y),
+    }
+
+
+def test_nan_model_uses_missing_go_to_left(models):
+    trees = [est.tree_ for est in models["random_forest_nan"].estimators_]
+    assert any(tree.missing_go_to_left[tree.children_left != -1].any() for tree in trees)
+
+
+@pytest.mark.parametrize("n_rows", ROW_COUNTS)
+@pytest.mark.parametrize(
+    "name", ["random_forest", "random_forest_nan", "gradient_boosting", "gradient_boosting_q90"]
+)
+def test_compiled_predict_matches_sklearn(models, name, n_rows):
+    model = models[name]
+    X = _rows(n_rows, with_nan=name.endswith("_nan"))
+    expected = model.predict(X)
+
+    compiled = compile_tree_ensemble(model)
+    assert compiled is not None
+    np.testing.assert_array_equal(compiled.predict(X), expected)
+    np.testing.assert_array_equal(predict_fast(model, X), expected)
+
+
+@pytest.mark.parametrize("n_rows", ROW_COUNTS)
+@pytest.mark.parametrize("with_nan", [False, True])
+def test_predict_many_matches_sklearn(models, n_rows, with_nan):
+    if with_nan:
+        names = ["random_forest_nan", "random_forest"]
+    else:
+        names = ["random_forest", "gradient_boosting", "gradient_boosting_q90"]
+    selected = {name: models[name] for name in names}
+    X = _rows(n_rows, with_nan=with_nan)
+
+    predictions = predict_many(selected, X)
+
+    assert set(predictions) == set(selected)
+    for name, model in selected.items():
+        np.testing.assert_array_equal(predictions[name], model.predict(X))
+
+
+@pytest.mark.parametrize("name", ["random_forest_nan", "gradient_boosting_q90"])
+def test_saved_arrays_are_memory_mapped_and_equivalent(models, name, tmp_path):
+    model = models[name]
+    assert save_compiled(model, tmp_path / "model.trees")
+    X = _rows(COMPILED_MAX_ROWS, with_nan=name.endswith("_nan"))
+
+    loaded = CompiledTreeEnsemble.load(tmp_path / "model.trees")
+
+    assert isinstance(loaded.threshold, np.memmap)
+    np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+    clone = type(model)(**model.get_params()).fit(*_training_data(with_nan=name.endswith("_nan")))
+    assert attach_compiled(clone, tmp_path / "model.trees") is not None
+    assert compile_tree_ensemble(clone) is not None
+    np.testing.assert_array_equal(predict_fast(clone, X), clone.predict(X))
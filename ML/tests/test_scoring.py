@@ -0,0 +1,56 @@
+"""Scoring vectorise et intervalles bootstrap."""
+
+import numpy as np
+import pytest
+
+from smartcare_model.evaluation import scoring
+from smartcare_model.evaluation.metrics import evaluate
+from smartcare_model.evaluation.scoring import bootstrap_metrics, score_matrix
+
+
+def _data(n: int = 500, n_models: int = 3):
+    rng = np.random.default_rng(0)
+    y_true = rng.normal(100, 10, n)
+    y_true[::50] = 0.0
+    y_pred = y_true + rng.normal(0, 5, (n_models, n))
+    return y_true, y_pred
+
+
+def test_score_matrix_matches_evaluate():
+    y_true, y_pred = _data()
+    scores = score_matrix(y_true, y_pred)
+    for row in range(y_pred.shape[0]):
+        expected = evaluate(y_true, y_pred[row])
+        for metric in scoring.METRIC_NAMES:
+            assert scores[metric][row] == pytest.approx(expected[metric], rel=1e-12)
+
+
+def test_bootstrap_depends_only_on_seed(monkeypatch):
+    y_true, y_pred = _data()
+    # Lots de 16 reechantillonnages: plusieurs lots par thread.
+    monkeypatch.setattr(scoring, "_BOOTSTRAP_MAX_CELLS", 16 * y_true.size)
+
+    reference = bootstrap_metrics(y_true, y_pred, n_boot=300, seed=7, n_jobs=1)
+    for n_jobs in (2, 3, 4, None):
+        result = bootstrap_metrics(y_true, y_pred, n_boot=300, seed=7, n_jobs=n_jobs)
+        for metric in scoring.METRIC_NAMES:
+            np.testing.assert_array_equal(result[metric], reference[metric])
+
+    other = bootstrap_metrics(y_true, y_pred, n_boot=300, seed=8, n_jobs=1)
+    assert not np.array_equal(other["mae"], reference["mae"])
+
+
+def test_bootstrap_interval_brackets_point_estimate():
+    y_true, y_pred = _data()
+    scores = score_matrix(y_true, y_pred)
+    intervals = bootstrap_metrics(y_true, y_pred, n_boot=200, seed=0)
+    for metric in scoring.METRIC_NAMES:
+        assert np.all(intervals[metric][:, 0] <= scores[metric])
+        assert np.all(scores[metric] <= intervals[metric][:, 1])
+
+
+@pytest.mark.parametrize("n", [1, 1_000, 100_000, 440_000, 10_000_000])
+def test_chunk_size_bounds_weight_matrix(n):
+    chunk = scoring._chunk_size(n)
+    assert 1 <= chunk <= scoring._BOOTSTRAP_CHUNK
+    assert chunk * n <= max(scoring._BOOTSTRAP_MAX_CELLS, n)
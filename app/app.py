@@ -528,16 +528,31 @@ st.markdown("""
 
 pd.options.mode.string_storage = "python"
 
-# Chargement des données
-@st.cache_data
-def load_data():
-    """Charge les données hospitalières"""
+def _data_path():
+    """Chemin du CSV de données utilisé par le dashboard."""
     base_path = Path(__file__).parent.parent
     candidates = [
         base_path / "data" / "raw" / "Jeu de données - Smart Care - daily_hospital_context_2022-2026_generated.csv",
         base_path / "data" / "raw" / "Jeu de données - Smart Care - daily_hospital_context_2022-2024_generated.csv",
     ]
-    data_path = next((p for p in candidates if p.exists()), candidates[-1])
+    return next((p for p in candidates if p.exists()), candidates[-1])
+
+
+def _data_version():
+    """Version des données : nom, taille et date de modification du CSV."""
+    data_path = _data_path()
+    try:
+        stat = data_path.stat()
+        return f"{data_path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+    except OSError:
+        return data_path.name
+
+
+# Chargement des données
+@st.cache_data
+def load_data():
+    """Charge les données hospitalières"""
+    data_path = _data_path()
     df = pd.read_csv(
         data_path,
         decimal=',',
@@ -565,6 +580,14 @@ def load_data():
     
     return df
 
+
+@st.cache_resource
+def load_dashboard_cube(data_version, _df):
+    """Cube d'agrégats des pages Accueil / Analyse (un par version des données)."""
+    from pages.dashboard_cube import load_or_build_cube
+
+    return load_or_build_cube(_df, data_version, Path(__file__).parent.parent / "data" / "cache")
+
 # Chargement du modèle ML (si disponible)
 @st.cache_resource
 def load_ml_model():
@@ -577,11 +600,12 @@ def load_ml_model():
             from smartcare_model import (
                 load_raw_dataframe,
                 build_feature_dataframe,
-                load_artifacts,
+                get_model_cache,
             )
             raw_df = load_raw_dataframe()
             feature_df = build_feature_dataframe(raw_df)
-            model, feature_cols = load_artifacts()
+            # Cache partage avec les pages: chaque modele n'est charge qu'une fois
+            model, feature_cols = get_model_cache().get()
             
             print(f"[DEBUG] Modèle chargé: type={type(model)}, feature_cols={len(feature_cols)} features")
             
@@ -638,6 +662,7 @@ if not st.session_state.data_loaded:
         st.session_state.data_loaded = True
 
 df = st.session_state.df
+cube = load_dashboard_cube(_data_version(), df)
 
 # Initialiser la page active dans session_state
 if 'active_page' not in st.session_state:
@@ -717,7 +742,7 @@ if page == "Accueil":
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        avg_occupation = df['taux_occupation_lits'].mean() * 100
+        avg_occupation = cube.mean('taux_occupation_lits') * 100
         metric_with_info(
             "Occupation Moyenne",
             "Moyenne du taux d'occupation des lits sur toute la période. Delta = différence entre les 7 derniers jours et la semaine précédente.",
@@ -726,7 +751,7 @@ if page == "Accueil":
         )
     
     with col2:
-        avg_admissions = df['nombre_admissions'].mean()
+        avg_admissions = cube.mean('nombre_admissions')
         metric_with_info(
             "Admissions/Jour",
             "Moyenne des admissions quotidiennes sur toute la période. Delta = évolution semaine N vs N-1.",
@@ -735,7 +760,7 @@ if page == "Accueil":
         )
     
     with col3:
-        avg_urgences = df['nombre_passages_urgences'].mean()
+        avg_urgences = cube.mean('nombre_passages_urgences')
         metric_with_info(
             "Urgences/Jour",
             "Moyenne des passages aux urgences par jour. Delta = évolution semaine N vs N-1.",
@@ -744,7 +769,7 @@ if page == "Accueil":
         )
     
     with col4:
-        avg_personnel = df['taux_couverture_personnel'].mean() * 100
+        avg_personnel = cube.mean('taux_couverture_personnel') * 100
         metric_with_info(
             "Couverture Personnel",
             "Moyenne du taux de couverture du personnel. Delta = évolution semaine N vs N-1.",
@@ -764,11 +789,7 @@ if page == "Accueil":
             "Somme mensuelle des admissions et des passages aux urgences.",
             heading="###",
         )
-        df_monthly = df.groupby(df['date'].dt.to_period('M')).agg({
-            'nombre_admissions': 'sum',
-            'nombre_passages_urgences': 'sum'
-        }).reset_index()
-        df_monthly['date'] = df_monthly['date'].dt.to_timestamp()
+        df_monthly = cube.monthly(['nombre_admissions', 'nombre_passages_urgences'], how='sum')
         
         fig = go.Figure()
         fig.add_trace(go.Scatter(
@@ -803,12 +824,9 @@ if page == "Accueil":
             "Moyenne mensuelle du taux d'occupation des lits (en %).",
             heading="###",
         )
-        df['occupation_pct'] = df['taux_occupation_lits'] * 100
         # Agrégation mensuelle pour une meilleure lisibilité
-        df_monthly_occupation = df.groupby(df['date'].dt.to_period('M')).agg({
-            'occupation_pct': 'mean'
-        }).reset_index()
-        df_monthly_occupation['date'] = df_monthly_occupation['date'].dt.to_timestamp()
+        df_monthly_occupation = cube.monthly('taux_occupation_lits', how='mean')
+        df_monthly_occupation['occupation_pct'] = df_monthly_occupation['taux_occupation_lits'] * 100
         
         fig = go.Figure()
         fig.add_trace(go.Scatter(
@@ -917,8 +935,10 @@ elif page == "Analyse":
     if len(date_range) == 2:
         mask = (df['date'] >= pd.to_datetime(date_range[0])) & (df['date'] <= pd.to_datetime(date_range[1]))
         df_filtered = df[mask].copy()
+        cube_filter = {'start': date_range[0], 'end': date_range[1]}
     else:
         df_filtered = df.copy()
+        cube_filter = {}
     
     saison_options = sorted(df["saison"].dropna().unique().tolist())
     saison_filter = st.sidebar.multiselect(
@@ -929,6 +949,7 @@ elif page == "Analyse":
     
     if saison_filter:
         df_filtered = df_filtered[df_filtered['saison'].isin(saison_filter)]
+        cube_filter['seasons'] = saison_filter
     
     # Onglets d'analyse
     tab1, tab2, tab3, tab4 = st.tabs([
@@ -958,11 +979,11 @@ elif page == "Analyse":
         )
         
         if granularity == 'Hebdomadaire':
-            df_agg = df_filtered.set_index('date').resample('W')[metric].mean().reset_index()
+            df_agg = cube.timeseries(metric, 'W', **cube_filter)
         elif granularity == 'Mensuel':
-            df_agg = df_filtered.set_index('date').resample('ME')[metric].mean().reset_index()
+            df_agg = cube.timeseries(metric, 'M', **cube_filter)
         else:
-            df_agg = df_filtered[['date', metric]].copy()
+            df_agg = cube.timeseries(metric, 'D', **cube_filter)
         
         fig = px.line(
             df_agg,
@@ -989,7 +1010,7 @@ elif page == "Analyse":
                 "Moyenne de l'indicateur par jour de la semaine.",
                 heading="####",
             )
-            df_dow = df_filtered.groupby('jour_semaine')[metric].mean().reset_index()
+            df_dow = cube.by('jour_semaine', metric, **cube_filter)
             
             jour_order = ['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche']
             df_dow['jour_semaine'] = pd.Categorical(df_dow['jour_semaine'], categories=jour_order, ordered=True)
@@ -1011,7 +1032,7 @@ elif page == "Analyse":
                 "Moyenne de l'indicateur par saison.",
                 heading="####",
             )
-            df_season = df_filtered.groupby('saison')[metric].mean().reset_index()
+            df_season = cube.by('saison', metric, **cube_filter)
             
             fig = px.bar(
                 df_season,
@@ -1036,7 +1057,7 @@ elif page == "Analyse":
             'temperature_moyenne', 'lits_occupes'
         ]
         
-        corr_matrix = df_filtered[numeric_cols].corr()
+        corr_matrix = cube.corr(numeric_cols, **cube_filter)
         
         fig = go.Figure(data=go.Heatmap(
             z=corr_matrix.values,
@@ -1115,10 +1136,11 @@ elif page == "Analyse":
                 "Moyennes par type de météo.",
                 heading="####",
             )
-            df_meteo = df_filtered.groupby('meteo_principale').agg({
-                'nombre_passages_urgences': 'mean',
-                'nombre_admissions': 'mean'
-            }).reset_index()
+            df_meteo = cube.by(
+                'meteo_principale',
+                ['nombre_passages_urgences', 'nombre_admissions'],
+                **cube_filter
+            )
             
             fig = px.bar(
                 df_meteo,
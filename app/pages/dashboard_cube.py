@@ -0,0 +1,284 @@
+"""
+Cube d'agrégats pour les pages Accueil et Analyse.
+
+Le cube est matérialisé au grain jour : dates triées, matrice des indicateurs
+et codes entiers des dimensions (saison, jour de semaine, météo, semaine,
+mois). Un filtre de dates est une tranche (recherche dichotomique), un filtre
+de saisons un masque sur les codes, et chaque agrégat (hebdomadaire, mensuel,
+par jour de semaine, saison ou météo) un ``np.bincount`` sur la tranche.
+Les résultats sont mémorisés par filtre : un rerun Streamlit avec les mêmes
+filtres est une simple lecture de dictionnaire.
+
+Le cube est construit une fois par version des données et mis en cache sur
+disque (``data/cache/dashboard_cube_<version>.npz``) ; la mémoire est gérée
+par ``st.cache_resource`` dans app.py.
+"""
+
+import hashlib
+import os
+import threading
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CUBE_FORMAT_VERSION = 1
+CUBE_METRICS = [
+    "nombre_admissions",
+    "nombre_passages_urgences",
+    "nombre_hospitalisations",
+    "nombre_sorties",
+    "lits_occupes",
+    "taux_occupation_lits",
+    "taux_couverture_personnel",
+    "temperature_moyenne",
+]
+CUBE_DIMENSIONS = ["saison", "jour_semaine", "meteo_principale"]
+_MEMO_MAX_ENTRIES = 256
+
+
+class DashboardCube:
+    """Indicateurs journaliers + codes de dimensions, avec agrégats mémorisés."""
+
+    def __init__(self, days, values, metrics, dimensions):
+        self.days = np.asarray(days, dtype="datetime64[D]")
+        self.values = np.asarray(values, dtype=float)
+        self.metrics = list(metrics)
+        # {dimension: (codes int64, -1 = valeur manquante ; libellés triés)}
+        self.dimensions = dimensions
+        self._metric_index = {name: i for i, name in enumerate(self.metrics)}
+        day_numbers = self.days.astype(np.int64)
+        self._week_codes = (day_numbers + 3) // 7  # semaines du lundi au dimanche
+        self._month_codes = self.days.astype("datetime64[M]").astype(np.int64)
+        # Le cube est partagé entre les threads Streamlit (st.cache_resource)
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "DashboardCube":
+        """Construit le cube depuis le DataFrame du dashboard (trié par date)."""
+        df = df.sort_values("date", kind="stable")
+        metrics = [col for col in CUBE_METRICS if col in df.columns]
+        dimensions = {}
+        for col in CUBE_DIMENSIONS:
+            if col in df.columns:
+                codes, labels = pd.factorize(df[col], sort=True)
+                dimensions[col] = (codes.astype(np.int64), [str(label) for label in labels])
+        return cls(
+            df["date"].to_numpy().astype("datetime64[D]"),
+            df[metrics].to_numpy(dtype=float),
+            metrics,
+            dimensions,
+        )
+
+    def save(self, path: Path) -> None:
+        """Écrit le cube dans un ``.npz`` (fichier temporaire puis renommage)."""
+        arrays = {
+            "days": self.days,
+            "values": self.values,
+            "metrics": np.asarray(self.metrics),
+            "dimensions": np.asarray(list(self.dimensions)),
+        }
+        for name, (codes, labels) in self.dimensions.items():
+            arrays[f"codes__{name}"] = codes
+            arrays[f"labels__{name}"] = np.asarray(labels)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: Path) -> "DashboardCube":
+        """Relit un cube écrit par ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            dimensions = {
+                str(name): (data[f"codes__{name}"], [str(label) for label in data[f"labels__{name}"]])
+                for name in data["dimensions"]
+            }
+            return cls(data["days"], data["values"], [str(m) for m in data["metrics"]], dimensions)
+
+    # ------------------------------------------------------------------
+    # Sélection et agrégation
+    # ------------------------------------------------------------------
+
+    def _memoized(self, key, compute):
+        with self._memo_lock:
+            value = self._memo.get(key)
+        if value is None:
+            value = compute()
+            with self._memo_lock:
+                if len(self._memo) >= _MEMO_MAX_ENTRIES:
+                    self._memo.clear()
+                self._memo[key] = value
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    @staticmethod
+    def _filter_key(start, end, seasons):
+        start = None if start is None else pd.Timestamp(start).date().isoformat()
+        end = None if end is None else pd.Timestamp(end).date().isoformat()
+        seasons = None if seasons is None else tuple(sorted(str(s) for s in seasons))
+        return start, end, seasons
+
+    def rows(self, start=None, end=None, seasons=None) -> np.ndarray:
+        """Indices des jours dans [start, end] (inclus) et dans ``seasons``."""
+        lo = 0 if start is None else np.searchsorted(self.days, np.datetime64(pd.Timestamp(start).date(), "D"), "left")
+        hi = len(self.days) if end is None else np.searchsorted(self.days, np.datetime64(pd.Timestamp(end).date(), "D"), "right")
+        rows = np.arange(lo, hi)
+        if seasons is not None and "saison" in self.dimensions:
+            codes, labels = self.dimensions["saison"]
+            wanted = [labels.index(s) for s in seasons if s in labels]
+            rows = rows[np.isin(codes[rows], wanted)]
+        return rows
+
+    def _sums(self, codes, rows, metrics, n_groups):
+        """Sommes (NaN ignorés), nombre de valeurs et nombre de lignes par groupe."""
+        block = self.values[np.ix_(rows, [self._metric_index[m] for m in metrics])]
+        valid = ~np.isnan(block)
+        filled = np.where(valid, block, 0.0)
+        sums = np.column_stack(
+            [np.bincount(codes, weights=filled[:, j], minlength=n_groups) for j in range(len(metrics))]
+        )
+        counts = np.column_stack(
+            [np.bincount(codes, weights=valid[:, j], minlength=n_groups) for j in range(len(metrics))]
+        )
+        return sums, counts, np.bincount(codes, minlength=n_groups)
+
+    @staticmethod
+    def _finish(sums, counts, how):
+        if how == "sum":
+            return sums
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    def timeseries(self, metrics, granularity="D", start=None, end=None, seasons=None, how="mean") -> pd.DataFrame:
+        """Série ``date`` + indicateurs au pas jour (``D``), semaine (``W``) ou mois (``M``).
+
+        Comme ``resample`` : semaines terminées le dimanche, mois datés de leur
+        dernier jour, périodes vides présentes (moyenne NaN, somme 0).
+        """
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        key = ("timeseries", tuple(metrics), granularity, how) + self._filter_key(start, end, seasons)
+
+        def compute():
+            rows = self.rows(start, end, seasons)
+            if granularity == "D":
+                out = pd.DataFrame(self.values[np.ix_(rows, [self._metric_index[m] for m in metrics])], columns=metrics)
+                out.insert(0, "date", pd.to_datetime(self.days[rows]))
+                return out
+            if rows.size == 0:
+                return pd.DataFrame({"date": pd.to_datetime([]), **{m: [] for m in metrics}})
+            all_codes = self._week_codes if granularity == "W" else self._month_codes
+            first = all_codes[rows].min()
+            codes = all_codes[rows] - first
+            n_groups = int(codes.max()) + 1
+            sums, counts, _ = self._sums(codes, rows, metrics, n_groups)
+            group_codes = np.arange(n_groups) + first
+            if granularity == "W":
+                labels = (group_codes * 7 + 3).astype("datetime64[D]")
+            else:
+                labels = (group_codes + 1).astype("datetime64[M]").astype("datetime64[D]") - np.timedelta64(1, "D")
+            out = pd.DataFrame(self._finish(sums, counts, how), columns=metrics)
+            out.insert(0, "date", pd.to_datetime(labels))
+            return out
+
+        return self._memoized(key, compute)
+
+    def monthly(self, metrics, how="sum", start=None, end=None, seasons=None) -> pd.DataFrame:
+        """Agrégat par mois présent (comme ``groupby(date.dt.to_period('M'))``), daté du 1er du mois."""
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        key = ("monthly", tuple(metrics), how) + self._filter_key(start, end, seasons)
+
+        def compute():
+            rows = self.rows(start, end, seasons)
+            if rows.size == 0:
+                return pd.DataFrame({"date": pd.to_datetime([]), **{m: [] for m in metrics}})
+            first = self._month_codes[rows].min()
+            codes = self._month_codes[rows] - first
+            sums, counts, n_rows = self._sums(codes, rows, metrics, int(codes.max()) + 1)
+            present = n_rows > 0
+            out = pd.DataFrame(self._finish(sums, counts, how)[present], columns=metrics)
+            months = (np.flatnonzero(present) + first).astype("datetime64[M]")
+            out.insert(0, "date", pd.to_datetime(months))
+            return out
+
+        return self._memoized(key, compute)
+
+    def by(self, dimension, metrics, start=None, end=None, seasons=None, how="mean") -> pd.DataFrame:
+        """Agrégat par modalité de ``dimension`` (comme ``groupby(dimension)``)."""
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        key = ("by", dimension, tuple(metrics), how) + self._filter_key(start, end, seasons)
+
+        def compute():
+            all_codes, labels = self.dimensions[dimension]
+            rows = self.rows(start, end, seasons)
+            rows = rows[all_codes[rows] >= 0]
+            sums, counts, n_rows = self._sums(all_codes[rows], rows, metrics, len(labels))
+            present = n_rows > 0
+            out = pd.DataFrame(self._finish(sums, counts, how)[present], columns=metrics)
+            out.insert(0, dimension, [label for label, keep in zip(labels, present) if keep])
+            return out
+
+        return self._memoized(key, compute)
+
+    def mean(self, metric, start=None, end=None, seasons=None) -> float:
+        """Moyenne d'un indicateur (NaN ignorés)."""
+        key = ("mean", metric) + self._filter_key(start, end, seasons)
+
+        def compute():
+            values = self.values[self.rows(start, end, seasons), self._metric_index[metric]]
+            values = values[~np.isnan(values)]
+            return float(values.mean()) if values.size else float("nan")
+
+        return self._memoized(key, compute)
+
+    def corr(self, metrics, start=None, end=None, seasons=None) -> pd.DataFrame:
+        """Matrice de corrélation de Pearson (comme ``DataFrame.corr``)."""
+        metrics = list(metrics)
+        key = ("corr", tuple(metrics)) + self._filter_key(start, end, seasons)
+
+        def compute():
+            block = self.values[np.ix_(self.rows(start, end, seasons), [self._metric_index[m] for m in metrics])]
+            if np.isnan(block).any() or block.shape[0] < 2:
+                return pd.DataFrame(block, columns=metrics).corr()
+            centered = block - block.mean(axis=0)
+            cov = centered.T @ centered
+            scale = np.sqrt(np.diag(cov))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                corr = cov / np.outer(scale, scale)
+            np.fill_diagonal(corr, np.where(scale > 0, 1.0, np.nan))
+            return pd.DataFrame(corr, index=metrics, columns=metrics)
+
+        return self._memoized(key, compute)
+
+
+def cube_cache_path(data_version: str, cache_dir: Path) -> Path:
+    """Fichier de cache du cube pour une version des données."""
+    digest = hashlib.sha1(f"{CUBE_FORMAT_VERSION}:{data_version}".encode("utf-8")).hexdigest()[:16]
+    return Path(cache_dir) / f"dashboard_cube_{digest}.npz"
+
+
+def load_or_build_cube(df: pd.DataFrame, data_version: str, cache_dir: Path) -> DashboardCube:
+    """Relit le cube de ``data_version`` depuis le disque, sinon le construit et l'écrit.
+
+    Les cubes d'autres versions présents dans ``cache_dir`` sont supprimés.
+    """
+    path = cube_cache_path(data_version, cache_dir)
+    if path.exists():
+        try:
+            return DashboardCube.load(path)
+        except Exception:
+            path.unlink(missing_ok=True)
+    cube = DashboardCube.from_dataframe(df)
+    try:
+        cube.save(path)
+        for stale in Path(cache_dir).glob("dashboard_cube_*.npz"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return cube
@@ -23,9 +23,12 @@ try:
         find_similar_days,
         compute_synthetic_lags,
         calculate_historical_trend,
-        load_artifacts,
+        get_model_cache,
+        get_prediction_cache,
+        load_metrics,
         build_prophet_future_frame,
-        load_prophet_artifacts,
+        load_prophet_payload,
+        prophet_from_payload,
         forecast_prophet,
         evaluate_knn_quality,
     )
@@ -36,15 +39,28 @@ except Exception:
     find_similar_days = None
     compute_synthetic_lags = None
     calculate_historical_trend = None
-    load_artifacts = None
+    get_model_cache = None
+    get_prediction_cache = None
+    load_metrics = None
     build_prophet_future_frame = None
-    load_prophet_artifacts = None
+    load_prophet_payload = None
+    prophet_from_payload = None
     forecast_prophet = None
     evaluate_knn_quality = None
 
 
 def _load_metrics_json():
-    """Charge les métriques du modèle depuis ML/artifacts/metrics.json."""
+    """Charge les métriques des versions actives du registre d'artefacts.
+
+    Retombe sur ML/artifacts/metrics.json si le package n'est pas importable.
+    """
+    if load_metrics is not None:
+        try:
+            metrics = load_metrics()
+            if metrics:
+                return metrics
+        except Exception:
+            pass
     try:
         base = Path(__file__).resolve().parent.parent.parent
         for folder in ("ml", "ML"):
@@ -307,16 +323,47 @@ def show(df, model, model_available):
         if st.button("🚀 Calculer la Prédiction", type="primary", use_container_width=True):
             
             with st.spinner("Calcul en cours..."):
-                if (
+                # Mêmes entrées + même version d'artefact : résultat déjà calculé
+                cache_key = None
+                cached_prediction = None
+                cacheable = False
+                if get_prediction_cache is not None:
+                    try:
+                        cache_key = get_prediction_cache().make_key(
+                            selected_model_key,
+                            {
+                                "date": pred_date,
+                                "meteo": meteo,
+                                "evenement": evenement,
+                                "temperature": temperature,
+                                "vacances": vacances,
+                                "facteur_tendance": facteur_tendance,
+                            },
+                        )
+                        cached_prediction = get_prediction_cache().get(cache_key)
+                    except Exception:
+                        cache_key = None
+
+                if cached_prediction is not None:
+                    st.info("⚡ Résultat en cache (mêmes paramètres, même version du modèle)")
+                    pred_admissions = cached_prediction["pred_admissions"]
+                    pred_urgences = cached_prediction["pred_urgences"]
+                    pred_occupation = cached_prediction["pred_occupation"]
+
+                elif (
                     selected_model_key == "prophet"
                     and build_prophet_future_frame is not None
-                    and load_prophet_artifacts is not None
+                    and load_prophet_payload is not None
                     and forecast_prophet is not None
                 ):
                     st.info("🤖 Utilisation du modèle Prophet")
                     try:
-                        prophet_model, prophet_regressors = load_prophet_artifacts()
-                        future_df = build_prophet_future_frame([pred_date], df, prophet_regressors)
+                        prophet_payload = load_prophet_payload()
+                        prophet_model, prophet_regressors = prophet_from_payload(prophet_payload)
+                        future_df = build_prophet_future_frame(
+                            [pred_date], df, prophet_regressors,
+                            climatology=prophet_payload.get("climatology"),
+                        )
                         future_df = future_df.copy()
 
                         if "temperature_moyenne" in prophet_regressors:
@@ -350,11 +397,12 @@ def show(df, model, model_available):
                                 if event_default in future_df.columns:
                                     future_df[event_default] = 1
 
-                        forecast = forecast_prophet(prophet_model, future_df)
+                        forecast = forecast_prophet(prophet_model, future_df, fast=True)
                         pred_admissions = max(0.0, float(forecast["yhat"].iloc[0]))
                         urg_ratio = df["nombre_passages_urgences"].mean() / df["nombre_admissions"].mean()
                         pred_urgences = pred_admissions * urg_ratio
                         pred_occupation = df["taux_occupation_lits"].mean()
+                        cacheable = True
                     except Exception as e:
                         st.error(f"Erreur avec Prophet : {e}")
                         st.warning("Passage au modèle ML/statistique")
@@ -367,10 +415,10 @@ def show(df, model, model_available):
                     try:
                         selected_model = model["model"]
                         selected_feature_cols = model["feature_cols"]
-                        if load_artifacts is not None and selected_model_key != "gradient_boosting":
+                        if get_model_cache is not None and selected_model_key != "gradient_boosting":
                             try:
-                                selected_model, selected_feature_cols = load_artifacts(
-                                    model_name=selected_model_key
+                                selected_model, selected_feature_cols = get_model_cache().get(
+                                    selected_model_key
                                 )
                             except Exception:
                                 pass
@@ -498,6 +546,7 @@ def show(df, model, model_available):
                         urg_ratio = df["nombre_passages_urgences"].mean() / df["nombre_admissions"].mean()
                         pred_urgences = pred_admissions * urg_ratio
                         pred_occupation = df["taux_occupation_lits"].mean()
+                        cacheable = True
                         
                         # Afficher info sur le facteur appliqué
                         if abs(facteur_tendance) > 0.1:
@@ -540,6 +589,20 @@ def show(df, model, model_available):
                         saison, vacances, temperature, evenement
                     )
                 
+                if cacheable and cache_key is not None:
+                    try:
+                        get_prediction_cache().put(
+                            cache_key,
+                            selected_model_key,
+                            {
+                                "pred_admissions": float(pred_admissions),
+                                "pred_urgences": float(pred_urgences),
+                                "pred_occupation": float(pred_occupation),
+                            },
+                        )
+                    except Exception:
+                        pass
+
                 # Calculs dérivés
                 pred_hospitalisations = int(pred_admissions * 0.65)
                 pred_sorties = int(pred_admissions * 0.95)
@@ -568,6 +631,25 @@ def show(df, model, model_available):
                         st.toast("Prédiction sauvegardée pour la page Recommandations", icon="💾")
                 except Exception:
                     pass
+                try:
+                    from prediction_store import log_prediction
+                    log_prediction(
+                        pd.DataFrame({
+                            "date": [pd.to_datetime(pred_date)],
+                            "admissions": [float(pred_admissions)],
+                            "urgences": [float(pred_urgences)],
+                        }),
+                        selected_model_key if (cacheable or cached_prediction is not None) else "repli",
+                        inputs={
+                            "meteo": meteo,
+                            "evenement": evenement,
+                            "temperature": temperature,
+                            "vacances": vacances,
+                            "facteur_tendance": facteur_tendance,
+                        },
+                    )
+                except Exception:
+                    pass
                 
                 # Affichage des résultats
                 st.success("✅ Prédiction calculée")
@@ -729,15 +811,19 @@ def show(df, model, model_available):
 
                 prophet_ready = (
                     build_prophet_future_frame is not None
-                    and load_prophet_artifacts is not None
+                    and load_prophet_payload is not None
                     and forecast_prophet is not None
                 )
 
                 if selected_model_key == "prophet" and prophet_ready:
                     try:
-                        prophet_model, prophet_regressors = load_prophet_artifacts()
-                        future_df = build_prophet_future_frame(dates, df, prophet_regressors)
-                        forecast = forecast_prophet(prophet_model, future_df)
+                        prophet_payload = load_prophet_payload()
+                        prophet_model, prophet_regressors = prophet_from_payload(prophet_payload)
+                        future_df = build_prophet_future_frame(
+                            dates, df, prophet_regressors,
+                            climatology=prophet_payload.get("climatology"),
+                        )
+                        forecast = forecast_prophet(prophet_model, future_df, fast=True)
                         for row in forecast.itertuples(index=False):
                             pred_adm = max(0.0, float(row.yhat))
                             pred_urg = pred_adm * urg_ratio
@@ -762,12 +848,12 @@ def show(df, model, model_available):
                         selected_model = model["model"]
                         selected_feature_cols = model["feature_cols"]
                         if (
-                            load_artifacts is not None
+                            get_model_cache is not None
                             and selected_model_key != "gradient_boosting"
                         ):
                             try:
-                                selected_model, selected_feature_cols = load_artifacts(
-                                    model_name=selected_model_key
+                                selected_model, selected_feature_cols = get_model_cache().get(
+                                    selected_model_key
                                 )
                             except Exception as e:
                                 st.warning(f"Modèle {selected_model_key} indisponible, fallback gradient_boosting: {e}")
@@ -909,6 +995,7 @@ def show(df, model, model_available):
                         st.warning(f"Modèle ML indisponible pour cette plage : {e}. Passage au modèle statistique.")
                         predictions = []
                 
+                history_model = selected_model_key if predictions else "repli"
                 if not predictions:
                     # Fallback : modèle statistique
                     for date in dates:
@@ -967,6 +1054,15 @@ def show(df, model, model_available):
                         st.toast("Prédiction sauvegardée pour la page Recommandations", icon="💾")
                 except Exception:
                     pass
+                try:
+                    from prediction_store import log_prediction
+                    log_prediction(
+                        pred_df,
+                        history_model,
+                        inputs={"start_date": start_date, "n_days": n_days},
+                    )
+                except Exception:
+                    pass
                 
                 st.success(f"✅ {n_days} jours prédits")
                 st.markdown("---")
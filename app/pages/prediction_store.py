@@ -1,16 +1,36 @@
 """
 Persistance des résultats de prédiction pour la page Recommandations.
-Sauvegarde dans un fichier JSON (data/last_prediction_for_recommendations.json)
-pour survivre aux rechargements de page.
+Sauvegarde binaire pour survivre aux rechargements de page : les DataFrames
+(pred_df) en Feather, le reste dans un petit JSON de métadonnées
+(data/last_prediction_for_recommendations.meta.json). Chaque fichier est
+écrit dans un fichier temporaire puis renommé ; les métadonnées, écrites en
+dernier, désignent le fichier Feather à lire. L'ancien format JSON
+(data/last_prediction_for_recommendations.json) reste lisible.
+
+Chaque prédiction est aussi journalisée dans un historique SQLite
+(data/prediction_history.sqlite, voir smartcare_model.PredictionLog),
+rapproché des valeurs réelles du dataset au fil de leur arrivée.
 """
 
 import json
+import os
+import time
+import uuid
 from pathlib import Path
 from datetime import datetime, date
 import pandas as pd
 
 _BASE = Path(__file__).resolve().parent.parent.parent
 PREDICTION_FILE = _BASE / "data" / "last_prediction_for_recommendations.json"
+PREDICTION_META_FILE = _BASE / "data" / "last_prediction_for_recommendations.meta.json"
+# Âge minimal (s) d'un fichier Feather non référencé avant suppression
+FRAME_GRACE_SECONDS = 60
+HISTORY_FILE = _BASE / "data" / "prediction_history.sqlite"
+# Cible journalisée -> colonne des valeurs réelles dans le dataset
+ACTUAL_COLUMNS = {
+    "admissions": "nombre_admissions",
+    "urgences": "nombre_passages_urgences",
+}
 
 
 def _serialize(obj):
@@ -29,44 +49,177 @@ def _serialize(obj):
     return obj
 
 
+def _atomic_write(path: Path, write) -> None:
+    """Écrit via ``write(tmp_path)`` puis renomme (jamais de fichier à moitié écrit).
+
+    Nom temporaire unique par appel : les sessions Streamlit partagent le
+    même processus (threads), un PID ne suffit pas.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _frame_file_name(key: str, frame_id: str) -> str:
+    return f"last_prediction_for_recommendations.{key}.{frame_id}.feather"
+
+
+def _referenced_frames() -> set:
+    """Fichiers Feather référencés par les métadonnées actuellement sur disque."""
+    try:
+        meta = json.loads(PREDICTION_META_FILE.read_text(encoding="utf-8"))
+        return set(meta.get("frames", {}).values())
+    except (OSError, ValueError):
+        return set()
+
+
 def save_prediction_for_recommendations(data: dict) -> bool:
-    """Sauvegarde les résultats de prédiction dans un fichier JSON."""
+    """Sauvegarde les résultats de prédiction (Feather + métadonnées JSON).
+
+    Une fois les métadonnées remplacées, les fichiers Feather qu'elles ne
+    référencent pas sont supprimés, y compris ceux d'une sauvegarde
+    concurrente perdante. Les fichiers de moins de ``FRAME_GRACE_SECONDS``
+    sont épargnés : une autre session peut être en train d'écrire les
+    siens ou de lire les précédents.
+    """
     try:
-        serialized = {}
+        meta = {"values": {}, "dates": [], "timestamps": [], "frames": {}, "record_frames": []}
+        frame_id = uuid.uuid4().hex[:12]
         for k, v in data.items():
-            if v is None:
-                serialized[k] = None
-            elif isinstance(v, (datetime, date, pd.Timestamp)):
-                serialized[k] = _serialize(v)
-            elif isinstance(v, pd.DataFrame):
-                serialized[k] = _serialize(v)
-            elif hasattr(v, "item") and callable(getattr(v, "item")):
-                serialized[k] = v.item()
+            if isinstance(v, pd.DataFrame):
+                df = v.reset_index(drop=True)
+                name = _frame_file_name(k, frame_id)
+                try:
+                    _atomic_write(PREDICTION_META_FILE.with_name(name), df.to_feather)
+                    meta["frames"][k] = name
+                except ImportError:
+                    # pyarrow absent : DataFrame en enregistrements JSON
+                    meta["values"][k] = _serialize(df)
+                    meta["record_frames"].append(k)
+            elif isinstance(v, (datetime, pd.Timestamp)):
+                meta["values"][k] = _serialize(v)
+                meta["timestamps"].append(k)
+            elif isinstance(v, date):
+                meta["values"][k] = _serialize(v)
+                meta["dates"].append(k)
+            elif v is not None and hasattr(v, "item") and callable(getattr(v, "item")):
+                meta["values"][k] = v.item()
             else:
-                serialized[k] = v
-        PREDICTION_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(PREDICTION_FILE, "w", encoding="utf-8") as f:
-            json.dump(serialized, f, ensure_ascii=False, indent=2, default=str)
+                meta["values"][k] = v
+        payload = json.dumps(meta, ensure_ascii=False, default=str)
+        _atomic_write(PREDICTION_META_FILE, lambda p: p.write_text(payload, encoding="utf-8"))
+        keep = _referenced_frames() | set(meta["frames"].values())
+        cutoff = time.time() - FRAME_GRACE_SECONDS
+        for path in PREDICTION_META_FILE.parent.glob("last_prediction_for_recommendations.*.feather"):
+            try:
+                if path.name not in keep and path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        PREDICTION_FILE.unlink(missing_ok=True)
         return True
     except Exception:
         return False
 
 
+def _load_legacy_json() -> dict | None:
+    """Lit l'ancien format (un seul JSON, pred_df en enregistrements)."""
+    if not PREDICTION_FILE.exists():
+        return None
+    with open(PREDICTION_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if "pred_df" in data and isinstance(data["pred_df"], list):
+        data["pred_df"] = pd.DataFrame(data["pred_df"])
+        if "date" in data["pred_df"].columns:
+            data["pred_df"]["date"] = pd.to_datetime(data["pred_df"]["date"])
+    if "pred_date" in data and isinstance(data["pred_date"], str):
+        data["pred_date"] = pd.to_datetime(data["pred_date"]).date()
+    if "start_date" in data and isinstance(data["start_date"], str):
+        data["start_date"] = pd.to_datetime(data["start_date"]).date()
+    return data
+
+
 def load_prediction_for_recommendations() -> dict | None:
-    """Charge les résultats de prédiction depuis le fichier JSON."""
+    """Charge les résultats de prédiction (format binaire, sinon ancien JSON)."""
     try:
-        if not PREDICTION_FILE.exists():
-            return None
-        with open(PREDICTION_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if "pred_df" in data and isinstance(data["pred_df"], list):
-            data["pred_df"] = pd.DataFrame(data["pred_df"])
-            if "date" in data["pred_df"].columns:
-                data["pred_df"]["date"] = pd.to_datetime(data["pred_df"]["date"])
-        if "pred_date" in data and isinstance(data["pred_date"], str):
-            data["pred_date"] = pd.to_datetime(data["pred_date"]).date()
-        if "start_date" in data and isinstance(data["start_date"], str):
-            data["start_date"] = pd.to_datetime(data["start_date"]).date()
+        if not PREDICTION_META_FILE.exists():
+            return _load_legacy_json()
+        meta = json.loads(PREDICTION_META_FILE.read_text(encoding="utf-8"))
+        data = dict(meta["values"])
+        for k in meta["dates"]:
+            data[k] = date.fromisoformat(data[k])
+        for k in meta["timestamps"]:
+            data[k] = pd.Timestamp(data[k])
+        for k, name in meta["frames"].items():
+            data[k] = pd.read_feather(PREDICTION_META_FILE.with_name(name))
+        for k in meta["record_frames"]:
+            data[k] = pd.DataFrame(data[k])
+            if "date" in data[k].columns:
+                data[k]["date"] = pd.to_datetime(data[k]["date"])
         return data
     except Exception:
         return None
+
+
+def _prediction_log():
+    from smartcare_model import PredictionLog
+
+    return PredictionLog(HISTORY_FILE)
+
+
+def log_prediction(pred_df: pd.DataFrame, model: str, inputs: dict | None = None) -> str | None:
+    """Ajoute des prédictions (colonnes date, admissions, urgences) à l'historique."""
+    try:
+        model_version = None
+        if model != "repli":
+            try:
+                from smartcare_model.inference.result_cache import artifact_version
+
+                model_version = artifact_version(model)
+            except Exception:
+                pass
+        return _prediction_log().record(
+            pred_df,
+            model,
+            targets=tuple(ACTUAL_COLUMNS),
+            model_version=model_version,
+            inputs=inputs,
+        )
+    except Exception:
+        return None
+
+
+def sync_actuals(df: pd.DataFrame) -> int:
+    """Reporte dans l'historique les valeurs réelles des dates déjà prédites."""
+    try:
+        log = _prediction_log()
+        bounds = log.date_range()
+        if bounds is None:
+            return 0
+        dates = pd.to_datetime(df["date"])
+        return log.record_actuals(df[(dates >= bounds[0]) & (dates <= bounds[1])], ACTUAL_COLUMNS)
+    except Exception:
+        return 0
+
+
+def load_prediction_history(start=None, end=None, model=None, target="admissions") -> pd.DataFrame | None:
+    """Prédictions d'une plage de dates (la plus récente par jour et modèle) avec le réel."""
+    try:
+        return _prediction_log().query(start=start, end=end, model=model, target=target)
+    except Exception:
+        return None
+
+
+def load_history_accuracy(start=None, end=None, target="admissions") -> dict:
+    """MAE / RMSE / MAPE / sMAPE par modèle sur les prédictions dont le réel est connu."""
+    try:
+        return {
+            model: metrics.result()
+            for model, metrics in _prediction_log().accuracy(start=start, end=end, target=target).items()
+        }
+    except Exception:
+        return {}
@@ -324,6 +324,74 @@ def _render_multi_day(df, pred_data):
             st.plotly_chart(fig, use_container_width=True)
 
 
+def _render_history(df, pred_data):
+    """Historique des prédictions journalisées, rapprochées des admissions réelles."""
+    try:
+        from prediction_store import load_history_accuracy, load_prediction_history, sync_actuals
+    except Exception:
+        return
+    sync_actuals(df)
+    accuracy = load_history_accuracy()
+    if not accuracy:
+        return
+
+    st.markdown("---")
+    render_title(
+        "📈 Historique : Prédictions vs Admissions réelles",
+        "Précision des prédictions passées dont les admissions réelles sont connues "
+        "(dernière prédiction par jour et par modèle).",
+        heading="#####",
+    )
+    st.dataframe(
+        pd.DataFrame([
+            {
+                "Modèle": model_name,
+                "Jours évalués": m["n"],
+                "MAE": round(m["mae"], 1),
+                "RMSE": round(m["rmse"], 1),
+                "MAPE (%)": round(m["mape"], 1),
+                "sMAPE (%)": round(m["smape"], 1),
+            }
+            for model_name, m in accuracy.items()
+        ]),
+        hide_index=True,
+        use_container_width=True,
+    )
+
+    if pred_data['mode'] == 'single':
+        start = end = pd.to_datetime(pred_data['pred_date'])
+    else:
+        start = pd.to_datetime(pred_data['start_date'])
+        end = start + timedelta(days=int(pred_data['n_days']) - 1)
+    history = load_prediction_history(start=start - timedelta(days=30), end=end)
+    if history is None or history['actual'].isna().all():
+        return
+    fig = go.Figure()
+    for model_name, group in history.groupby('model'):
+        fig.add_trace(go.Scatter(
+            x=group['date'],
+            y=group['prediction'],
+            name=f'Prédiction ({model_name})',
+            mode='lines+markers'
+        ))
+    actuals = history.dropna(subset=['actual']).drop_duplicates('date')
+    fig.add_trace(go.Scatter(
+        x=actuals['date'],
+        y=actuals['actual'],
+        name='Réel',
+        line=dict(color='#111111', width=2, dash='dash'),
+        mode='lines+markers'
+    ))
+    fig.update_layout(
+        title="Admissions prédites vs réelles (période prédite et 30 jours avant)",
+        xaxis_title="Date",
+        yaxis_title="Admissions",
+        height=300,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+
 def _load_prediction_data():
     """Charge les données de prédiction depuis session_state ou fichier JSON."""
     if 'prediction_for_recommendations' in st.session_state and st.session_state.prediction_for_recommendations:
@@ -360,3 +428,5 @@ def show(df):
         _render_single_day(df, pred_data)
     else:
         _render_multi_day(df, pred_data)
+
+    _render_history(df, pred_data)
@@ -0,0 +1,85 @@
+"""Benchmark du generateur Smart Care: moteur jour par jour vs vectorise.
+
+Compare le temps de generation et les distributions (moyenne, ecart-type,
+quantiles) des colonnes numeriques, ainsi que les frequences d'evenements.
+"""
+
+from pathlib import Path
+import sys
+import argparse
+import contextlib
+import io
+import random
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+import numpy as np
+import pandas as pd
+
+from generate_smart_care_data import SmartCareDataGenerator
+
+COMPARE_COLS = [
+    "temperature_moyenne",
+    "nombre_admissions",
+    "nombre_passages_urgences",
+    "lits_occupes",
+    "nb_medecins_disponibles",
+    "nb_infirmiers_disponibles",
+    "nb_aides_soignants_disponibles",
+    "taux_couverture_personnel",
+    "impact_evenement_estime",
+]
+
+
+def _generate(generator, engine: str, seed: int):
+    np.random.seed(seed)
+    random.seed(seed)
+    rng = np.random.default_rng(seed) if engine == "vectorized" else None
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        daily, _ = generator.generate_all_years(engine=engine, rng=rng)
+    return daily, time.perf_counter() - start
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark generator engines (python vs vectorized)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = SmartCareDataGenerator(ROOT / "data" / "raw")
+
+    legacy, legacy_s = _generate(generator, "python", args.seed)
+    fast, fast_s = _generate(generator, "vectorized", args.seed)
+    assert list(legacy.columns) == list(fast.columns)
+    assert len(legacy) == len(fast)
+    print(f"python:     {legacy_s:8.2f} s ({len(legacy)} jours)")
+    print(f"vectorized: {fast_s:8.2f} s  -> {legacy_s / fast_s:.0f}x")
+
+    rows = []
+    for col in COMPARE_COLS:
+        a, b = legacy[col].astype(float), fast[col].astype(float)
+        rows.append({
+            "colonne": col,
+            "mean_py": a.mean(), "mean_vec": b.mean(),
+            "std_py": a.std(), "std_vec": b.std(),
+            "p10_py": a.quantile(0.1), "p10_vec": b.quantile(0.1),
+            "p90_py": a.quantile(0.9), "p90_vec": b.quantile(0.9),
+        })
+    with pd.option_context("display.width", 200, "display.max_columns", None, "display.precision", 2):
+        print(pd.DataFrame(rows).set_index("colonne"))
+        events = pd.concat(
+            {
+                "python": legacy["evenement_special"].value_counts(),
+                "vectorized": fast["evenement_special"].value_counts(),
+            },
+            axis=1,
+        ).fillna(0).astype(int)
+        print(events)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,117 @@
+"""Benchmark de chargement des modeles: arbres compiles en processus vs projetes.
+
+Mode ``compile``: le predicteur rapide est recompile dans chaque processus
+(copie privee). Mode ``mmap``: les tableaux publies (``<nom>.trees/``) sont
+projetes en memoire et partages entre processus via le cache du systeme.
+Chaque mesure tourne dans un processus neuf (chargement + premiere
+prediction sur une ligne), pour reproduire le cout d'un worker Streamlit ou
+d'un appel CLI. ``anon`` est la memoire privee du processus, ``file`` les
+pages de fichiers (partageables).
+"""
+
+from pathlib import Path
+import sys
+import argparse
+import json
+import subprocess
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ml"))
+
+from smartcare_model.artifacts.registry import MODELS_KIND, resolve_artifacts_dir
+from smartcare_model.config.paths import ARTIFACTS_DIR
+
+
+def _rss_mb() -> dict:
+    """RSS privee (``RssAnon``) et de fichiers (``RssFile``) en Mo (Linux)."""
+    rss = {"anon": 0.0, "file": 0.0}
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    rss["anon"] = int(line.split()[1]) / 1024
+                elif line.startswith("RssFile:"):
+                    rss["file"] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return rss
+
+
+def _child(model_name: str, artifacts_dir: str, mode: str) -> None:
+    import numpy as np
+
+    from smartcare_model.artifacts.store import load_artifacts
+    from smartcare_model.inference import compiled
+
+    before = _rss_mb()
+    start = time.perf_counter()
+    model, feature_cols = load_artifacts(model_name, Path(artifacts_dir))
+    if mode == "compile":
+        compiled._COMPILED_CACHE.pop(model, None)
+    compiled.predict_fast(model, np.zeros((1, len(feature_cols))))
+    elapsed = time.perf_counter() - start
+    after = _rss_mb()
+    print(json.dumps({
+        "load_ms": elapsed * 1000,
+        "anon_mb": after["anon"] - before["anon"],
+        "file_mb": after["file"] - before["file"],
+    }))
+
+
+def _measure(model_name: str, artifacts_dir: Path, mode: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", model_name, str(artifacts_dir), mode],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    runs.sort(key=lambda r: r["load_ms"])
+    return runs[len(runs) // 2]
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model loading (compiled trees: per process vs mmap)")
+    parser.add_argument("--artifacts-dir", type=Path, default=ARTIFACTS_DIR)
+    parser.add_argument("--models", nargs="+", default=None)
+    parser.add_argument("--train", action="store_true", help="Train fresh models into a temp dir first")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifacts_dir = args.artifacts_dir
+        if args.train:
+            from smartcare_model.training.trainer import train_models
+
+            artifacts_dir = Path(tmp)
+            train_models(artifacts_dir=artifacts_dir)
+        snapshot_dir = resolve_artifacts_dir(MODELS_KIND, artifacts_dir)
+        models = args.models or sorted(
+            p.stem for p in snapshot_dir.glob("*.joblib") if p.stem != "prophet"
+        )
+
+        print(
+            f"{'model':<20} | {'size MB':>8} | {'mode':>7} | {'load ms':>8} | {'anon +MB':>8} | {'file +MB':>8}"
+        )
+        for name in models:
+            size_mb = (snapshot_dir / f"{name}.joblib").stat().st_size / 1e6
+            for mode in ("compile", "mmap"):
+                res = _measure(name, artifacts_dir, mode, args.repeat)
+                print(
+                    f"{name:<20} | {size_mb:>8.1f} | {mode:>7} | "
+                    f"{res['load_ms']:>8.1f} | {res['anon_mb']:>8.1f} | {res['file_mb']:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    run()
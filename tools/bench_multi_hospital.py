@@ -0,0 +1,127 @@
+"""Benchmark multi-hopitaux: chargement partitionne, features par groupe, inference.
+
+Genere N hopitaux synthetiques (par defaut 50 x 5 ans) a partir du CSV
+historique, ou lit un dataset partitionne (``--partitioned-dir``, par exemple
+produit par ``generate_smart_care_data.py --scale-profile``), puis compare le
+feature engineering groupby vectorise a une boucle hopital par hopital.
+"""
+
+from pathlib import Path
+import sys
+import argparse
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ml"))
+
+import numpy as np
+import pandas as pd
+
+from smartcare_model.config import HOSPITAL_ID_COL
+from smartcare_model.data.loading import load_partitioned_dataframe
+from smartcare_model.pipeline import (
+    _select_feature_columns,
+    build_feature_dataframe,
+    load_raw_dataframe,
+    find_similar_days,
+    prepare_prediction_row,
+    train_models,
+)
+
+
+def build_synthetic_fleet(raw_df: pd.DataFrame, n_hospitals: int, years: int, seed: int = 42) -> pd.DataFrame:
+    """Repliquer la serie historique sur ``n_hospitals`` sites et ``years`` annees."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(raw_df["date"].min(), periods=365 * years, freq="D")
+    idx = np.arange(len(dates)) % len(raw_df)
+    template = raw_df.iloc[idx].reset_index(drop=True)
+    template["date"] = dates
+
+    frames = []
+    for i in range(n_hospitals):
+        frame = template.copy()
+        scale = rng.uniform(0.5, 2.0)
+        noise = rng.normal(1.0, 0.05, size=len(frame))
+        frame["nombre_admissions"] = np.round(frame["nombre_admissions"] * scale * noise).astype(int)
+        frame[HOSPITAL_ID_COL] = f"HOP_{i + 1:04d}"
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark multi-hospital loading/features/inference")
+    parser.add_argument("--hospitals", type=int, default=50)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--partitioned-dir", type=Path, default=None, help="Existing partitioned dataset")
+    parser.add_argument("--train", action="store_true", help="Also time pooled training")
+    args = parser.parse_args(argv)
+
+    if args.partitioned_dir is not None:
+        loaded, load_s = _timed(lambda: load_partitioned_dataframe(args.partitioned_dir))
+    else:
+        raw_df = load_raw_dataframe()
+        fleet_df = build_synthetic_fleet(raw_df, args.hospitals, args.years)
+        print(f"Synthetic fleet: {args.hospitals} hospitals x {args.years} years = {len(fleet_df)} rows")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for hospital_id, part in fleet_df.groupby(HOSPITAL_ID_COL):
+                part_dir = root / f"{HOSPITAL_ID_COL}={hospital_id}"
+                part_dir.mkdir()
+                part.drop(columns=[HOSPITAL_ID_COL]).to_csv(part_dir / "data.csv", index=False)
+            loaded, load_s = _timed(lambda: load_partitioned_dataframe(root))
+    n_sites = loaded[HOSPITAL_ID_COL].nunique()
+    print(f"Partitioned load:           {load_s:8.2f} s ({len(loaded)} rows, {n_sites} hospitals)")
+
+    grouped, grouped_s = _timed(lambda: build_feature_dataframe(loaded))
+
+    def _loop():
+        frames = [
+            build_feature_dataframe(part.drop(columns=[HOSPITAL_ID_COL]))
+            for _, part in loaded.groupby(HOSPITAL_ID_COL, sort=True)
+        ]
+        return pd.concat(frames, ignore_index=True)
+
+    looped, loop_s = _timed(_loop)
+    # Les one-hot dependent des categories vues par site: on compare les colonnes temporelles
+    temporal = [c for c in looped.columns if c.startswith("adm_")] + ["y", "veille_holiday", "lendemain_holiday"]
+    pd.testing.assert_frame_equal(grouped[temporal], looped[temporal], check_dtype=False)
+    print(f"Features (groupby):         {grouped_s:8.2f} s")
+    print(f"Features (loop per site):   {loop_s:8.2f} s  -> {loop_s / grouped_s:.1f}x, identical lags/rolling")
+
+    feature_cols = _select_feature_columns(grouped)
+    hospital_ids = grouped[HOSPITAL_ID_COL].unique()
+    rows, infer_s = _timed(
+        lambda: [prepare_prediction_row(grouped, feature_cols, hospital_id=h) for h in hospital_ids]
+    )
+    print(f"Per-hospital row selection: {infer_s * 1000 / len(rows):8.2f} ms / hospital")
+
+    target = rows[0].iloc[0]
+    target_features = {
+        "vacances": int(target["vacances_scolaires"]),
+        "temperature": float(target["temperature_moyenne"]),
+    }
+    history = grouped[grouped[HOSPITAL_ID_COL] == hospital_ids[0]]
+    _, knn_site_s = _timed(lambda: find_similar_days(history, target["date"], target_features, k=10))
+    _, knn_all_s = _timed(lambda: find_similar_days(grouped, target["date"], target_features, k=10))
+    print(f"k-NN (one hospital):        {knn_site_s * 1000:8.2f} ms ({len(history)} rows)")
+    print(f"k-NN (whole fleet):         {knn_all_s * 1000:8.2f} ms ({len(grouped)} rows)")
+
+    if args.train:
+        with tempfile.TemporaryDirectory() as tmp:
+            results, train_s = _timed(lambda: train_models(artifacts_dir=Path(tmp), raw_df=loaded))
+        print(f"Pooled training:            {train_s:8.2f} s")
+        for name, metrics in results.items():
+            print(f"  {name}: {metrics}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,65 @@
+"""Benchmark de latence Prophet: ``predict`` complet vs mode point rapide."""
+
+from pathlib import Path
+import sys
+import argparse
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ml"))
+
+import numpy as np
+import pandas as pd
+
+from smartcare_model.pipeline import (
+    build_prophet_future_frame,
+    forecast_prophet,
+    load_prophet_artifacts,
+    load_prophet_payload,
+    load_raw_dataframe,
+)
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Prophet forecast latency (full vs fast)")
+    parser.add_argument("--horizons", type=int, nargs="+", default=[1, 30, 365])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    raw_df = load_raw_dataframe()
+    model, regressors = load_prophet_artifacts()
+    residual_std = load_prophet_payload().get("residual_std")
+    start = raw_df["date"].max() + pd.Timedelta(days=1)
+
+    print(f"{'dates':>6} | {'full (ms)':>10} | {'fast (ms)':>10} | {'speedup':>8} | max |diff yhat|")
+    for n_dates in args.horizons:
+        dates = pd.date_range(start=start, periods=n_dates, freq="D")
+        future_df = build_prophet_future_frame(dates, raw_df, regressors)
+
+        full = forecast_prophet(model, future_df)
+        fast = forecast_prophet(model, future_df, fast=True, residual_std=residual_std)
+        max_diff = float(np.max(np.abs(full["yhat"].to_numpy() - fast["yhat"].to_numpy())))
+
+        full_ms = _median_ms(lambda: forecast_prophet(model, future_df), args.repeat)
+        fast_ms = _median_ms(
+            lambda: forecast_prophet(model, future_df, fast=True, residual_std=residual_std),
+            args.repeat,
+        )
+        print(
+            f"{n_dates:>6} | {full_ms:>10.1f} | {fast_ms:>10.1f} | "
+            f"{full_ms / fast_ms:>7.1f}x | {max_diff:.2e}"
+        )
+
+
+if __name__ == "__main__":
+    run()
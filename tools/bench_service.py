@@ -0,0 +1,144 @@
+"""Benchmark du service de prediction: micro-batching vs requete par requete.
+
+Demarre le service dans le processus (port ephemere), envoie ``--requests``
+requetes avec ``--concurrency`` connexions keep-alive, et compare les
+latences cote client et les statistiques ``/stats`` du serveur. Verifie aussi
+que les predictions du service sont identiques au chemin de l'application
+(``find_similar_days`` + ``apply_overrides`` + ``predict_from_features``).
+"""
+
+from pathlib import Path
+import sys
+import argparse
+import asyncio
+import json
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ml"))
+
+import numpy as np
+import pandas as pd
+
+from smartcare_model.pipeline import (
+    apply_overrides,
+    compute_synthetic_lags,
+    find_similar_days,
+    load_raw_dataframe,
+    predict_from_features,
+    prepare_prediction_row,
+)
+from smartcare_model.service import PredictionService, start_server
+
+METEOS = ["Aucun", "Pluie", "Soleil", "Froid", "Canicule"]
+EVENTS = ["Aucun", "Epidemie_grippe", "Canicule", "Vague_froid"]
+
+
+def make_payloads(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2026-02-01", periods=365)
+    return [
+        {
+            "date": str(dates[rng.integers(len(dates))].date()),
+            "meteo": str(rng.choice(METEOS)),
+            "event": str(rng.choice(EVENTS)),
+            "temperature": round(float(rng.uniform(-5, 35)), 1),
+            "vacances": int(rng.integers(0, 2)),
+        }
+        for _ in range(n)
+    ]
+
+
+def reference_prediction(service: PredictionService, payload: dict) -> float:
+    """Chemin de l'onglet jour unique de l'application."""
+    model, feature_cols = service.cache.get(service.models[0])
+    meteo = None if payload["meteo"] == "Aucun" else payload["meteo"]
+    event = None if payload["event"] == "Aucun" else payload["event"]
+    target = {
+        "temperature": payload["temperature"],
+        "meteo": meteo or "Soleil",
+        "evenement": event or "Aucun",
+        "vacances": payload["vacances"],
+    }
+    similar = find_similar_days(service.feature_df, pd.Timestamp(payload["date"]), target, k=service.k)
+    row = prepare_prediction_row(service.feature_df, feature_cols)
+    for col, value in compute_synthetic_lags(similar).items():
+        if col in row.columns:
+            row[col] = value
+    row = apply_overrides(row, feature_cols, meteo=meteo, event=event)
+    return predict_from_features(row, model, feature_cols)["prediction"]
+
+
+async def _client(port: int, payloads, latencies, results):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for payload in payloads:
+        body = json.dumps(payload).encode()
+        start = time.perf_counter()
+        writer.write(
+            b"POST /predict HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        headers = {}
+        await reader.readline()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            key, _, value = line.decode().partition(":")
+            headers[key.strip().lower()] = value.strip()
+        data = json.loads(await reader.readexactly(int(headers["content-length"])))
+        latencies.append(time.perf_counter() - start)
+        results.append((payload, data))
+    writer.close()
+
+
+async def _run_load(service: PredictionService, payloads, concurrency: int):
+    server = await start_server(service, port=0)
+    port = server.sockets[0].getsockname()[1]
+    latencies, results = [], []
+    chunks = [payloads[i::concurrency] for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(port, chunk, latencies, results) for chunk in chunks))
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+    await service.stop()
+    return np.asarray(latencies) * 1000, results, elapsed
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the micro-batching prediction service")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--check", type=int, default=50, help="Requests compared with the app code path")
+    args = parser.parse_args(argv)
+
+    raw_df = load_raw_dataframe()
+    payloads = make_payloads(args.requests)
+    print(f"{args.requests} requests, {args.concurrency} concurrent connections")
+    print(f"{'mode':<14} | {'req/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'mean batch':>10}")
+    for label, max_batch in (("no batching", 1), ("micro-batch", args.max_batch)):
+        service = PredictionService(raw_df=raw_df, max_batch=max_batch, max_wait_ms=args.max_wait_ms)
+        latencies, results, elapsed = asyncio.run(_run_load(service, payloads, args.concurrency))
+        stats = service.stats()
+        print(
+            f"{label:<14} | {len(latencies) / elapsed:>8.0f} | {np.percentile(latencies, 50):>8.2f} | "
+            f"{np.percentile(latencies, 99):>8.2f} | {stats['mean_batch_size']:>10.1f}"
+        )
+
+    worst = max(
+        abs(data["prediction"] - reference_prediction(service, payload))
+        for payload, data in results[: args.check]
+    )
+    print(f"max |service - app path| over {args.check} requests: {worst:.3g}")
+    if worst > 1e-6:
+        raise SystemExit("Service predictions differ from the application code path")
+
+
+if __name__ == "__main__":
+    run()
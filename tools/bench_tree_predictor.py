@@ -0,0 +1,111 @@
+"""Benchmark et equivalence du predicteur d'arbres compile vs ``model.predict``.
+
+Verifie que ``CompiledTreeEnsemble.predict`` reproduit les sorties sklearn
+sur toutes les lignes de features (y compris des lignes perturbees), puis
+mesure la latence par taille de lot.
+"""
+
+from pathlib import Path
+import sys
+import argparse
+import tempfile
+import time
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ml"))
+
+import numpy as np
+
+from smartcare_model.artifacts.store import load_artifacts
+from smartcare_model.config.paths import ARTIFACTS_DIR
+from smartcare_model.inference.compiled import compile_tree_ensemble, compile_tree_stack
+from smartcare_model.inference.intervals import load_quantile_models
+from smartcare_model.pipeline import build_feature_dataframe, load_raw_dataframe
+
+
+def _median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def check_equivalence(model, X) -> float:
+    """Ecart absolu maximal entre sklearn et le predicteur compile."""
+    compiled = compile_tree_ensemble(model)
+    rng = np.random.default_rng(0)
+    noisy = X * rng.normal(1.0, 0.05, size=X.shape)
+    worst = 0.0
+    for data in (X, noisy):
+        expected = model.predict(data)
+        got = compiled.predict(data.to_numpy(dtype=float))
+        worst = max(worst, float(np.max(np.abs(expected - got))))
+    return worst
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark compiled tree predictor vs sklearn predict")
+    parser.add_argument("--artifacts-dir", type=Path, default=ARTIFACTS_DIR)
+    parser.add_argument("--models", nargs="+", default=["gradient_boosting", "random_forest"])
+    parser.add_argument("--train", action="store_true", help="Train fresh models into a temp dir first")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 64, 512])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--check-only", action="store_true", help="Only run the equivalence check")
+    args = parser.parse_args(argv)
+
+    feature_df = build_feature_dataframe(load_raw_dataframe())
+    with tempfile.TemporaryDirectory() as tmp:
+        artifacts_dir = args.artifacts_dir
+        if args.train:
+            from smartcare_model.training.trainer import train_models
+
+            artifacts_dir = Path(tmp)
+            train_models(artifacts_dir=artifacts_dir)
+
+        for name in args.models:
+            try:
+                model, feature_cols = load_artifacts(name, artifacts_dir)
+            except FileNotFoundError as exc:
+                print(f"{name}: {exc}")
+                continue
+            X = feature_df.dropna(subset=feature_cols)[feature_cols].astype(float)
+            start = time.perf_counter()
+            compiled = compile_tree_ensemble(model)
+            compile_ms = (time.perf_counter() - start) * 1000
+            diff = check_equivalence(model, X)
+            print(
+                f"{name}: {compiled.n_trees} trees, {len(compiled.value)} nodes, depth {compiled.max_depth}, "
+                f"compile {compile_ms:.1f} ms, max |diff| = {diff:.3g}"
+            )
+            if diff > 1e-9:
+                raise SystemExit(f"{name}: compiled predictions differ from sklearn (max |diff| = {diff})")
+            if args.check_only:
+                continue
+            print(f"  {'batch':>6} | {'sklearn ms':>10} | {'compiled ms':>11} | {'speedup':>7}")
+            for size in args.batch_sizes:
+                batch = X.iloc[:size]
+                values = batch.to_numpy()
+                sk_ms = _median_ms(lambda: model.predict(batch), args.repeat)
+                cp_ms = _median_ms(lambda: compiled.predict(values), args.repeat)
+                print(f"  {size:>6} | {sk_ms:>10.3f} | {cp_ms:>11.3f} | {sk_ms / cp_ms:>6.1f}x")
+
+        quantile_models = load_quantile_models(artifacts_dir)
+        if quantile_models and "gradient_boosting" in args.models:
+            model, feature_cols = load_artifacts("gradient_boosting", artifacts_dir)
+            X = feature_df.dropna(subset=feature_cols)[feature_cols].astype(float)
+            models = {"gradient_boosting": model, **{f"q{level}": m for level, m in quantile_models.items()}}
+            stack = compile_tree_stack(models)
+            got = stack.predict(X.to_numpy())
+            diff = max(float(np.max(np.abs(m.predict(X) - got[name]))) for name, m in models.items())
+            one = X.to_numpy()[:1]
+            stack_ms = _median_ms(lambda: stack.predict(one), args.repeat)
+            print(f"stack point + {len(quantile_models)} quantiles: max |diff| = {diff:.3g}, 1 row {stack_ms:.3f} ms")
+            if diff > 1e-9:
+                raise SystemExit(f"stacked predictions differ from sklearn (max |diff| = {diff})")
+
+
+if __name__ == "__main__":
+    run()
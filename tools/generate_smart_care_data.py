@@ -4,11 +4,19 @@ Script de génération de données Smart Care pour 2022-2026
 Respecte la documentation et les règles du projet Smart Care
 """
 
+import argparse
+import contextlib
+import io
+import itertools
+import json
 import pandas as pd
 import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import random
 import os
+import zlib
 from pathlib import Path
 
 class SmartCareDataGenerator:
@@ -34,13 +42,19 @@ class SmartCareDataGenerator:
 
     def _get_param_float(self, name, default):
         """Récupère un paramètre numérique avec valeur par défaut."""
+        key = (name, default)
+        if key in self._param_floats:
+            return self._param_floats[key]
         value = self.get_parameter(name)
         if value is None:
-            return default
-        try:
-            return self.normalize_number(value)
-        except Exception:
-            return default
+            result = default
+        else:
+            try:
+                result = self.normalize_number(value)
+            except Exception:
+                result = default
+        self._param_floats[key] = result
+        return result
 
     def _year_trend_factor(self, date, base_year=2022):
         """Applique une tendance annuelle douce (par défaut +2%/an)."""
@@ -227,16 +241,91 @@ class SmartCareDataGenerator:
             sep=';'
         )
         
+        self._compile_reference_tables()
         print("✓ Données de référence chargées")
-        
+
+    def _compile_reference_tables(self):
+        """Compile les fichiers de référence en tables de correspondance O(1).
+
+        Les helpers journaliers n'ont plus à filtrer de DataFrame à chaque appel:
+        - ``_params`` / ``_param_floats``: paramètres bruts et valeurs parsées
+        - ``_hospitals``: ligne baseline par hospital_id
+        - ``_weather_by_date``: météo Luxembourg par date AAAAMMJJ
+        - ``_holiday_dates``: dates de vacances Zone C
+        - ``_event_impacts``: bornes d'impact (min, max) par type d'événement
+        - ``_staff_rules``: bornes et poids normalisés par (type, mois)
+        """
+        self._params = {}
+        for name, value in zip(self.parameters['parametre'], self.parameters['valeur']):
+            self._params.setdefault(name, value)
+        self._param_floats = {}
+
+        self._hospitals = {
+            hospital_id: row
+            for hospital_id, row in self.hospital_baseline.drop_duplicates('hospital_id')
+            .set_index('hospital_id', drop=False).iterrows()
+        }
+
+        lux = self.luxembourg_weather.drop_duplicates('Date (AAAAMMJJ)')
+        self._weather_by_date = {}
+        for row in lux.to_dict('records'):
+            self._weather_by_date[int(row['Date (AAAAMMJJ)'])] = {
+                'temperature_moyenne': self.normalize_number(row['Temperature moyenne (C)']),
+                'temperature_min': self.normalize_number(row['Temperature min (C)']),
+                'temperature_max': self.normalize_number(row['Temperature max (C)']),
+                'meteo_principale': row['Meteo'],
+                'humidite': row.get('Moyenne Temp min-max (C)', 0),
+                'vent': row.get('Amplitude thermique (C)', 0),
+                'pression': 1013  # valeur par défaut
+            }
+
+        zone_dates = pd.to_datetime(
+            self.school_holidays.loc[self.school_holidays['zone'] == 'Zone C', 'date'],
+            errors='coerce'
+        ).dropna()
+        self._holiday_dates = set(zone_dates.dt.date)
+
+        self._event_impacts = {}
+        for row in self.special_events.to_dict('records'):
+            self._event_impacts.setdefault(row['evenement_type'], (
+                self.normalize_number(row['impact_admissions_min']),
+                self.normalize_number(row['impact_admissions_max'])
+            ))
+
+        self._staff_rules = {}
+        for (personnel_type, periode), rules in self.staff_variation.groupby(
+            ['type_personnel', 'periode'], sort=False
+        ):
+            if not str(periode).startswith('mois='):
+                continue
+            prob = np.array([self.normalize_number(v) for v in rules['probabilite']])
+            total_prob = prob.sum()
+            if total_prob <= 0:
+                continue
+            self._staff_rules[(personnel_type, int(str(periode)[5:]))] = (
+                np.array([self.normalize_number(v) for v in rules['borne_min']]),
+                np.array([self.normalize_number(v) for v in rules['borne_max']]),
+                prob / total_prob
+            )
+
     def get_parameter(self, name):
         """Récupère une valeur de paramètre"""
-        value = self.parameters[self.parameters['parametre'] == name]['valeur'].values
-        return value[0] if len(value) > 0 else None
+        return self._params.get(name)
     
     def get_hospital_info(self, hospital_id):
         """Récupère les informations d'un hôpital"""
-        return self.hospital_baseline[self.hospital_baseline['hospital_id'] == hospital_id].iloc[0]
+        return self._hospitals[hospital_id]
+
+    def _staff_scale(self, hospital_info):
+        """Facteur d'échelle d'un hôpital synthétique (1 pour la baseline).
+
+        Les bornes de staff_variation sont des effectifs absolus calibrés sur
+        la baseline: elles suivent la taille de l'hôpital comme ses
+        effectifs de référence.
+        """
+        scale = hospital_info.get('facteur_echelle', 1.0)
+        scale = self.normalize_number(scale) if scale is not None else 1.0
+        return scale if np.isfinite(scale) and scale > 0 else 1.0
     
     def normalize_number(self, value):
         """Normalise les nombres avec virgule en point"""
@@ -263,25 +352,8 @@ class SmartCareDataGenerator:
     
     def get_weather_from_luxembourg(self, date):
         """Extrait les données météo du fichier Luxembourg pour une date donnée"""
-        date_str = date.strftime('%Y%m%d')
-        
-        # Chercher dans les données Luxembourg
-        matching = self.luxembourg_weather[
-            self.luxembourg_weather['Date (AAAAMMJJ)'] == int(date_str)
-        ]
-        
-        if len(matching) > 0:
-            row = matching.iloc[0]
-            return {
-                'temperature_moyenne': self.normalize_number(row['Temperature moyenne (C)']),
-                'temperature_min': self.normalize_number(row['Temperature min (C)']),
-                'temperature_max': self.normalize_number(row['Temperature max (C)']),
-                'meteo_principale': row['Meteo'],
-                'humidite': row.get('Moyenne Temp min-max (C)', 0),
-                'vent': row.get('Amplitude thermique (C)', 0),
-                'pression': 1013  # valeur par défaut
-            }
-        return None
+        weather = self._weather_by_date.get(date.year * 10000 + date.month * 100 + date.day)
+        return dict(weather) if weather is not None else None
     
     def get_weather_data(self, date):
         """Récupère ou génère les données météo pour une date"""
@@ -327,17 +399,9 @@ class SmartCareDataGenerator:
     def is_school_holiday(self, date):
         """Vérifie si la date est durant les vacances scolaires"""
         # Zone C (Paris) pour Luxembourg proche de France
-        zone = 'Zone C'
-        
-        holidays_zone = self.school_holidays[self.school_holidays['zone'] == zone]
-        
-        for _, row in holidays_zone.iterrows():
-            try:
-                holiday_date = pd.to_datetime(row['date']).date()
-                if date == holiday_date:
-                    return 1
-            except:
-                pass
+        day_value = date.date() if isinstance(date, datetime) else date
+        if day_value in self._holiday_dates:
+            return 1
         
         # Marques les périodes de vacances scolaires connues
         month = date.month
@@ -388,30 +452,20 @@ class SmartCareDataGenerator:
             ref_value *= vacation_factor
         
         # Appliquer les variations mensuelles
-        month = date.month
-        staff_rules = self.staff_variation[
-            (self.staff_variation['type_personnel'] == personnel_type) &
-            (self.staff_variation['periode'] == f'mois={month:02d}')
-        ]
+        staff_rules = self._staff_rules.get((personnel_type, date.month))
         
-        if len(staff_rules) > 0:
-            # Convertir les probabilités en nombres
-            staff_rules_copy = staff_rules.copy()
-            staff_rules_copy['probabilite_num'] = staff_rules_copy['probabilite'].apply(self.normalize_number)
-            total_prob = staff_rules_copy['probabilite_num'].sum()
-            
-            if total_prob > 0:
-                weighted_value = 0
-                for _, rule in staff_rules_copy.iterrows():
-                    min_val = self.normalize_number(rule['borne_min'])
-                    max_val = self.normalize_number(rule['borne_max'])
-                    prob = rule['probabilite_num']
-                    weighted_value += np.random.uniform(min_val, max_val) * (prob / total_prob)
-                base_staff = weighted_value
-                # Ajouter du bruit journalier contrôlé
-                noise_rate = self._get_param_float('taux_bruit_staff', 0.06)
-                noise = np.random.normal(0, base_staff * noise_rate)
-                return max(0, int(base_staff + noise))
+        if staff_rules is not None:
+            mins, maxs, weights = staff_rules
+            scale = self._staff_scale(hospital_info)
+            mins, maxs = mins * scale, maxs * scale
+            weighted_value = 0
+            for min_val, max_val, weight in zip(mins, maxs, weights):
+                weighted_value += np.random.uniform(min_val, max_val) * weight
+            base_staff = weighted_value
+            # Ajouter du bruit journalier contrôlé
+            noise_rate = self._get_param_float('taux_bruit_staff', 0.06)
+            noise = np.random.normal(0, base_staff * noise_rate)
+            return max(0, int(base_staff + noise))
 
         # Si pas de règle trouvée, utiliser la valeur de référence ajustée + bruit
         noise_rate = self._get_param_float('taux_bruit_staff', 0.06)
@@ -446,11 +500,9 @@ class SmartCareDataGenerator:
         event_impact = 0
         for event in events:
             if event != 'Aucun':
-                event_row = self.special_events[self.special_events['evenement_type'] == event]
-                if len(event_row) > 0:
-                    impact_min = self.normalize_number(event_row.iloc[0]['impact_admissions_min'])
-                    impact_max = self.normalize_number(event_row.iloc[0]['impact_admissions_max'])
-                    event_impact += np.random.uniform(impact_min, impact_max)
+                bounds = self._event_impacts.get(event)
+                if bounds is not None:
+                    event_impact += np.random.uniform(bounds[0], bounds[1])
         
         # Vacances scolaires - baisse des admissions
         vacation_factor = 0.92 if self.is_school_holiday(date) else 1.0
@@ -611,11 +663,9 @@ class SmartCareDataGenerator:
             impact = 0.0
             for event in events:
                 if event != 'Aucun':
-                    event_row = self.special_events[self.special_events['evenement_type'] == event]
-                    if len(event_row) > 0:
-                        impact_min = self.normalize_number(event_row.iloc[0]['impact_admissions_min'])
-                        impact_max = self.normalize_number(event_row.iloc[0]['impact_admissions_max'])
-                        impact += np.random.uniform(impact_min, impact_max)
+                    bounds = self._event_impacts.get(event)
+                    if bounds is not None:
+                        impact += np.random.uniform(bounds[0], bounds[1])
             
             # Calculer les effectifs
             admissions = self.calculate_admissions(date, hospital_info, events, weather)
@@ -683,6 +733,350 @@ class SmartCareDataGenerator:
         
         return pd.DataFrame(daily_data), pd.DataFrame(weather_data)
     
+    # ------------------------------------------------------------------
+    # Moteur vectorisé: toutes les colonnes calculées sur la plage complète
+    # ------------------------------------------------------------------
+
+    def _school_holiday_mask(self, dates):
+        """Vacances scolaires (Zone C + périodes connues) pour un DatetimeIndex."""
+        month = dates.month.to_numpy()
+        day = dates.day.to_numpy()
+        mask = dates.normalize().isin(pd.to_datetime(list(self._holiday_dates)))
+        mask |= ((month == 12) & (day >= 20)) | ((month == 1) & (day <= 5))
+        mask |= (month == 2) & (day >= 13) & (day <= 24)
+        mask |= (month == 4) & (day >= 10) & (day <= 24)
+        mask |= np.isin(month, [7, 8])
+        mask |= ((month == 10) & (day >= 25)) | ((month == 11) & (day <= 3))
+        return mask.astype(int)
+
+    def _season_array(self, dates):
+        """Saison pour chaque date (même découpage que get_season)."""
+        seasons = np.array(['Hiver', 'Printemps', 'Été', 'Automne'])
+        month = dates.month.to_numpy()
+        idx = np.select(
+            [np.isin(month, [12, 1, 2]), np.isin(month, [3, 4, 5]), np.isin(month, [6, 7, 8])],
+            [0, 1, 2],
+            default=3
+        )
+        return seasons[idx]
+
+    def _temperature_factor_array(self, temperature_moyenne):
+        """Version vectorisée de _temperature_factor (même ordre des seuils)."""
+        t = temperature_moyenne
+        return np.select(
+            [t <= -2, t <= 2, t >= 32, t >= 27],
+            [1.12, 1.06, 1.15, 1.08],
+            default=1.0
+        )
+
+    def _weather_arrays(self, dates, season, rng):
+        """Météo Luxembourg par jointure, complétée par une génération saisonnière."""
+        n = len(dates)
+        lux = self.luxembourg_weather.drop_duplicates('Date (AAAAMMJJ)').set_index('Date (AAAAMMJJ)')
+        keys = dates.strftime('%Y%m%d').astype(int)
+        matched = lux.reindex(keys)
+        found = matched['Meteo'].notna().to_numpy()
+
+        def _num(col):
+            return pd.to_numeric(
+                matched[col].astype(str).str.replace(',', '.', regex=False), errors='coerce'
+            ).to_numpy()
+
+        weather = {
+            'temperature_moyenne': _num('Temperature moyenne (C)'),
+            'temperature_min': _num('Temperature min (C)'),
+            'temperature_max': _num('Temperature max (C)'),
+            'meteo_principale': matched['Meteo'].to_numpy(dtype=object),
+            'humidite': matched['Moyenne Temp min-max (C)'].to_numpy(dtype=object),
+            'vent': matched['Amplitude thermique (C)'].to_numpy(dtype=object),
+            'pression': np.full(n, 1013, dtype=object),
+        }
+
+        missing = ~found
+        if missing.any():
+            temp_ranges = {
+                'Hiver': (0, 10),
+                'Printemps': (8, 18),
+                'Été': (18, 28),
+                'Automne': (10, 18)
+            }
+            weather_options = {
+                'Hiver': ['Gris', 'Froid', 'Neige', 'Pluie'],
+                'Printemps': ['Frais', 'Pluie', 'Soleil'],
+                'Été': ['Soleil', 'Chaud', 'Orageux'],
+                'Automne': ['Nuageux', 'Pluie', 'Frais']
+            }
+            lo = np.array([temp_ranges[s][0] for s in season], dtype=float)
+            hi = np.array([temp_ranges[s][1] for s in season], dtype=float)
+            m = int(missing.sum())
+            lo_m, hi_m = lo[missing], hi[missing]
+            weather['temperature_moyenne'][missing] = np.round(rng.uniform(lo_m, hi_m, m), 1)
+            weather['temperature_min'][missing] = np.round(rng.uniform(lo_m - 3, lo_m, m), 1)
+            weather['temperature_max'][missing] = np.round(rng.uniform(hi_m, hi_m + 3, m), 1)
+            meteo = weather['meteo_principale']
+            for name, options in weather_options.items():
+                sel = missing & (season == name)
+                if sel.any():
+                    meteo[sel] = rng.choice(options, size=int(sel.sum()))
+            weather['humidite'][missing] = np.round(rng.uniform(40, 95, m), 1)
+            weather['vent'][missing] = np.round(rng.uniform(5, 30, m), 1)
+            weather['pression'][missing] = np.round(rng.uniform(1000, 1025, m), 1)
+        return weather
+
+    def _event_matrix(self, dates, season, temperature_min, temperature_max, rng):
+        """Matrice booléenne (jours x événements) dans l'ordre de detect_events."""
+        n = len(dates)
+        masks = {}
+
+        def _add(name, mask):
+            masks[name] = masks[name] | mask if name in masks else mask
+
+        for evenement in self.event_rules['evenement_type']:
+            if evenement == 'Epidemie_grippe':
+                _add(evenement, season == 'Hiver')
+            elif evenement == 'Vague_froid':
+                _add(evenement, temperature_min <= 0)
+            elif evenement == 'Canicule':
+                _add(evenement, temperature_max >= 25)
+
+        random_events = {
+            'Accident_majeur': self._get_param_float('prob_event_accident_majeur', 0.002),
+            'Greve_personnel': self._get_param_float('prob_event_greve_personnel', 0.003),
+            'Pic_pollution': self._get_param_float('prob_event_pic_pollution', 0.005),
+        }
+        for evt, prob in random_events.items():
+            _add(evt, rng.random(n) < prob)
+
+        fixed_events = [
+            ('Tension_hiver_2022', '2022-01-10', '2022-03-15'),
+            ('Plan_blanc_covid_leve_2022', '2022-03-15', '2022-03-31'),
+            ('Canicule_IDF_2022', '2022-07-18', '2022-07-19'),
+            ('Triple_epidemie_hiver_2022', '2022-11-15', '2023-01-31'),
+            ('Coupe_monde_rugby_2023', '2023-09-08', '2023-10-28'),
+            ('JO_Paris_2024', '2024-07-26', '2024-08-11'),
+            ('Plan_blanc_hiver_2024_2025', '2024-12-15', '2025-02-15'),
+            ('Tension_ete_2025', '2025-07-01', '2025-08-31'),
+        ]
+        for evt, start_str, end_str in fixed_events:
+            _add(evt, np.asarray((dates >= pd.Timestamp(start_str)) & (dates <= pd.Timestamp(end_str))))
+
+        names = list(masks)
+        matrix = np.column_stack([masks[name] for name in names]) if names else np.zeros((n, 0), bool)
+        return names, matrix
+
+    def _event_impact_draw(self, names, matrix, rng):
+        """Somme des impacts tirés uniformément pour les événements actifs."""
+        impact = np.zeros(matrix.shape[0])
+        for k, name in enumerate(names):
+            bounds = self._event_impacts.get(name)
+            if bounds is None:
+                continue
+            impact += matrix[:, k] * rng.uniform(bounds[0], bounds[1], matrix.shape[0])
+        return impact
+
+    def _staff_array(self, hospital_info, dates, holidays, personnel_type, rng):
+        """Version vectorisée de get_staff_availability sur toute la plage."""
+        n = len(dates)
+        reference = {
+            'medecin': hospital_info['nb_medecins_reference'],
+            'infirmier': hospital_info['nb_infirmiers_reference'],
+            'aide_soignant': hospital_info['nb_aides_soignants_reference']
+        }
+        ref_value = np.full(n, self.normalize_number(reference.get(personnel_type, 0)))
+
+        staff_trend = self._get_param_float('tendance_annuelle_staff', -0.05)
+        years_diff = np.maximum(0, dates.year.to_numpy() - 2022)
+        ref_value *= (1 + staff_trend) ** years_diff
+        staff_season_amp = self._get_param_float('amplitude_saisonnalite_staff', 0.03)
+        ref_value *= 1 + staff_season_amp * np.sin(2 * np.pi * (dates.dayofyear.to_numpy() / 365.0))
+        vacation_factor = self._get_param_float('facteur_vacances_staff', 0.92)
+        ref_value = np.where(holidays == 1, ref_value * vacation_factor, ref_value)
+
+        # Règles mensuelles: tableau (mois, règle) de bornes et poids normalisés
+        per_month = {
+            month: self._staff_rules[(personnel_type, month)]
+            for month in range(1, 13)
+            if (personnel_type, month) in self._staff_rules
+        }
+
+        base_staff = ref_value
+        if per_month:
+            width = max(len(v[2]) for v in per_month.values())
+            lo = np.zeros((13, width))
+            hi = np.zeros((13, width))
+            weight = np.zeros((13, width))
+            has_rules = np.zeros(13, dtype=bool)
+            for month, (mins, maxs, weights) in per_month.items():
+                lo[month, :len(mins)] = mins
+                hi[month, :len(maxs)] = maxs
+                weight[month, :len(weights)] = weights
+                has_rules[month] = True
+            scale = self._staff_scale(hospital_info)
+            lo *= scale
+            hi *= scale
+            month = dates.month.to_numpy()
+            draws = rng.uniform(lo[month], hi[month])
+            weighted = (draws * weight[month]).sum(axis=1)
+            base_staff = np.where(has_rules[month], weighted, ref_value)
+
+        noise_rate = self._get_param_float('taux_bruit_staff', 0.06)
+        noise = rng.normal(0, base_staff * noise_rate)
+        return np.maximum(0, np.trunc(base_staff + noise)).astype(int)
+
+    def generate_daily_data_vectorized(self, start_date, end_date, hospital_id, rng=None,
+                                       hospital_info=None):
+        """Génère les données journalières avec le moteur vectorisé.
+
+        Produit les mêmes colonnes que generate_daily_data avec les mêmes lois
+        de tirage; seule la récurrence AR(1) des admissions/urgences reste une
+        boucle. ``rng`` accepte un ``np.random.Generator`` (module ``np.random``
+        par défaut, donc sensible à ``np.random.seed``). ``hospital_info``
+        remplace la ligne de hospital_baseline (hôpitaux synthétiques de
+        build_scaled_hospitals).
+        """
+        rng = np.random if rng is None else rng
+        if hospital_info is None:
+            hospital_info = self.get_hospital_info(hospital_id)
+        dates = pd.date_range(start=start_date, end=end_date, freq='D')
+        n = len(dates)
+
+        print(f"Génération vectorisée du {start_date.date()} au {end_date.date()}...")
+
+        # Chocs rares (afflux massif / incident local)
+        shock_prob = self._get_param_float('prob_choc_afflux', 0.006)
+        shock = rng.random(n) < shock_prob
+        shock_adm = np.where(shock, rng.uniform(1.15, 1.40, n), 1.0)
+        shock_urg = np.where(shock, rng.uniform(1.20, 1.55, n), 1.0)
+
+        season = self._season_array(dates)
+        holidays = self._school_holiday_mask(dates)
+        weather = self._weather_arrays(dates, season, rng)
+        t_moy = weather['temperature_moyenne'].astype(float)
+        t_min = weather['temperature_min'].astype(float)
+        t_max = weather['temperature_max'].astype(float)
+
+        names, events = self._event_matrix(dates, season, t_min, t_max, rng)
+        has_event = events.any(axis=1)
+        event_names = np.array(names + ['Aucun'], dtype=object)
+        first_event = np.where(has_event, events.argmax(axis=1), len(names))
+        event_principal = event_names[first_event]
+        impact = self._event_impact_draw(names, events, rng)
+        # Tirage indépendant utilisé par calculate_admissions (comme le moteur historique)
+        event_impact = self._event_impact_draw(names, events, rng)
+
+        # Facteurs communs admissions / urgences
+        years_diff = np.maximum(0, dates.year.to_numpy() - 2022)
+        trend = (1 + self._get_param_float('tendance_annuelle_admissions', 0.02)) ** years_diff
+        amplitude = self._get_param_float('amplitude_saisonnalite', 0.08)
+        month_factors = np.array([1.0, 1.05, 1.06, 1.02, 0.98, 0.97, 0.98, 0.95, 0.94, 1.00, 1.02, 1.03, 1.06])
+        seasonality = (
+            (1 + amplitude * np.sin(2 * np.pi * (dates.dayofyear.to_numpy() / 365.0)))
+            * month_factors[dates.month.to_numpy()]
+        )
+        temp_factor = self._temperature_factor_array(t_moy)
+        weekday = dates.weekday.to_numpy()
+        is_holiday = holidays == 1
+
+        base_admissions = self.normalize_number(hospital_info['admissions_moyennes_jour']) * trend * seasonality
+        noise_rate = self.normalize_number(self.get_parameter('taux_bruit_admissions'))
+        noise = rng.normal(0, base_admissions * noise_rate)
+        weekday_factors = np.array([1.05, 1.02, 1.00, 1.00, 0.98, 0.88, 0.85])
+        expected_adm = (
+            base_admissions * weekday_factors[weekday] * np.where(is_holiday, 0.92, 1.0)
+            * temp_factor * (1 + event_impact) * shock_adm
+        )
+
+        base_urgences = self.normalize_number(hospital_info['passages_urgences_moyens_jour']) * trend * seasonality
+        daily_factors = np.array([1.0, 1.0, 1.0, 1.0, 1.10, 1.15, 1.08])
+        expected_urg = (
+            base_urgences * temp_factor * daily_factors[weekday]
+            * np.where(is_holiday, 1.05, 1.0) * shock_urg
+        )
+
+        # Récurrence AR(1): seule boucle restante
+        ar_adm = self._get_param_float('poids_autocorrelation_admissions', 0.25)
+        ar_urg = self._get_param_float('poids_autocorrelation_urgences', 0.20)
+        admissions = np.empty(n, dtype=int)
+        urgences = np.empty(n, dtype=int)
+        prev_adm = None
+        prev_urg = None
+        for i in range(n):
+            exp_adm = expected_adm[i]
+            exp_urg = expected_urg[i]
+            if prev_adm is not None:
+                exp_adm = (1 - ar_adm) * exp_adm + ar_adm * prev_adm
+                exp_urg = (1 - ar_urg) * exp_urg + ar_urg * prev_urg
+            prev_adm = int(exp_adm + noise[i])
+            prev_urg = int(exp_urg)
+            admissions[i] = max(prev_adm, 100)
+            urgences[i] = max(prev_urg, 300)
+        self._prev_admissions = prev_adm
+        self._prev_urgences = prev_urg
+
+        # Occupation des lits
+        total_lits = self.normalize_number(hospital_info['lits_total_mco'])
+        duree_moyenne = self.normalize_number(hospital_info['duree_sejour_moyenne'])
+        lits_occupes = np.trunc(np.minimum(
+            total_lits * 0.75 + rng.normal(0, total_lits * 0.1, n),
+            total_lits * 0.95
+        )).astype(int)
+
+        medecins = self._staff_array(hospital_info, dates, holidays, 'medecin', rng)
+        infirmiers = self._staff_array(hospital_info, dates, holidays, 'infirmier', rng)
+        aides = self._staff_array(hospital_info, dates, holidays, 'aide_soignant', rng)
+        total_personnel_ref = (
+            self.normalize_number(hospital_info['nb_medecins_reference']) +
+            self.normalize_number(hospital_info['nb_infirmiers_reference']) +
+            self.normalize_number(hospital_info['nb_aides_soignants_reference'])
+        )
+        if total_personnel_ref > 0:
+            taux_couverture = (medecins + infirmiers + aides) / total_personnel_ref
+        else:
+            taux_couverture = np.full(n, 0.85)
+
+        day_names = np.array(['Lundi', 'Mardi', 'Mercredi', 'Jeudi', 'Vendredi', 'Samedi', 'Dimanche'])
+        date_values = dates.date
+        daily = pd.DataFrame({
+            'date': date_values,
+            'jour_semaine': day_names[weekday],
+            'jour_mois': dates.day.to_numpy(),
+            'semaine_annee': dates.isocalendar().week.to_numpy().astype(int),
+            'mois': dates.month.to_numpy(),
+            'annee': dates.year.to_numpy(),
+            'saison': season,
+            'vacances_scolaires': holidays,
+            'temperature_moyenne': t_moy,
+            'temperature_min': t_min,
+            'temperature_max': t_max,
+            'meteo_principale': weather['meteo_principale'],
+            'indice_chaleur': np.where(t_max > 25, t_max - 25, 0),
+            'indice_froid': np.where(t_min < 0, -t_min, 0),
+            'lits_total': int(total_lits),
+            'lits_occupes': lits_occupes,
+            'taux_occupation_lits': np.round(lits_occupes / total_lits, 2),
+            'nb_medecins_disponibles': medecins,
+            'nb_infirmiers_disponibles': infirmiers,
+            'nb_aides_soignants_disponibles': aides,
+            'taux_couverture_personnel': np.round(taux_couverture, 2),
+            'nombre_admissions': admissions,
+            'nombre_passages_urgences': urgences,
+            'nombre_hospitalisations': (admissions * 0.65).astype(int),
+            'nombre_sorties': np.maximum(1, (lits_occupes / duree_moyenne).astype(int)),
+            'evenement_special': event_principal,
+            'impact_evenement_estime': np.round(impact, 2),
+        })
+        weather_df = pd.DataFrame({
+            'date': date_values,
+            'temperature_moyenne': t_moy,
+            'temperature_min': t_min,
+            'temperature_max': t_max,
+            'meteo_principale': weather['meteo_principale'],
+            'vent': weather['vent'],
+            'humidite': weather['humidite'],
+            'pression': weather['pression'],
+        })
+        return daily, weather_df
+
     def generate_school_holidays(self):
         """Génère les dates de vacances scolaires pour 2022-2026"""
         holidays = []
@@ -1033,8 +1427,12 @@ class SmartCareDataGenerator:
         
         return pd.DataFrame(variations)
     
-    def generate_all_years(self):
-        """Génère les données pour 2022, 2023, 2024, 2025 et 2026"""
+    def generate_all_years(self, engine='python', rng=None):
+        """Génère les données pour 2022, 2023, 2024, 2025 et 2026
+
+        ``engine`` vaut ``'python'`` (boucle jour par jour historique) ou
+        ``'vectorized'`` (generate_daily_data_vectorized, avec ``rng`` optionnel).
+        """
         hospital_id = self.get_parameter('hospital_reference')
         
         all_daily_data = []
@@ -1053,7 +1451,12 @@ class SmartCareDataGenerator:
                 end_date = pd.Timestamp(year=year, month=12, day=31)
             
             # Générer les données journalières et météo
-            year_data, year_weather = self.generate_daily_data(start_date, end_date, hospital_id)
+            if engine == 'vectorized':
+                year_data, year_weather = self.generate_daily_data_vectorized(
+                    start_date, end_date, hospital_id, rng=rng
+                )
+            else:
+                year_data, year_weather = self.generate_daily_data(start_date, end_date, hospital_id)
             all_daily_data.append(year_data)
             all_weather_data.append(year_weather)
         
@@ -1067,31 +1470,381 @@ class SmartCareDataGenerator:
         """Sauvegarde les données générées"""
         print(f"\nSauvegarde des données dans {output_path}...")
         
-        # Convertir les dates en string si la colonne existe
-        df_save = df.copy()
-        if 'date' in df_save.columns:
-            df_save['date'] = df_save['date'].astype(str)
-        
-        # Remplacer les décimales (. en ,) pour les nombres décimaux
-        float_cols = [col for col in df_save.columns if col in [
-            'temperature_moyenne', 'temperature_min', 'temperature_max', 
-            'indice_chaleur', 'indice_froid', 'taux_occupation_lits', 
-            'taux_couverture_personnel', 'impact_evenement_estime',
-            'impact_admissions_min', 'impact_admissions_max',
-            'borne_min', 'borne_max', 'probabilite'
-        ]]
-        
-        for col in float_cols:
-            if col in df_save.columns:
-                df_save[col] = df_save[col].apply(lambda x: str(x).replace('.', ','))
+        # Dates en texte et décimales (. en ,) pour les nombres décimaux
+        df_save = format_for_csv(df)
         
         # Sauvegarder sans index et avec séparateur virgule
         df_save.to_csv(output_path, index=False, sep=',', encoding='utf-8')
         print(f"✓ Données sauvegardées: {output_path}")
 
 
-def main():
+# ----------------------------------------------------------------------
+# Écriture en flux (CSV à virgule décimale ou Parquet par row groups)
+# ----------------------------------------------------------------------
+
+DECIMAL_COMMA_COLUMNS = [
+    'temperature_moyenne', 'temperature_min', 'temperature_max',
+    'indice_chaleur', 'indice_froid', 'taux_occupation_lits',
+    'taux_couverture_personnel', 'impact_evenement_estime',
+    'impact_admissions_min', 'impact_admissions_max',
+    'borne_min', 'borne_max', 'probabilite'
+]
+
+
+def format_for_csv(df):
+    """Prépare un DataFrame pour le CSV projet (dates en texte, décimales à virgule).
+
+    Conversion vectorisée colonne par colonne (``astype(str)`` puis remplacement),
+    au lieu d'un ``apply`` cellule par cellule.
+    """
+    df_save = df.copy()
+    if 'date' in df_save.columns:
+        df_save['date'] = df_save['date'].astype(str)
+    for col in DECIMAL_COMMA_COLUMNS:
+        if col in df_save.columns:
+            df_save[col] = df_save[col].astype(str).str.replace('.', ',', regex=False)
+    return df_save
+
+
+class ChunkedWriter:
+    """Écrit des DataFrames successifs dans un seul fichier, sans les concaténer.
+
+    - ``csv``: en-tête au premier chunk puis ajout, décimales à virgule.
+    - ``parquet``: un row group par chunk (``pyarrow`` requis), schéma fixé
+      par le premier chunk.
+
+    Le fichier est écrit sous un nom temporaire puis renommé à la fermeture.
+    """
+
+    def __init__(self, output_path, fmt='csv'):
+        if fmt not in ('csv', 'parquet'):
+            raise ValueError(f"Format inconnu: {fmt} (attendu: csv ou parquet)")
+        self.output_path = Path(output_path)
+        self.fmt = fmt
+        self.rows = 0
+        self._tmp_path = self.output_path.with_name(f".{self.output_path.name}.tmp")
+        self._handle = None
+        self._parquet_writer = None
+        self._schema = None
+
+    def write(self, df):
+        """Ajoute un chunk au fichier."""
+        if self.fmt == 'csv':
+            if self._handle is None:
+                self.output_path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = open(self._tmp_path, 'w', encoding='utf-8', newline='')
+                header = True
+            else:
+                header = False
+            format_for_csv(df).to_csv(self._handle, index=False, sep=',', header=header)
+        else:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as exc:
+                raise ImportError("Le format parquet nécessite pyarrow.") from exc
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self.output_path.parent.mkdir(parents=True, exist_ok=True)
+                self._schema = table.schema
+                self._parquet_writer = pq.ParquetWriter(self._tmp_path, self._schema)
+            else:
+                table = table.cast(self._schema)
+            self._parquet_writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        """Finalise le fichier (renommage atomique)."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._tmp_path.exists():
+            os.replace(self._tmp_path, self.output_path)
+
+    def abort(self):
+        """Abandonne l'écriture et supprime le fichier temporaire."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._tmp_path.exists():
+            self._tmp_path.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+# ----------------------------------------------------------------------
+# Génération parallèle multi-hôpitaux / multi-années
+# ----------------------------------------------------------------------
+
+DEFAULT_YEARS = [2022, 2023, 2024, 2025, 2026]
+DEFAULT_END_DATE = '2026-01-31'
+
+_WORKER_GENERATOR = None
+
+
+def _init_worker(base_path):
+    """Initialise un générateur par processus (référentiels chargés une fois)."""
+    global _WORKER_GENERATOR
+    with contextlib.redirect_stdout(io.StringIO()):
+        _WORKER_GENERATOR = SmartCareDataGenerator(base_path)
+
+
+def hospital_year_seed(seed, hospital_id, year):
+    """SeedSequence indépendante et stable pour un couple (hôpital, année).
+
+    Équivaut à l'enfant ``spawn_key=(crc32(hospital_id), year)`` de
+    ``SeedSequence(seed)``: le flux ne dépend ni de l'ordre des tâches ni du
+    nombre de workers.
+    """
+    return np.random.SeedSequence(seed, spawn_key=(zlib.crc32(str(hospital_id).encode('utf-8')), int(year)))
+
+
+def _year_bounds(year, end_date=DEFAULT_END_DATE):
+    """Bornes de génération d'une année, tronquées à ``end_date``."""
+    start = pd.Timestamp(year=year, month=1, day=1)
+    end = min(pd.Timestamp(year=year, month=12, day=31), pd.Timestamp(end_date))
+    return start, end
+
+
+def _generate_hospital_year(task):
+    """Tâche worker: une année d'un hôpital avec son propre Generator."""
+    hospital_id, year, seed, end_date = task
+    start, end = _year_bounds(year, end_date)
+    rng = np.random.default_rng(hospital_year_seed(seed, hospital_id, year))
+    with contextlib.redirect_stdout(io.StringIO()):
+        daily, _ = _WORKER_GENERATOR.generate_daily_data_vectorized(start, end, hospital_id, rng=rng)
+    daily.insert(0, 'hospital_id', hospital_id)
+    return hospital_id, year, daily
+
+
+def iter_hospital_years(base_path, hospital_ids, years=None, seed=42,
+                        max_workers=None, end_date=DEFAULT_END_DATE, max_in_flight=None):
+    """Génère (hospital_id, année, DataFrame) dans un pool de processus.
+
+    Les résultats sont produits dans l'ordre (hôpital, année) quel que soit
+    l'ordre d'exécution, et sont identiques pour une même ``seed``. Au plus
+    ``max_in_flight`` tâches (défaut: 2 x workers) sont soumises à la fois, ce
+    qui borne la mémoire quand le consommateur écrit plus lentement.
+    """
+    years = DEFAULT_YEARS if years is None else years
+    tasks = [
+        (hospital_id, year, seed, end_date)
+        for hospital_id in hospital_ids
+        for year in years
+        if _year_bounds(year, end_date)[0] <= _year_bounds(year, end_date)[1]
+    ]
+    workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max(1, max_in_flight or 2 * workers)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(base_path,)
+    ) as executor:
+        task_iter = iter(tasks)
+        pending = deque(
+            executor.submit(_generate_hospital_year, task)
+            for task in itertools.islice(task_iter, max_in_flight)
+        )
+        while pending:
+            result = pending.popleft().result()
+            next_task = next(task_iter, None)
+            if next_task is not None:
+                pending.append(executor.submit(_generate_hospital_year, next_task))
+            yield result
+
+
+def generate_hospitals_parallel(base_path, hospital_ids, years=None, seed=42,
+                                max_workers=None, end_date=DEFAULT_END_DATE):
+    """Concatène la génération parallèle en un seul DataFrame (colonne hospital_id)."""
+    frames = [
+        daily for _, _, daily in iter_hospital_years(
+            base_path, hospital_ids, years=years, seed=seed,
+            max_workers=max_workers, end_date=end_date
+        )
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def stream_hospitals_to_file(base_path, hospital_ids, output_path, fmt='csv', years=None,
+                             seed=42, max_workers=None, end_date=DEFAULT_END_DATE,
+                             max_in_flight=None):
+    """Génère en parallèle et écrit chaque (hôpital, année) dès qu'il est prêt.
+
+    Retourne le nombre de lignes écrites.
+    """
+    with ChunkedWriter(output_path, fmt=fmt) as writer:
+        for _, _, daily in iter_hospital_years(
+            base_path, hospital_ids, years=years, seed=seed, max_workers=max_workers,
+            end_date=end_date, max_in_flight=max_in_flight
+        ):
+            writer.write(daily)
+    return writer.rows
+
+
+# ----------------------------------------------------------------------
+# Profil de montée en charge: N hôpitaux synthétiques x M années
+# ----------------------------------------------------------------------
+
+SCALED_BASELINE_COLUMNS = [
+    'lits_total_mco', 'lits_urgences', 'lits_reanimation', 'lits_ssr',
+    'nb_medecins_reference', 'nb_infirmiers_reference', 'nb_aides_soignants_reference',
+    'admissions_moyennes_jour', 'passages_urgences_moyens_jour'
+]
+
+
+def build_scaled_hospitals(hospital_baseline, n_hospitals, seed=42, scale_range=(0.5, 1.5)):
+    """Crée ``n_hospitals`` hôpitaux synthétiques à partir de hospital_baseline.
+
+    Chaque hôpital reprend cycliquement une ligne de référence et multiplie
+    ses capacités (lits, personnel, admissions, urgences) par un facteur tiré
+    d'un flux dédié à son identifiant (reproductible, indépendant de N).
+    """
+    templates = hospital_baseline.to_dict('records')
+    hospitals = {}
+    for i in range(n_hospitals):
+        hospital_id = f'HOP_S{i + 1:05d}'
+        template = templates[i % len(templates)]
+        rng = np.random.default_rng(
+            np.random.SeedSequence(seed, spawn_key=(zlib.crc32(hospital_id.encode('utf-8')),))
+        )
+        scale = float(rng.uniform(*scale_range))
+        row = dict(template)
+        row['hospital_id'] = hospital_id
+        row['hospital_nom'] = f"{template['hospital_nom']} (x{scale:.2f})"
+        for col in SCALED_BASELINE_COLUMNS:
+            if col in row:
+                row[col] = max(1, int(round(float(str(row[col]).replace(',', '.')) * scale)))
+        row['facteur_echelle'] = round(scale, 4)
+        hospitals[hospital_id] = row
+    return hospitals
+
+
+def _write_partition(task):
+    """Tâche worker: génère une année d'un hôpital et l'écrit dans sa partition."""
+    hospital_id, hospital_row, year, seed, output_dir, fmt = task
+    start, end = _year_bounds(year, f'{year}-12-31')
+    rng = np.random.default_rng(hospital_year_seed(seed, hospital_id, year))
+    with contextlib.redirect_stdout(io.StringIO()):
+        daily, _ = _WORKER_GENERATOR.generate_daily_data_vectorized(
+            start, end, hospital_id, rng=rng, hospital_info=pd.Series(hospital_row)
+        )
+    part_dir = Path(output_dir) / f'hospital_id={hospital_id}'
+    part_dir.mkdir(parents=True, exist_ok=True)
+    with ChunkedWriter(part_dir / f'year={year}.{fmt}', fmt=fmt) as writer:
+        writer.write(daily)
+    return len(daily)
+
+
+def generate_scale_profile(base_path, output_dir, n_hospitals, n_years, end_year=2025,
+                           seed=42, fmt='csv', max_workers=None, max_in_flight=None):
+    """Génère un dataset partitionné ``hospital_id=<id>/year=<année>.<fmt>``.
+
+    Chaque (hôpital, année) est écrit directement par son worker: rien n'est
+    concaténé en mémoire. Un ``profile.json`` décrit le jeu produit.
+    Retourne le nombre total de lignes.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        reference = SmartCareDataGenerator(base_path)
+    hospitals = build_scaled_hospitals(reference.hospital_baseline, n_hospitals, seed=seed)
+    years = list(range(end_year - n_years + 1, end_year + 1))
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = [
+        (hospital_id, row, year, seed, str(output_dir), fmt)
+        for hospital_id, row in hospitals.items()
+        for year in years
+    ]
+    workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max(1, max_in_flight or 2 * workers)
+    total_rows = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(base_path,)
+    ) as executor:
+        task_iter = iter(tasks)
+        pending = deque(
+            executor.submit(_write_partition, task)
+            for task in itertools.islice(task_iter, max_in_flight)
+        )
+        done = 0
+        while pending:
+            total_rows += pending.popleft().result()
+            done += 1
+            next_task = next(task_iter, None)
+            if next_task is not None:
+                pending.append(executor.submit(_write_partition, next_task))
+            if done % 500 == 0:
+                print(f"  {done}/{len(tasks)} partitions écrites...")
+
+    profile = {
+        'n_hospitals': n_hospitals,
+        'years': years,
+        'seed': seed,
+        'format': fmt,
+        'rows': total_rows,
+        'hospitals': {h: row['facteur_echelle'] for h, row in hospitals.items()},
+    }
+    with open(output_dir / 'profile.json', 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    return total_rows
+
+
+def main(argv=None):
     """Fonction principale"""
+    parser = argparse.ArgumentParser(description="Génère les données Smart Care 2022-2026")
+    parser.add_argument(
+        "--engine",
+        choices=["python", "vectorized"],
+        default="python",
+        help="Moteur de génération (python: jour par jour, vectorized: colonnes en tableaux)"
+    )
+    parser.add_argument(
+        "--hospitals",
+        nargs="+",
+        default=None,
+        help="Mode parallèle: hôpitaux à générer (ids de hospital_baseline, ou 'all')"
+    )
+    parser.add_argument("--years", nargs="+", type=int, default=None, help="Années (mode parallèle)")
+    parser.add_argument("--workers", type=int, default=None, help="Taille du pool (mode parallèle)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed racine (défaut: seed_random)")
+    parser.add_argument("--output", default=None, help="Fichier de sortie (mode parallèle)")
+    parser.add_argument(
+        "--scale-profile",
+        action="store_true",
+        help="Profil de charge: N hôpitaux synthétiques x M années, dataset partitionné"
+    )
+    parser.add_argument("--n-hospitals", type=int, default=200, help="Profil de charge: nombre d'hôpitaux")
+    parser.add_argument("--n-years", type=int, default=30, help="Profil de charge: nombre d'années")
+    parser.add_argument("--end-year", type=int, default=2025, help="Profil de charge: dernière année")
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Profil de charge: dossier racine (défaut: data/partitioned)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Format de sortie du mode parallèle (écriture en flux)"
+    )
+    args = parser.parse_args(argv)
+
     # Chemin de base (dossier data/raw du projet)
     base_path = Path(__file__).resolve().parents[1] / "data" / "raw"
     
@@ -1099,7 +1852,35 @@ def main():
     generator = SmartCareDataGenerator(base_path)
     
     # Définir la seed pour la reproductibilité
-    seed = int(generator.get_parameter('seed_random'))
+    seed = args.seed if args.seed is not None else int(generator.get_parameter('seed_random'))
+
+    if args.scale_profile:
+        output_dir = args.output_dir or Path(__file__).resolve().parents[1] / "data" / "partitioned"
+        print(f"Profil de charge: {args.n_hospitals} hôpitaux x {args.n_years} années -> {output_dir}")
+        rows = generate_scale_profile(
+            base_path, output_dir, args.n_hospitals, args.n_years, end_year=args.end_year,
+            seed=seed, fmt=args.format, max_workers=args.workers
+        )
+        print(f"✓ {rows} lignes écrites ({args.format})")
+        return
+
+    if args.hospitals:
+        # Mode parallèle: un flux Generator indépendant par (hôpital, année)
+        hospital_ids = args.hospitals
+        if hospital_ids == ['all']:
+            hospital_ids = generator.hospital_baseline['hospital_id'].tolist()
+        output_multi = args.output or os.path.join(
+            base_path,
+            f'Jeu de données - Smart Care - daily_hospital_context_multi_generated.{args.format}'
+        )
+        print(f"Écriture en flux dans {output_multi}...")
+        rows = stream_hospitals_to_file(
+            base_path, hospital_ids, output_multi, fmt=args.format,
+            years=args.years, seed=seed, max_workers=args.workers
+        )
+        print(f"✓ Hôpitaux: {len(hospital_ids)} | Lignes: {rows} | Seed: {seed}")
+        return
+
     np.random.seed(seed)
     random.seed(seed)
     
@@ -1110,10 +1891,11 @@ def main():
     print(f"Hôpital: {generator.get_parameter('hospital_reference')}")
     print(f"Mode: {generator.get_parameter('mode_generation')}")
     print(f"Seed: {seed}")
+    print(f"Moteur: {args.engine}")
     print(f"{'='*50}\n")
     
     # Générer les données
-    df_daily, df_weather = generator.generate_all_years()
+    df_daily, df_weather = generator.generate_all_years(engine=args.engine)
     
     # Générer les vacances scolaires
     df_holidays = generator.generate_school_holidays()
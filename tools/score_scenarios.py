@@ -0,0 +1,218 @@
+"""Scorer en lot des scenarios (date, meteo, event, temperature, vacances).
+
+Les scenarios viennent d'un fichier CSV/Parquet ou d'une plage de dates
+croisee avec des listes de meteo/evenements. Ils sont lus par paquets,
+scores en une passe vectorisee par paquet (modele du registre ou Prophet)
+et ecrits au fil de l'eau dans le fichier de sortie (CSV ou Parquet selon
+l'extension), renomme a la fin seulement.
+
+Exemples::
+
+    python tools/score_scenarios.py --input scenarios.csv --output scores.parquet
+    python tools/score_scenarios.py --start 2026-01-01 --end 2026-12-31 \\
+        --meteo Soleil Pluie Neige --event Aucun Epidemie_grippe --model prophet --output scores.csv
+"""
+
+from pathlib import Path
+import sys
+import argparse
+import itertools
+import time
+from typing import Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ml"))
+sys.path.insert(0, str(ROOT / "tools"))
+
+import numpy as np
+import pandas as pd
+
+from generate_smart_care_data import ChunkedWriter
+from smartcare_model.artifacts.cache import ModelCache
+from smartcare_model.config import DEFAULT_MODEL_NAME
+from smartcare_model.config.paths import ARTIFACTS_DIR
+from smartcare_model.inference.compiled import predict_fast
+from smartcare_model.inference.conformal import load_conformal_table
+from smartcare_model.inference.intervals import load_quantile_models, predict_intervals
+from smartcare_model.inference.predict import prepare_prediction_row
+from smartcare_model.inference.scenarios import SCENARIO_COLUMNS, build_scenario_features, normalize_scenarios
+from smartcare_model.inference.similarity import SimilarityIndex
+from smartcare_model.pipeline import build_feature_dataframe, load_raw_dataframe
+
+
+def iter_input_chunks(path: Path, chunk_size: int, sep: str = ",", decimal: str = "."):
+    """Lire un fichier de scenarios par paquets de ``chunk_size`` lignes."""
+    if path.suffix.lower() == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Le format parquet necessite pyarrow.") from exc
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, sep=sep, decimal=decimal, chunksize=chunk_size)
+
+
+def iter_range_chunks(args, chunk_size: int):
+    """Produit cartesien plage de dates x meteo x evenement, par paquets."""
+    dates = pd.date_range(args.start, args.end, freq="D")
+    grid = itertools.product(dates, args.meteo, args.event)
+    while True:
+        rows = list(itertools.islice(grid, chunk_size))
+        if not rows:
+            return
+        chunk = pd.DataFrame(rows, columns=["date", "meteo", "event"])
+        if args.temperature is not None:
+            chunk["temperature"] = args.temperature
+        if args.vacances is not None:
+            chunk["vacances"] = args.vacances
+        yield chunk
+
+
+class RegistryScorer:
+    """Scorer un paquet avec un modele du registre (meme logique que le service)."""
+
+    def __init__(
+        self,
+        name: str,
+        artifacts_dir: Path,
+        raw_df: pd.DataFrame,
+        k: int,
+        intervals: bool = False,
+        coverage: Optional[float] = None,
+    ):
+        self.name = name
+        self.k = k
+        self.coverage = coverage
+        self.conformal = load_conformal_table(artifacts_dir) if coverage is not None else None
+        if coverage is not None and (self.conformal is None or name not in self.conformal.models):
+            raise SystemExit(f"No conformal table for {name} in the current version: retrain with tools/train_poc.py.")
+        cache = ModelCache(artifacts_dir)
+        self.model, self.feature_cols = cache.get(name)
+        self.quantile_models = load_quantile_models(artifacts_dir, cache=cache) if intervals else {}
+        if intervals and not self.quantile_models:
+            raise SystemExit("No quantile models in the current version: retrain with tools/train_poc.py.")
+        self.feature_df = build_feature_dataframe(raw_df)
+        self.index = SimilarityIndex(self.feature_df)
+        self.base_row = prepare_prediction_row(self.feature_df, self.feature_cols)
+
+    def score(self, chunk: pd.DataFrame):
+        scen = normalize_scenarios(chunk, self.base_row)
+        X = build_scenario_features(
+            self.feature_df,
+            self.feature_cols,
+            scen,
+            index=self.index,
+            k=self.k,
+            base_row=self.base_row,
+        )
+        if self.quantile_models:
+            return scen, predict_intervals(self.model, X[self.feature_cols], self.quantile_models)
+        preds = predict_fast(self.model, X[self.feature_cols])
+        if self.conformal is not None:
+            bounds = self.conformal.interval(scen["date"], preds, model_name=self.name, coverage=self.coverage)
+            return scen, {"prediction": preds, **bounds}
+        return scen, {"prediction": preds}
+
+
+class ProphetScorer:
+    """Scorer un paquet avec Prophet (overrides de l'onglet "jour unique")."""
+
+    def __init__(self, artifacts_dir: Path):
+        from smartcare_model.prophet import build_prophet_climatology, load_prophet_payload, prophet_from_payload
+
+        self.name = "prophet"
+        payload = load_prophet_payload(artifacts_dir)
+        self.model, self.regressors = prophet_from_payload(payload)
+        self.climatology = payload.get("climatology")
+        if self.climatology is None:
+            # Artefacts anterieurs a la climatologie stockee: calculee une fois ici.
+            self.climatology = build_prophet_climatology(load_raw_dataframe())
+
+    def score(self, chunk: pd.DataFrame):
+        from smartcare_model.prophet import build_prophet_scenario_frame, forecast_prophet
+
+        scen = normalize_scenarios(chunk)
+        future = build_prophet_scenario_frame(scen, self.regressors, climatology=self.climatology)
+        forecast = forecast_prophet(self.model, future, fast=True)
+        if "temperature_moyenne" in future.columns:
+            scen["temperature"] = future["temperature_moyenne"].to_numpy()
+        return scen, {"prediction": np.clip(forecast["yhat"].to_numpy(), 0.0, None)}
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Score SmartCare scenarios in batch and stream results to disk")
+    parser.add_argument("--input", type=Path, help="CSV or Parquet file with date, meteo, event, temperature, vacances")
+    parser.add_argument("--start", help="First date of a generated scenario range (instead of --input)")
+    parser.add_argument("--end", help="Last date of a generated scenario range")
+    parser.add_argument("--meteo", nargs="+", default=["Aucun"], help="Meteo values crossed with the date range")
+    parser.add_argument("--event", nargs="+", default=["Aucun"], help="Event values crossed with the date range")
+    parser.add_argument("--temperature", type=float, default=None)
+    parser.add_argument("--vacances", type=int, choices=[0, 1], default=None)
+    parser.add_argument("--output", type=Path, required=True, help="Output file (.csv or .parquet)")
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME, help="Registry model name or 'prophet'")
+    parser.add_argument("--artifacts-dir", type=Path, default=ARTIFACTS_DIR)
+    parser.add_argument("--k", type=int, default=10, help="Similar days for synthetic lags")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--safety-margin", type=float, default=0.10)
+    parser.add_argument(
+        "--intervals",
+        action="store_true",
+        help="Add quantile bounds (registry models); prediction_safe becomes the upper bound",
+    )
+    parser.add_argument(
+        "--coverage",
+        type=float,
+        default=None,
+        help="Add split-conformal bounds at this coverage (e.g. 0.8, registry models)",
+    )
+    parser.add_argument("--sep", default=",", help="CSV input separator")
+    parser.add_argument("--decimal", default=".", help="CSV input decimal mark")
+    args = parser.parse_args(argv)
+
+    if (args.input is None) == (args.start is None or args.end is None):
+        parser.error("Provide either --input or both --start and --end.")
+    if args.intervals and args.coverage is not None:
+        parser.error("Use either --intervals or --coverage.")
+    fmt = "parquet" if args.output.suffix.lower() == ".parquet" else "csv"
+
+    start = time.perf_counter()
+    if args.model == "prophet":
+        scorer = ProphetScorer(args.artifacts_dir)
+    else:
+        scorer = RegistryScorer(
+            args.model,
+            args.artifacts_dir,
+            load_raw_dataframe(),
+            args.k,
+            intervals=args.intervals,
+            coverage=args.coverage,
+        )
+    if args.input is not None:
+        chunks = iter_input_chunks(args.input, args.chunk_size, sep=args.sep, decimal=args.decimal)
+    else:
+        chunks = iter_range_chunks(args, args.chunk_size)
+    setup_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ChunkedWriter(args.output, fmt=fmt) as writer:
+        for chunk in chunks:
+            scen, preds = scorer.score(chunk)
+            out = scen[SCENARIO_COLUMNS].copy()
+            out["model"] = scorer.name
+            for col, values in preds.items():
+                out[col] = values
+            if "prediction_safe" not in preds:
+                out["prediction_safe"] = preds["prediction"] * (1 + args.safety_margin)
+            writer.write(out)
+    elapsed = time.perf_counter() - start
+    rate = writer.rows / elapsed if elapsed > 0 else float("inf")
+    print(
+        f"{writer.rows} scenarios scored with {scorer.name} in {elapsed:.2f} s "
+        f"({rate:.0f} rows/s, setup {setup_s:.2f} s) -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,47 @@
+"""Lancer le service local de prediction (HTTP asyncio, micro-batching).
+
+Exemple::
+
+    python tools/serve_predictions.py --port 8765 --models gradient_boosting random_forest
+    curl -s -X POST localhost:8765/predict -d '{"date": "2026-02-10", "meteo": "Pluie"}'
+    curl -s localhost:8765/stats
+"""
+
+from pathlib import Path
+import sys
+import argparse
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ml"))
+
+from smartcare_model.config import DEFAULT_MODEL_NAME
+from smartcare_model.service import serve
+
+
+def run(argv=None):
+    parser = argparse.ArgumentParser(description="Serve SmartCare predictions over HTTP with micro-batching")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", default=None, help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--models", nargs="+", default=[DEFAULT_MODEL_NAME])
+    parser.add_argument("--k", type=int, default=10, help="Similar days for synthetic lags")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"Serving {args.models} on {where} (max_batch={args.max_batch}, max_wait={args.max_wait_ms} ms)")
+    serve(
+        host=args.host,
+        port=args.port,
+        unix_path=args.unix_socket,
+        models=args.models,
+        k=args.k,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -1,10 +1,10 @@
-from pathlib import Path
-import sys
-
-ROOT = Path(__file__).resolve().parents[1]
-sys.path.insert(0, str(ROOT))
-sys.path.insert(0, str(ROOT / "ml"))
-
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "ml"))
+
 from pathlib import Path
 import sys
 import argparse
@@ -13,7 +13,7 @@ ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 sys.path.insert(0, str(ROOT / "ml"))
 
-from smartcare_model.pipeline import train_models, train_prophet_model
+from smartcare_model.pipeline import PROPHET_TARGETS, train_models, train_prophet_fleet, train_prophet_model
 
 
 def run(argv=None):
@@ -21,6 +21,20 @@ def run(argv=None):
     parser.add_argument("--classic-only", action="store_true", help="Train only classic models")
     parser.add_argument("--prophet-only", action="store_true", help="Train only Prophet")
     parser.add_argument("--tune", action="store_true", help="Grid tune Prophet hyperparameters")
+    parser.add_argument("--fleet", action="store_true", help="Train one Prophet model per hospital")
+    parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=["admissions"],
+        choices=sorted(PROPHET_TARGETS),
+        help="Prophet fleet targets",
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Prophet fleet process pool size")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Retrain even if an identical version (data, features, params, libraries) exists",
+    )
     args = parser.parse_args(argv)
 
     run_classic = not args.prophet_only
@@ -28,9 +42,17 @@ def run(argv=None):
 
     results = {}
     if run_classic:
-        results.update(train_models())
-    if run_prophet:
-        results.update(train_prophet_model(tune=args.tune))
+        results.update(train_models(force=args.force))
+    if run_prophet and args.fleet:
+        manifest = train_prophet_fleet(
+            targets=args.targets, max_workers=args.workers, tune=args.tune, force=args.force
+        )
+        for member in manifest["members"]:
+            results[f"prophet[{member['hospital_id']}/{member['target']}]"] = member["metrics"]
+        for error in manifest["errors"]:
+            print(f"Echec {error['hospital_id']}/{error['target']}: {error['error']}")
+    elif run_prophet:
+        results.update(train_prophet_model(tune=args.tune, force=args.force))
 
     print("=== Evaluation (test) ===")
     for name, metrics in results.items():